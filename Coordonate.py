@@ -1,62 +1,424 @@
+import time
+STARTUP_CLOCK = time.perf_counter()  # Momentul importului, pentru masurarea pornirii
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-import json
-import numpy as np
-import matplotlib.pyplot as plt
-
-# Adaugă baza de date cu formule la începutul fișierului
-FORMULAS_DB = {
-    # Formule matematice
-    "Suma": "A + B",
-    "Diferenta": "A - B",
-    "Produsul": "A * B",
-    "Catul": "A / B if B != 0 else 'Eroare: Div/0'",  # Evita divizarea la 0
-    "Patratul": "A ** 2",
-    "Radacina patrata": "A ** 0.5 if A >= 0 else 'Eroare: Negativ'",  # Evita radacina patrata a numerelor negative
-    "Exponential": "A ** B",
-    "Logaritm natural": "np.log(A) if A > 0 else 'Eroare: A <= 0'",  # Necesita A > 0
-    "Logaritm baza 10": "np.log10(A) if A > 0 else 'Eroare: A <= 0'",  # Necesita A > 0
-    "Sinus": "np.sin(A)",  # A in radiani
-    "Cosinus": "np.cos(A)",  # A in radiani
-    "Tangenta": "np.tan(A)",  # A in radiani
-    "Cotangenta": "1 / np.tan(A) if np.tan(A) != 0 else 'Eroare: Div/0'",  # Evita divizarea la 0
-    "Aria cercului": "np.pi * (A ** 2)",  # A = raza
-    "Perimetrul cercului": "2 * np.pi * A",  # A = raza
-    "Aria triunghiului": "0.5 * A * B",  # A = baza, B = inaltimea
-    "Aria dreptunghiului": "A * B",  # A = lungime, B = latime
-    "Aria trapezului": "0.5 * (A + B) * C",  # A si B = baze, C = inaltimea
-
-    # Formule fizice
-    "Viteza": "A / B if B != 0 else 'Eroare: Div/0'",  # A = distanta, B = timp
-    "Forta": "A * B",  # A = masa, B = acceleratia
-    "Energie cinetica": "0.5 * A * (B ** 2)",  # A = masa, B = viteza
-    "Energie potentiala": "A * 9.81 * B",  # A = masa, B = inaltime
-    "Presiune": "A / B if B != 0 else 'Eroare: Div/0'",  # A = forta, B = arie
-    "Densitate": "A / B if B != 0 else 'Eroare: Div/0'",  # A = masa, B = volum
-    "Putere": "A / B if B != 0 else 'Eroare: Div/0'",  # A = lucru mecanic, B = timp
-    "Rezistenta electrica": "A / B if B != 0 else 'Eroare: Div/0'",  # A = tensiune, B = curent
-    "Tensiune electrica": "A * B",  # A = rezistenta, B = curent
-    "Frecventa": "1 / A if A != 0 else 'Eroare: Div/0'",  # A = perioada
-    "Lungimea de unda": "A / B if B != 0 else 'Eroare: Div/0'",  # A = viteza undei, B = frecventa
-
-    # Alte formule utile
-    "Media aritmetica": "(A + B) / 2",
-    "Media geometrica": "(A * B) ** 0.5 if A >= 0 and B >= 0 else 'Eroare: Negativ'",
-    "Distanta in plan 2D": "((A - C) ** 2 + (B - D) ** 2) ** 0.5",  # A, B = coordonate punct 1; C, D = coordonate punct 2
-    "Distanta in plan 3D": "((A - C) ** 2 + (B - D) ** 2 + (E - F) ** 2) ** 0.5",  # A, B, E = punct 1; C, D, F = punct 2
-}
+import copy
+import os
+import queue
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# NumPy si nucleul (coordonate_core) sunt importate de load_core abia dupa ce
+# fereastra a fost desenata, iar matplotlib la primul grafic
+np = None
+core = None
+
+
+def load_core():
+    """Importa NumPy si nucleul aplicatiei, o singura data."""
+    global np, core
+    if core is None:
+        import numpy
+        import coordonate_core
+        np, core = numpy, coordonate_core
+    return core
+
+
+# Intervalul (ms) la care firul Tk preia rezultatele lucrarilor din fundal
+JOB_POLL_MS = 30
+# Recalcularile care ating mai multe randuri ruleaza in fundal
+BACKGROUND_ROWS = 50000
+
+
+class Job:
+    """O lucrare trimisa la JobScheduler.
+
+    Functia lucrarii primeste obiectul Job: poate verifica ``cancelled`` intre
+    pasi si poate raporta progresul cu ``report``.
+    """
+
+    __slots__ = ("key", "version", "cancelled", "on_done", "on_error", "on_progress", "_results")
+
+    def __init__(self, key, version, results, on_done, on_error, on_progress):
+        self.key = key
+        self.version = version
+        self.cancelled = False
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._results = results
+
+    def cancel(self):
+        self.cancelled = True
+
+    def report(self, fraction):
+        self._results.put((self, "progress", fraction))
+
+
+class JobScheduler:
+    """Ruleaza lucrari pe un ThreadPoolExecutor si livreaza rezultatele pe firul Tk.
+
+    Fiecare lucrare are o cheie; o lucrare noua cu aceeasi cheie o anuleaza pe
+    cea veche, iar rezultatele versiunilor vechi sunt ignorate. Rezultatele
+    sunt preluate cu ``after()`` doar cat timp exista lucrari in curs.
+    """
+
+    def __init__(self, root, max_workers=None):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._results = queue.SimpleQueue()
+        self._jobs = {}
+        self._versions = {}
+        self._pending = 0
+        self._polling = False
+
+    def submit(self, key, func, *args, on_done=None, on_error=None, on_progress=None):
+        """Ruleaza ``func(job, *args)`` in fundal; callback-urile ruleaza pe firul Tk."""
+        self.cancel(key)
+        job = Job(key, self._versions[key], self._results, on_done, on_error, on_progress)
+        self._jobs[key] = job
+        self._pending += 1
+        self.executor.submit(self._run, job, func, args)
+        if not self._polling:
+            self._polling = True
+            self.root.after(JOB_POLL_MS, self._poll)
+        return job
+
+    def cancel(self, key):
+        """Anuleaza lucrarea cu cheia ``key``; rezultatul ei va fi ignorat."""
+        self._versions[key] = self._versions.get(key, 0) + 1
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self):
+        for key in list(self._jobs):
+            self.cancel(key)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, func, args):
+        try:
+            self._results.put((job, "done", func(job, *args)))
+        except Exception as e:
+            self._results.put((job, "error", e))
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    job, kind, payload = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                current = not job.cancelled and self._versions.get(job.key) == job.version
+                if kind != "progress":
+                    self._pending -= 1
+                    if current:
+                        del self._jobs[job.key]
+                if not current:
+                    continue  # Rezultat invechit: a fost inlocuit de o lucrare mai noua
+                if kind == "progress":
+                    callback = job.on_progress
+                elif kind == "done":
+                    callback = job.on_done
+                else:
+                    callback = job.on_error
+                    if callback is None:
+                        self.root.report_callback_exception(type(payload), payload, payload.__traceback__)
+                if callback is not None:
+                    try:
+                        callback(payload)
+                    except Exception as e:
+                        # Eroarea unui callback nu opreste livrarea rezultatelor celorlalte lucrari
+                        self.root.report_callback_exception(type(e), e, e.__traceback__)
+        finally:
+            if self._pending:
+                self.root.after(JOB_POLL_MS, self._poll)
+            else:
+                self._polling = False
+
+
+class ProgressDialog(tk.Toplevel):
+    """Fereastra cu bara de progres si buton de anulare pentru operatiile lungi."""
+
+    def __init__(self, parent, title):
+        super().__init__(parent)
+        self.title(title)
+        self.transient(parent)
+        self.resizable(False, False)
+        self.cancelled = False
+        self.progress = ttk.Progressbar(self, length=300, mode="determinate", maximum=1.0)
+        self.progress.pack(padx=10, pady=10)
+        ttk.Button(self, text="Cancel", command=self.cancel).pack(pady=(0, 10))
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        # Modal: tabelul nu poate fi modificat cat timp operatia ruleaza
+        self.wait_visibility()
+        self.grab_set()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def set_progress(self, fraction):
+        self.progress["value"] = fraction
+
+
+class GraphWindow(tk.Toplevel):
+    """Fereastra graficului, refolosita intre desenari.
+
+    Axele si liniile seriilor sunt pastrate cat timp se deseneaza aceleasi
+    serii (acelasi ``layout``); datele noi sunt puse pe loc cu ``set_data``, fara
+    a reconstrui figura. Pentru fiecare serie se pastreaza datele complete si
+    se deseneaza doar punctele decimate pentru zona vizibila; la zoom sau pan
+    (bara de navigare) decimarea este refacuta.
+    """
+
+    def __init__(self, parent):
+        # matplotlib este importat abia la primul grafic
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+        super().__init__(parent)
+        self.title("Graph")
+        self.figure = Figure(figsize=(6.4, 4.8))
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect("resize_event", lambda event: self.schedule_update())
+        self.layout = None  # Cheia axelor curente (vezi set_layout)
+        self.axes = []
+        self.series = {}  # Cheia seriei -> axa, linia, datele complete si regresia
+        self._limits = {}  # Limitele puse de rescale, pentru a recunoaste zoom-ul utilizatorului
+        self._update_pending = False
+
+    def set_layout(self, key, count, polar=False):
+        """Creeaza ``count`` axe (in grila) daca ``key`` difera de cel curent; returneaza axele.
+
+        Cu acelasi ``key`` axele si liniile raman, iar seriile sunt doar actualizate.
+        """
+        if key == self.layout:
+            return self.axes
+        self.figure.clear()
+        rows, columns = core.graph_grid(count)
+        self.axes = [self.figure.add_subplot(rows, columns, i + 1, projection="polar" if polar else None)
+                     for i in range(count)]
+        for ax in self.axes:
+            ax.set_autoscale_on(False)  # Limitele sunt puse de rescale din datele complete
+            ax.callbacks.connect("xlim_changed", lambda ax: self.schedule_update())
+            ax.callbacks.connect("ylim_changed", lambda ax: self.schedule_update())
+        self.layout = key
+        self.series = {}
+        self._limits = {}
+        self.toolbar.update()  # istoricul de zoom apartine graficului anterior
+        return self.axes
+
+    def set_series(self, key, ax, x, y, fmt, label=None):
+        """Pune datele complete ale seriei ``key``; linia existenta este refolosita."""
+        series = self.series.get(key)
+        if series is None:
+            line, = ax.plot([], [], fmt, label=label)
+            series = self.series[key] = {"ax": ax, "line": line, "trend": None, "text": None}
+        series["x"], series["y"] = x, y
+        finite = np.isfinite(x) & np.isfinite(y)
+        series["bounds"] = ((x[finite].min(), x[finite].max(), y[finite].min(), y[finite].max())
+                            if finite.any() else None)
+        return series["line"]
+
+    def set_trendline(self, key, points=None, text=None, color='r', index=0, label="Trendline"):
+        """Actualizeaza pe loc linia de regresie si ecuatia seriei ``key`` (None le ascunde)."""
+        series = self.series[key]
+        ax = series["ax"]
+        if points is not None and series["trend"] is None:
+            series["trend"], = ax.plot(*points, '-', color=color, label=label)
+        elif series["trend"] is not None:
+            series["trend"].set_visible(points is not None)
+            if points is not None:
+                series["trend"].set_data(*points)
+        series["trend_points"] = points
+        if text is not None and series["text"] is None:
+            series["text"] = core.draw_equation(ax, text, index)
+        elif series["text"] is not None:
+            series["text"].set_visible(text is not None)
+            if text is not None:
+                series["text"].set_text(text)
+
+    def remove_series(self, keep):
+        """Sterge seriile care nu mai sunt desenate (de ex. un tabel comparat eliminat)."""
+        for key in [key for key in self.series if key not in keep]:
+            series = self.series.pop(key)
+            for artist in (series["line"], series["trend"], series["text"]):
+                if artist is not None:
+                    artist.remove()
+
+    def rescale(self, force=True):
+        """Limitele fiecarei axe din datele complete ale seriilor ei, nu din punctele decimate.
+
+        Fara ``force``, axele pe care utilizatorul a facut zoom sau pan isi pastreaza limitele.
+        """
+        for ax in self.axes:
+            if not force and ax in self._limits and self._limits[ax] != (ax.get_xlim(), ax.get_ylim()):
+                continue
+            bounds = [series["bounds"] for series in self.series.values()
+                      if series["ax"] is ax and series["bounds"] is not None]
+            for series in self.series.values():
+                if series["ax"] is ax and series.get("trend_points") is not None:
+                    x_line, y_line = series["trend_points"]
+                    if np.isfinite(y_line).all():
+                        bounds.append((x_line.min(), x_line.max(), y_line.min(), y_line.max()))
+            if not bounds:
+                continue
+            x_min, x_max, y_min, y_max = np.array(bounds).T
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim([(x_min.min(), y_min.min()), (x_max.max(), y_max.max())])
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+            ax.set_autoscale_on(False)
+            self._limits[ax] = (ax.get_xlim(), ax.get_ylim())
+
+    def schedule_update(self):
+        # Zoom-ul schimba ambele limite; decimarea se reface o singura data
+        if self.series and not self._update_pending:
+            self._update_pending = True
+            self.after_idle(self.update_points)
+
+    def update_points(self, redraw=True):
+        """Redecimeaza seriile pentru limitele si dimensiunea curenta a axelor."""
+        self._update_pending = False
+        for series in self.series.values():
+            ax = series["ax"]
+            bbox = ax.get_window_extent()
+            # In coordonate polare unghiul nu este limitat de zoom, doar raza
+            if ax.name == "polar":
+                bounds = series["bounds"] or (0.0, 0.0)
+                x_range = bounds[:2]
+            else:
+                x_range = sorted(ax.get_xlim())
+            with core.INSTRUMENTS.timer("graph/decimate", series["x"].size):
+                index = core.decimate_points(series["x"], series["y"], x_range, sorted(ax.get_ylim()),
+                                             bbox.width, bbox.height)
+            series["line"].set_data(series["x"][index], series["y"][index])
+        if redraw:
+            self.canvas.draw_idle()
+
+    def show(self):
+        with core.INSTRUMENTS.timer("graph/draw"):
+            self.canvas.draw()
+        self.deiconify()
+        self.lift()
+
+
+class StatsWindow(tk.Toplevel):
+    """Statisticile masuratorilor (p50/p99, randuri pe secunda), reimprospatate periodic."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Statistics")
+        self.geometry("720x400")
+        self.tree = ttk.Treeview(self, columns=("count", "p50", "p99", "total", "rate"), show="tree headings")
+        self.tree.heading("#0", text="Operation")
+        self.tree.column("#0", width=260)
+        for column, text in (("count", "Count"), ("p50", "p50 (ms)"), ("p99", "p99 (ms)"),
+                             ("total", "Total (ms)"), ("rate", "Rows/s")):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=90, anchor="e")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        buttons = ttk.Frame(self)
+        buttons.pack(fill=tk.X, padx=5, pady=(0, 5))
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Export...", command=parent.export_statistics).pack(side=tk.LEFT, padx=5)
+        self._refresh_after = None  # Reimprospatarea programata, anulata la inchidere
+        self.refresh()
+
+    def destroy(self):
+        if self._refresh_after is not None:
+            self.after_cancel(self._refresh_after)
+            self._refresh_after = None
+        super().destroy()
+
+    def reset(self):
+        core.INSTRUMENTS.reset()
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        self.tree.delete(*self.tree.get_children())
+        for name, stats in core.INSTRUMENTS.stats().items():
+            rate = f"{stats['rows_per_second']:,.0f}" if stats["rows"] else ""
+            self.tree.insert("", "end", text=name, values=(
+                stats["count"], f"{stats['p50'] * 1000:.2f}", f"{stats['p99'] * 1000:.2f}",
+                f"{stats['total'] * 1000:.1f}", rate))
+        for name, count in core.INSTRUMENTS.counters().items():
+            self.tree.insert("", "end", text=name, values=(count, "", "", "", ""))
+        if reschedule:
+            self._refresh_after = self.after(STATS_REFRESH_MS, self.refresh)
+
+
+class AggregateWindow(tk.Toplevel):
+    """Statisticile unei coloane (count, sum, mean, min, max, std), pe grupuri sau pentru tot tabelul."""
+
+    def __init__(self, parent, title, key_label, labels, stats):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("720x400")
+        columns = ("count", "sum", "mean", "min", "max", "std")
+        tree = ttk.Treeview(self, columns=columns, show="tree headings")
+        tree.heading("#0", text=key_label)
+        tree.column("#0", width=160)
+        for column in columns:
+            tree.heading(column, text=column.capitalize())
+            tree.column(column, width=90, anchor="e")
+        # Doar primele MAX_GROUP_ROWS grupuri sunt afisate
+        for i, label in enumerate(labels[:MAX_GROUP_ROWS]):
+            tree.insert("", "end", text=label, values=[int(stats["count"][i])] + [
+                core.format_number(float(stats[column][i])) for column in columns[1:]])
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        if len(stats["count"]) > MAX_GROUP_ROWS:
+            ttk.Label(self, text=f"Showing the first {MAX_GROUP_ROWS} of {len(stats['count'])} groups.").pack(
+                pady=(0, 5))
+
+
+# Gradul maxim al polinomului de regresie din grafic
+MAX_TRENDLINE_DEGREE = 6
+# Intervalul (ms) de reimprospatare a ferestrei cu statistici
+STATS_REFRESH_MS = 1000
+# Asezarea mai multor serii Y: pe aceleasi axe sau cate un grafic pe serie
+GRAPH_LAYOUTS = ("overlay", "grid")
+# Intervalul minim (ms) intre doua actualizari ale graficului deschis, la modificarea datelor
+GRAPH_REFRESH_MS = 200
+# Grupurile afisate in fereastra Group By
+MAX_GROUP_ROWS = 1000
+# Functiile afisate in raportul cProfile
+PROFILE_REPORT_LINES = 40
+# Intervalul (ms) dupa o modificare la care sunt scrise modificarile salvate automat
+AUTOSAVE_MS = 5000
+# Directorul salvarii automate; fiecare sesiune scrie intr-un subdirector propriu
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".coordonate", "autosave")
+# Randuri suplimentare materializate sub fereastra vizibila a tabelului
+VIEW_BUFFER_ROWS = 2
+# Inaltimea implicita a unui rand din Treeview, daca stilul nu o specifica
+DEFAULT_ROW_HEIGHT = 20
+
 
 class DataTableApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, autosave_dir=AUTOSAVE_DIR):
         super().__init__()
         self.title("Data Table and Graphing App")
         self.geometry("900x600")
+        self.startup_times = {}  # Secunde de la importul modulului pana la fiecare etapa a pornirii
+        self.table = None  # Creat dupa ce fereastra este afisata si nucleul importat
         
-        # Initialize table structure
-        self.columns = ["Column1", "Column2"]
-        self.data = []  # each row is a dict keyed by column name
-        self.column_formulas = {}  # Dicționar pentru a stoca formulele asociate coloanelor
-        self.auto_update_enabled = True  # Controleaza actualizarea automata
+        self.jobs = JobScheduler(self)  # Recalculari, grafice si incarcari in fundal
+        self._graph_window = None  # Fereastra graficului, refolosita intre desenari
+        self.view_offset = 0  # Primul rand din date afisat in Treeview
+        self.selected_row = None  # Randul selectat (index in date), pastrat la derulare
+        self._view_refresh = None  # Vederea ai carei indici sunt recalculati in fundal dupa o editare
+        self._chunked = 0  # Operatii pe bucati in curs; cat timp ruleaza, undo/redo sunt blocate
+        self.profiler = None  # cProfile.Profile activ, pornit din meniul Tools
+        self.autosave = None  # Creata odata cu tabelul
+        self._autosave_after = None  # Scrierea programata a salvarii automate
+        self.compare_tables = []  # (nume, tabel) din alte proiecte, desenate in acelasi grafic
+        self._graph_spec = None  # Ce arata graficul deschis (coloane si optiuni), pentru actualizari
+        self._graph_signature = None  # Versiunile datelor desenate ultima data
+        self._graph_rows = None  # Randurile filtrate desenate ultima data
+        self._graph_refresh_after = None  # Actualizarea programata a graficului
         
         # Create UI frames and menus
         self.create_menu()
@@ -64,11 +426,210 @@ class DataTableApp(tk.Tk):
         self.create_control_frame()
         self.create_graph_settings_frame()
         
+        # Fereastra este desenata inainte de importul NumPy si al nucleului
+        self.update()
+        self.mark_startup("window")
+        load_core()
+        self.mark_startup("core")
+        
+        # Initialize table structure
+        self.table = core.Table(["Column1", "Column2"])  # date stocate pe coloane
+        self.column_formulas = {}  # Dicționar pentru a stoca formulele asociate coloanelor
+        self.formula_graph = core.FormulaGraph(self.column_formulas)  # Dependentele dintre coloane
+        self.dirty = core.DirtyTracker()  # Celulele modificate de la ultima recalculare
+        self.regressions = core.RegressionCache()  # Dreptele de regresie, actualizate la fiecare modificare
+        self.series_cache = core.SeriesCache()  # Perechile (x, y) extrase pentru grafic, pana la o editare
+        self.view = core.TableView()  # Sortarea si filtrele randurilor afisate
+        self.journal = core.Journal()  # Istoricul undo/redo
+        self.autosave = core.Autosave(autosave_dir)  # Modificarile nesalvate, pentru recuperare dupa o cadere
+        try:
+            self.autosave.start()
+        except OSError as e:
+            print(f"Autosave unavailable: {e}", file=sys.stderr)
+            self.autosave = core.Autosave(os.path.join(tempfile.gettempdir(), "coordonate-autosave"))
+            self.autosave.start()
+        
         self.update_table_view()
         self.update_graph_options()
-        
-        # Porneste actualizarea automata
-        self.start_auto_update()
+        self.mark_startup("ready")
+        if self.autosave.exists():
+            self.after_idle(self.recover_autosave)
+
+    def mark_startup(self, stage):
+        self.startup_times[stage] = time.perf_counter() - STARTUP_CLOCK
+
+    def destroy(self):
+        self.jobs.shutdown()
+        if self.autosave is not None:
+            self.autosave.close()  # Inchidere normala: sterge doar fisierele acestei sesiuni
+        super().destroy()
+
+    def recover_autosave(self):
+        """Ofera recuperarea modificarilor salvate automat de o sesiune care nu s-a inchis normal."""
+        if not messagebox.askyesno("Recover", "The previous session did not close normally.\n"
+                                              "Recover the unsaved changes?"):
+            self.autosave.discard_recovery()
+            return
+        try:
+            project = self.autosave.recover()
+        except Exception as e:
+            messagebox.showerror("Recover", f"The unsaved changes could not be recovered: {e}")
+            self.autosave.discard_recovery()
+            return
+        self.apply_project(project)
+
+    def record_change(self, operation, autosave_record):
+        """Adauga ``operation`` in istoricul undo (daca nu este None) si ``autosave_record`` in salvarea automata.
+
+        ``autosave_record`` None inseamna ca modificarea nu poate fi descrisa
+        compact, iar salvarea automata va scrie tot proiectul.
+        """
+        if operation is not None:
+            self.journal.record(operation)
+        self.autosave.log(autosave_record)
+        if self._autosave_after is None:
+            self._autosave_after = self.after(AUTOSAVE_MS, self.flush_autosave)
+
+    def flush_autosave(self):
+        self._autosave_after = None
+        try:
+            if self.autosave.needs_base():
+                # Copia completa este scrisa in fundal, dintr-o copie in memorie a tabelului
+                self.write_autosave_base(self.table.snapshot(writable=self.table.columns))
+            else:
+                with core.INSTRUMENTS.timer("io/autosave"):
+                    self.autosave.flush_log()
+        except OSError as e:
+            print(f"Autosave failed: {e}", file=sys.stderr)  # Nu intrerupe editarea
+
+    def write_autosave_base(self, table):
+        """Scrie in fundal copia de baza a salvarii automate; ``table`` nu mai este modificat."""
+        path = self.autosave.begin_base()
+        column_formulas = dict(self.column_formulas)
+        graph_settings = self.graph_settings()
+
+        def write(job):
+            with core.INSTRUMENTS.timer("io/autosave base", len(table)):
+                core.save_project_file(path, table, column_formulas, graph_settings)
+
+        def done(result):
+            try:
+                self.autosave.finish_base(path)
+            except OSError as e:
+                print(f"Autosave failed: {e}", file=sys.stderr)
+
+        def failed(e):
+            self.autosave.cancel_base(path)
+            print(f"Autosave failed: {e}", file=sys.stderr)
+
+        self.jobs.submit("autosave", write, on_done=done, on_error=failed)
+
+    def reset_history(self, base_path=None):
+        """Proiect nou deschis sau salvat: goleste istoricul, iar salvarea automata porneste de la ``base_path``."""
+        self.journal.clear()
+        self.autosave.reset(base_path)
+
+    def undo(self):
+        # Ctrl+Z este legat cu bind_all si ajunge aici si cat timp fereastra de progres este deschisa
+        operation = None if self._chunked else self.journal.undo()
+        if operation is None:
+            self.bell()
+            return
+        self.apply_operation(operation, undo=True)
+
+    def redo(self):
+        operation = None if self._chunked else self.journal.redo()
+        if operation is None:
+            self.bell()
+            return
+        self.apply_operation(operation, undo=False)
+
+    def apply_operation(self, operation, undo):
+        """Anuleaza (``undo``) sau reface o operatie din istoric, fara a o inregistra din nou."""
+        op = operation["op"]
+        if op == "set_cell":
+            self.set_cell(operation["row"], operation["column"], operation["old" if undo else "new"], record=False)
+        elif op in ("insert_row", "delete_row"):
+            if undo == (op == "insert_row"):
+                self.remove_row(operation["row"], record=False)
+            else:
+                self.insert_row(operation["row"], operation["values"], record=False)
+        elif op in ("add_column", "delete_column"):
+            if undo == (op == "add_column"):
+                self.remove_column(operation["column"], record=False)
+            else:
+                self.insert_column(operation["column"], operation["data"], operation["position"], record=False)
+        elif op == "set_formula":
+            if undo:
+                # O coloana fara formula isi recapata valorile introduse manual
+                restore = operation["values"] if operation["old"] is None else None
+                self.apply_formula(operation["column"], operation["old"], restore=restore, record=False)
+            else:
+                self.apply_formula(operation["column"], operation["new"], record=False)
+        elif op == "replace":
+            self.replace_project(*operation["old" if undo else "new"], record=False)
+
+    def toggle_instrumentation(self):
+        """Porneste sau opreste masurarea operatiilor (dezactivata, nu costa aproape nimic)."""
+        load_core().INSTRUMENTS.enabled = self.instrumentation_var.get()
+
+    def show_statistics(self):
+        if not self.instrumentation_var.get():
+            messagebox.showinfo("Statistics", "Enable Tools > Collect Statistics to record timings.")
+        StatsWindow(self)
+
+    def export_statistics(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if file_path:
+            try:
+                core.INSTRUMENTS.export(file_path)
+            except OSError as e:
+                messagebox.showerror("Export Statistics", f"An error occurred while exporting: {e}")
+
+    def toggle_profiling(self):
+        """Porneste cProfile pe firul interfetei; la oprire afiseaza si poate salva raportul.
+
+        Lucrarile din fundal ruleaza pe alte fire si nu apar in profil; timpii
+        lor sunt in statistici (Tools > Collect Statistics).
+        """
+        if self.profiler is None:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            return
+        profiler, self.profiler = self.profiler, None
+        profiler.disable()
+        self.profiling_var.set(False)
+        self.show_profile(profiler)
+
+    def show_profile(self, profiler):
+        """Fereastra cu functiile cele mai costisitoare (timp cumulat) si salvarea profilului."""
+        import io
+        import pstats
+
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+        window = tk.Toplevel(self)
+        window.title("Profile")
+        text = tk.Text(window, wrap="none", width=120, height=40)
+        text.insert("1.0", report.getvalue())
+        text.configure(state="disabled")
+        text.pack(fill=tk.BOTH, expand=True)
+
+        def save():
+            file_path = filedialog.asksaveasfilename(parent=window, defaultextension=".prof",
+                                                     filetypes=[("Profile data", "*.prof"), ("All files", "*.*")])
+            if file_path:
+                profiler.dump_stats(file_path)
+
+        ttk.Button(window, text="Save...", command=save).pack(pady=5)
+
+    @property
+    def columns(self):
+        """Numele coloanelor tabelului, in ordinea afisarii."""
+        return self.table.columns
 
     def create_menu(self):
         menubar = tk.Menu(self)
@@ -76,9 +637,41 @@ class DataTableApp(tk.Tk):
         file_menu.add_command(label="New Project", command=self.new_project)
         file_menu.add_command(label="Open Project", command=self.open_project)
         file_menu.add_command(label="Save Project", command=self.save_project)
+        file_menu.add_command(label="Convert JSON Project", command=self.convert_json_project)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.quit)
+        file_menu.add_command(label="Import CSV", command=self.import_csv)
+        file_menu.add_command(label="Import Binary Table", command=self.import_binary_table)
+        file_menu.add_command(label="Export CSV", command=self.export_csv)
+        file_menu.add_command(label="Export Binary Table", command=self.export_binary_table)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.destroy)
         menubar.add_cascade(label="File", menu=file_menu)
+        edit_menu = tk.Menu(menubar, tearoff=False)
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        view_menu = tk.Menu(menubar, tearoff=False)
+        view_menu.add_command(label="Filter...", command=self.add_filter)
+        view_menu.add_command(label="Clear Filters", command=self.clear_filters)
+        view_menu.add_command(label="Clear Sort", command=lambda: self.apply_view(
+            core.TableView(filters=self.view.filters)))
+        view_menu.add_separator()
+        view_menu.add_command(label="Summary...", command=self.show_summary)
+        view_menu.add_command(label="Group By...", command=self.show_group_by)
+        menubar.add_cascade(label="View", menu=view_menu)
+        self.bind_all("<Control-z>", lambda event: self.undo())
+        self.bind_all("<Control-y>", lambda event: self.redo())
+        tools_menu = tk.Menu(menubar, tearoff=False)
+        self.instrumentation_var = tk.BooleanVar(value=False)
+        tools_menu.add_checkbutton(label="Collect Statistics", variable=self.instrumentation_var,
+                                   command=self.toggle_instrumentation)
+        tools_menu.add_command(label="Statistics...", command=self.show_statistics)
+        tools_menu.add_command(label="Export Statistics...", command=self.export_statistics)
+        tools_menu.add_separator()
+        self.profiling_var = tk.BooleanVar(value=False)
+        tools_menu.add_checkbutton(label="Profile (cProfile)", variable=self.profiling_var,
+                                   command=self.toggle_profiling)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
         self.config(menu=menubar)
 
     def create_table_frame(self):
@@ -86,13 +679,13 @@ class DataTableApp(tk.Tk):
         table_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Create the Treeview widget to display table data
-        self.tree = ttk.Treeview(table_frame, columns=self.columns, show="headings", selectmode="browse")
+        self.tree = ttk.Treeview(table_frame, columns=(), show="headings", selectmode="browse")
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Set up scrollbars
-        scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        scrollbar_y.pack(side=tk.LEFT, fill=tk.Y)
-        self.tree.configure(yscrollcommand=scrollbar_y.set)
+        # Set up scrollbars; the vertical one scrolls through the data, not the
+        # Treeview items, because only the visible rows are materialized
+        self.scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical", command=self.on_scroll_y)
+        self.scrollbar_y.pack(side=tk.LEFT, fill=tk.Y)
 
         scrollbar_x = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
         scrollbar_x.pack(side=tk.TOP, fill=tk.X)
@@ -100,6 +693,15 @@ class DataTableApp(tk.Tk):
         
         # Bind double-click to edit a cell or add a new row
         self.tree.bind("<Double-1>", self.on_cell_double_click)
+        self.tree.bind("<<TreeviewSelect>>", self.on_row_select)
+        self.tree.bind("<Configure>", lambda event: self.render_rows())
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", self.on_mouse_wheel)
+        self.tree.bind("<Button-5>", self.on_mouse_wheel)
+        self.tree.bind("<Up>", lambda event: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self.move_selection(-self.visible_row_count()))
+        self.tree.bind("<Next>", lambda event: self.move_selection(self.visible_row_count()))
 
     def create_control_frame(self):
         control_frame = ttk.Frame(self)
@@ -122,6 +724,10 @@ class DataTableApp(tk.Tk):
         
         btn_edit_cell = ttk.Button(control_frame, text="Edit Cell", command=self.edit_cell)
         btn_edit_cell.grid(row=0, column=5, padx=5)
+        
+        # Numarul randurilor afisate cand tabelul este filtrat
+        self.view_label = ttk.Label(control_frame, text="")
+        self.view_label.grid(row=0, column=6, padx=5)
 
     def create_graph_settings_frame(self):
         graph_frame = ttk.LabelFrame(self, text="Graph Settings")
@@ -132,15 +738,20 @@ class DataTableApp(tk.Tk):
         self.x_dropdown = ttk.Combobox(graph_frame, textvariable=self.x_var, state="readonly")
         self.x_dropdown.grid(row=0, column=1, padx=5, pady=5)
         
-        ttk.Label(graph_frame, text="Y Column:").grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
-        self.y_var = tk.StringVar()
-        self.y_dropdown = ttk.Combobox(graph_frame, textvariable=self.y_var, state="readonly")
-        self.y_dropdown.grid(row=0, column=3, padx=5, pady=5)
+        # Mai multe coloane Y pot fi selectate (Ctrl/Shift + clic)
+        ttk.Label(graph_frame, text="Y Columns:").grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
+        self.y_listbox = tk.Listbox(graph_frame, selectmode=tk.EXTENDED, height=3, exportselection=False)
+        self.y_listbox.grid(row=0, column=3, padx=5, pady=5)
         
         # Options for trendline, equation display and polar coordinates
         self.trendline_var = tk.BooleanVar(value=False)
         self.equation_var = tk.BooleanVar(value=False)
         self.polar_var = tk.BooleanVar(value=False)
+        self.degree_var = tk.IntVar(value=1)
+        
+        ttk.Label(graph_frame, text="Degree:").grid(row=0, column=4, padx=5, pady=5, sticky=tk.W)
+        spn_degree = ttk.Spinbox(graph_frame, from_=1, to=MAX_TRENDLINE_DEGREE, textvariable=self.degree_var, width=4)
+        spn_degree.grid(row=0, column=5, padx=5, pady=5, sticky=tk.W)
         
         chk_trendline = ttk.Checkbutton(graph_frame, text="Trendline", variable=self.trendline_var)
         chk_trendline.grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
@@ -153,49 +764,354 @@ class DataTableApp(tk.Tk):
         
         btn_graph = ttk.Button(graph_frame, text="Graph", command=self.graph_data)
         btn_graph.grid(row=1, column=3, padx=5, pady=5)
+        
+        # Seriile Y pe aceleasi axe sau cate un grafic pentru fiecare
+        ttk.Label(graph_frame, text="Layout:").grid(row=0, column=6, padx=5, pady=5, sticky=tk.W)
+        self.layout_var = tk.StringVar(value=GRAPH_LAYOUTS[0])
+        cmb_layout = ttk.Combobox(graph_frame, textvariable=self.layout_var, values=GRAPH_LAYOUTS,
+                                  state="readonly", width=8)
+        cmb_layout.grid(row=0, column=7, padx=5, pady=5, sticky=tk.W)
+        
+        # Graficul deschis este actualizat pe loc cand datele coloanelor lui se schimba
+        self.live_var = tk.BooleanVar(value=True)
+        chk_live = ttk.Checkbutton(graph_frame, text="Live Update", variable=self.live_var)
+        chk_live.grid(row=1, column=4, columnspan=2, padx=5, pady=5, sticky=tk.W)
+        
+        btn_compare = ttk.Button(graph_frame, text="Compare Projects...", command=self.add_compare_tables)
+        btn_compare.grid(row=1, column=6, padx=5, pady=5)
+        btn_clear_compare = ttk.Button(graph_frame, text="Clear Compared", command=self.clear_compare_tables)
+        btn_clear_compare.grid(row=1, column=7, padx=5, pady=5)
 
     def update_table_view(self):
-        # Clear current tree and rebuild columns
-        self.tree.delete(*self.tree.get_children())
-        self.tree["columns"] = self.columns
-        for col in self.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100, anchor="center")
+        with core.INSTRUMENTS.timer("view/update_table_view"):
+            # Clear current tree and rebuild columns
+            self.tree.delete(*self.tree.get_children())
+            self.tree["columns"] = self.columns
+            for col in self.columns:
+                # Clic pe antet: sortare crescatoare, descrescatoare, apoi ordinea initiala
+                arrow = (" \u25bc" if self.view.descending else " \u25b2") if col == self.view.sort else ""
+                self.tree.heading(col, text=col + arrow, command=lambda name=col: self.sort_by(name))
+                self.tree.column(col, width=100, anchor="center")
+                
+            # Insert only the rows in the visible window
+            self.render_rows()
             
-        # Insert each row
-        for i, row in enumerate(self.data):
-            values = [row.get(col, "") for col in self.columns]
-            self.tree.insert("", "end", iid=str(i), values=values)
-        
-        self.update_graph_options()
+            self.update_graph_options()
+        self.schedule_graph_refresh()
+
+    def visible_row_count(self):
+        """Numarul de randuri care incap in inaltimea curenta a Treeview-ului."""
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT
+        height = self.tree.winfo_height()
+        if height <= 1:  # Fereastra nu a fost inca afisata
+            return int(self.tree.cget("height"))
+        return max(1, height // int(row_height))
+
+    def render_rows(self):
+        """Materializeaza in Treeview doar randurile din fereastra vizibila.
+
+        Elementele au ca iid indexul randului in date; costul nu depinde de
+        numarul total de randuri. ``view_offset`` este pozitia in vedere (randurile
+        sortate si filtrate), nu in date.
+        """
+        if self.table is None:
+            return  # Fereastra este desenata inainte ca tabelul sa existe
+        rows = self.view_rows()
+        total = self.view_length()
+        count = self.visible_row_count()
+        self.view_offset = max(0, min(self.view_offset, total - count))
+        end = min(total, self.view_offset + count + VIEW_BUFFER_ROWS)
+        with core.INSTRUMENTS.timer("view/render_rows", end - self.view_offset):
+            self.tree.delete(*self.tree.get_children())
+            indices = range(self.view_offset, end) if rows is None else rows[self.view_offset:end].tolist()
+            for i in indices:
+                self.tree.insert("", "end", iid=str(i), values=self.table.display_row(i))
+        self.view_label["text"] = f"{total:,} of {len(self.table):,} rows" if self.view.filters else ""
+        if self.selected_row is not None and self.tree.exists(str(self.selected_row)):
+            self.tree.selection_set(str(self.selected_row))
+        self.tree.yview_moveto(0)
+        if total:
+            self.scrollbar_y.set(self.view_offset / total, min(1.0, (self.view_offset + count) / total))
+        else:
+            self.scrollbar_y.set(0.0, 1.0)
+
+    def refresh_rows(self, rows):
+        """Actualizeaza pe loc randurile date din Treeview (None = tot tabelul).
+
+        Doar randurile din fereastra vizibila exista in Treeview.
+        """
+        if rows is None:
+            self.update_table_view()
+            return
+        self.schedule_graph_refresh()
+        if self.view:
+            self.render_rows()  # Randurile modificate pot sa-si schimbe pozitia sau sa iasa din filtru
+            return
+        for item in self.tree.get_children():
+            if int(item) in rows:
+                self.tree.item(item, values=self.table.display_row(int(item)))
+
+    def view_rows(self):
+        """Indicii randurilor afisate (sortate si filtrate); None daca este afisat tot tabelul, in ordine.
+
+        Dupa o editare a unei coloane sortate sau filtrate sunt folositi ultimii
+        indici calculati, iar vederea este refacuta in fundal (``refresh_view``).
+        """
+        rows, current = self.view.cached_rows(self.table)
+        if not current:
+            self.refresh_view()
+            size = len(self.table)
+            rows = np.arange(size) if rows is None else rows[rows < size]  # Fara randurile sterse intre timp
+        return rows
+
+    def refresh_view(self):
+        """Recalculeaza in fundal indicii vederii curente; randurile sunt afisate din nou la final."""
+        view, table = self.view, self.table
+        if self._view_refresh is view:
+            return  # Deja in curs; modificarile facute intre timp sunt verificate la final
+
+        def finished():
+            if self._view_refresh is view:
+                self._view_refresh = None
+
+        def done(rows):
+            finished()
+            if view is self.view and table is self.table:
+                self.forget_hidden_selection(rows)
+                self.render_rows()  # Porneste o noua recalculare daca tabelul s-a schimbat intre timp
+                self.schedule_graph_refresh()
+
+        def failed(e):
+            finished()
+            self.report_callback_exception(type(e), e, e.__traceback__)
+
+        self._view_refresh = view
+        self.jobs.submit("view-refresh", lambda job: view.rows(table), on_done=done, on_error=failed)
+
+    def view_length(self):
+        rows = self.view_rows()
+        return len(self.table) if rows is None else len(rows)
+
+    def view_position(self, index):
+        """Pozitia randului ``index`` din date in vedere (None daca este filtrat)."""
+        rows = self.view_rows()
+        if rows is None:
+            return index
+        positions = np.flatnonzero(rows == index)
+        return int(positions[0]) if positions.size else None
+
+    def scroll_to(self, offset):
+        """Muta fereastra vizibila la pozitia ``offset`` din vedere."""
+        offset = max(0, min(offset, self.view_length() - self.visible_row_count()))
+        if offset != self.view_offset:
+            self.view_offset = offset
+            self.render_rows()
+
+    def show_row(self, index):
+        """Deruleaza minim astfel incat randul ``index`` (din date) sa fie vizibil."""
+        position = self.view_position(index)
+        if position is None:
+            return
+        count = self.visible_row_count()
+        if position < self.view_offset:
+            self.scroll_to(position)
+        elif position >= self.view_offset + count:
+            self.scroll_to(position - count + 1)
+
+    def on_scroll_y(self, action, amount, unit=None):
+        """Transforma pozitia barei de derulare in pozitie in vedere."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.view_length()))
+        elif action == "scroll":
+            step = self.visible_row_count() if unit == "pages" else 1
+            self.scroll_to(self.view_offset + int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.view_offset - 3)
+        else:
+            self.scroll_to(self.view_offset + 3)
+        return "break"
+
+    def forget_hidden_selection(self, rows):
+        """Deselecteaza randul selectat daca nu este printre indicii ``rows`` ai vederii.
+
+        Altfel Delete Row si Edit Cell ar lucra pe un rand ascuns de filtre.
+        """
+        if self.selected_row is not None and rows is not None and not np.any(rows == self.selected_row):
+            self.selected_row = None
+
+    def on_row_select(self, event):
+        selected = self.tree.selection()
+        if selected:
+            self.selected_row = int(selected[0])
+
+    def move_selection(self, step):
+        """Muta selectia cu ``step`` randuri, derulind fereastra daca e nevoie."""
+        total = self.view_length()
+        if not total:
+            return "break"
+        current = None if self.selected_row is None else self.view_position(self.selected_row)
+        position = max(0, min((self.view_offset if current is None else current) + step, total - 1))
+        rows = self.view_rows()
+        self.selected_row = position if rows is None else int(rows[position])
+        self.show_row(self.selected_row)
+        self.tree.selection_set(str(self.selected_row))
+        self.tree.see(str(self.selected_row))
+        return "break"
+
+    def sort_by(self, col_name):
+        """Sorteaza dupa coloana: crescator, apoi descrescator, apoi ordinea initiala."""
+        if self.view.sort != col_name:
+            view = core.TableView(col_name, False, self.view.filters)
+        elif not self.view.descending:
+            view = core.TableView(col_name, True, self.view.filters)
+        else:
+            view = core.TableView(filters=self.view.filters)
+        self.apply_view(view)
+
+    def add_filter(self):
+        col_name = simpledialog.askstring("Filter", f"Enter column name to filter:\nOptions: {', '.join(self.columns)}")
+        if col_name is None:
+            return
+        if col_name not in self.columns:
+            messagebox.showerror("Error", "Column not found.")
+            return
+        if messagebox.askyesno("Filter", "Filter by a numeric range?\n(No = cells containing a text)"):
+            spec = {"column": col_name}
+            for bound, prompt in (("min", "Minimum value (empty = no limit):"),
+                                  ("max", "Maximum value (empty = no limit):")):
+                value = simpledialog.askstring("Filter", prompt)
+                if value is None:
+                    return
+                if value.strip():
+                    try:
+                        spec[bound] = float(value)
+                    except ValueError:
+                        messagebox.showerror("Error", f"Invalid number: {value}")
+                        return
+        else:
+            text = simpledialog.askstring("Filter", "Keep the cells containing:")
+            if not text:
+                return
+            spec = {"column": col_name, "text": text}
+        self.apply_view(core.TableView(self.view.sort, self.view.descending, self.view.filters + (spec,)))
+
+    def clear_filters(self):
+        self.apply_view(core.TableView(self.view.sort, self.view.descending))
+
+    def apply_view(self, view):
+        """Afiseaza tabelul sortat/filtrat dupa ``view``; indicii sunt calculati in fundal."""
+        table = self.table
+
+        def done(rows):
+            if table is not self.table:
+                return
+            self.view = view
+            self.view_offset = 0
+            self.forget_hidden_selection(rows)
+            self.update_table_view()
+
+        self.jobs.submit("view", lambda job: view.rows(table), on_done=done,
+                         on_error=lambda e: messagebox.showerror("View Error", f"Could not sort or filter: {e}"))
+
+    def ask_column(self, title, prompt):
+        col_name = simpledialog.askstring(title, f"{prompt}\nOptions: {', '.join(self.columns)}")
+        if col_name is not None and col_name not in self.columns:
+            messagebox.showerror("Error", "Column not found.")
+            return None
+        return col_name
+
+    def show_summary(self):
+        """Statisticile unei coloane pe randurile afisate (dupa filtre)."""
+        col_name = self.ask_column("Summary", "Enter column name:")
+        if col_name is None:
+            return
+        table, view = self.table, self.view
+        # Indicii vederii sunt luati (sau recalculati) in fundal, nu pe firul Tk
+        self.jobs.submit("aggregate", lambda job: core.aggregate(table, col_name, view.rows(table)),
+                         on_done=lambda stats: AggregateWindow(
+                             self, f"Summary of {col_name}", "Rows", ["Filtered" if self.view.filters else "All"],
+                             {column: [value] for column, value in stats.items()}),
+                         on_error=lambda e: messagebox.showerror("Summary", f"Could not compute summary: {e}"))
+
+    def show_group_by(self):
+        """Statisticile unei coloane pe grupuri de valori egale ale altei coloane (randurile afisate)."""
+        key = self.ask_column("Group By", "Enter the key column:")
+        if key is None:
+            return
+        col_name = self.ask_column("Group By", "Enter the column to aggregate:")
+        if col_name is None:
+            return
+        table, view = self.table, self.view
+
+        def group(job):
+            stats = core.group_by(table, key, col_name, view.rows(table))
+            # Cheile sunt formatate doar pentru grupurile afisate
+            column = table.column(key)
+            return [column.display(row) for row in stats["rows"][:MAX_GROUP_ROWS]], stats
+
+        self.jobs.submit("aggregate", group,
+                         on_done=lambda result: AggregateWindow(self, f"{col_name} by {key}", key, *result),
+                         on_error=lambda e: messagebox.showerror("Group By", f"Could not group rows: {e}"))
 
     def update_graph_options(self):
         # Update the dropdowns for graphing choices based on table columns
         self.x_dropdown["values"] = self.columns
-        self.y_dropdown["values"] = self.columns
+        selected = self.selected_y_columns()
+        self.y_listbox.delete(0, tk.END)
+        self.y_listbox.insert(tk.END, *self.columns)
+        self.select_y_columns(selected)
         if self.columns:
             if self.x_var.get() not in self.columns:
                 self.x_var.set(self.columns[0])
-            if self.y_var.get() not in self.columns:
-                self.y_var.set(self.columns[0])
+            if not self.selected_y_columns():
+                self.y_listbox.selection_set(0)
+
+    def selected_y_columns(self):
+        return [self.y_listbox.get(i) for i in self.y_listbox.curselection()]
+
+    def select_y_columns(self, names):
+        self.y_listbox.selection_clear(0, tk.END)
+        for i, name in enumerate(self.y_listbox.get(0, tk.END)):
+            if name in names:
+                self.y_listbox.selection_set(i)
 
     def add_row(self):
         # Create an empty row (all columns empty) and update view
-        new_row = {col: "" for col in self.columns}
-        self.data.append(new_row)
+        index = self.insert_row(len(self.table))
+        self.show_row(index)
+
+    def insert_row(self, index, values=None, record=True):
+        """Insereaza un rand (gol sau cu ``values``, coloana -> text) si calculeaza formulele lui."""
+        self.table.insert_row(index, values)
+        self.dirty.insert_row(index)
+        self.regressions.update(self.table, set(self.columns), [index], 1)
         self.update_table_view()
-        self.recalculate_results()  # Recalculeaza rezultatele
+        for target_column in self.column_formulas:
+            self.dirty.mark(target_column, index)
+        self.recalculate_dirty()  # Calculeaza formulele pentru randul nou
+        self.record_change({"op": "insert_row", "row": index, "values": values} if record else None,
+                           {"op": "insert_row", "row": index, "values": values})
+        return index
 
     def delete_row(self):
         # Delete the selected row
-        selected = self.tree.selection()
-        if not selected:
+        if self.selected_row is None:
             messagebox.showwarning("Delete Row", "No row selected.")
             return
-        index = int(selected[0])
-        del self.data[index]
-        self.update_table_view()
-        self.recalculate_results()  # Recalculeaza rezultatele
+        self.remove_row(self.selected_row)
+
+    def remove_row(self, index, record=True):
+        values = dict(zip(self.columns, self.table.display_row(index)))  # Pentru undo
+        self.selected_row = None
+        self.regressions.update(self.table, set(self.columns), [index], -1)
+        self.table.delete_row(index)
+        self.dirty.delete_row(index)
+        self.update_table_view()  # Formulele sunt pe rand, celelalte randuri nu se schimba
+        self.recalculate_dirty()  # Reporneste o recalculare in curs pe tabelul nou
+        self.record_change({"op": "delete_row", "row": index, "values": values} if record else None,
+                           {"op": "delete_row", "row": index})
 
     def add_column(self):
         col_name = simpledialog.askstring("Add Column", "Enter column name:")
@@ -204,47 +1120,59 @@ class DataTableApp(tk.Tk):
             if col_name in self.columns:
                 messagebox.showerror("Error", "Column already exists.")
                 return
-            self.columns.append(col_name)
-            for row in self.data:
-                row[col_name] = ""
-            self.update_table_view()
-            self.update_graph_options()  # Actualizeaza optiunile pentru grafic
+            self.insert_column(col_name)
         else:
             messagebox.showwarning("Add Column", "Invalid column name.")
 
+    def insert_column(self, col_name, column=None, position=None, record=True):
+        """Adauga o coloana goala sau una stearsa anterior (``column``, pe pozitia ``position``)."""
+        self.table.insert_column(col_name, column, position)
+        self.dirty.mark_column(col_name)  # Poate fi sursa unei formule existente
+        self.update_table_view()
+        self.update_graph_options()  # Actualizeaza optiunile pentru grafic
+        self.recalculate_dirty()
+        # Continutul unei coloane restaurate nu intra in jurnal: salvarea automata scrie tot proiectul
+        self.record_change({"op": "add_column", "column": col_name, "position": position, "data": None}
+                           if record else None,
+                           {"op": "add_column", "column": col_name, "position": position} if column is None else None)
+
     def delete_column(self):
         if not self.columns:
             messagebox.showwarning("Delete Column", "No columns to delete.")
             return
         col_name = simpledialog.askstring("Delete Column", f"Enter column name to delete:\nOptions: {', '.join(self.columns)}")
         if col_name in self.columns:
-            self.columns.remove(col_name)
-            for row in self.data:
-                if col_name in row:
-                    del row[col_name]
-            self.update_table_view()
-            self.update_graph_options()  # Actualizeaza optiunile pentru grafic
+            self.remove_column(col_name)
         else:
             messagebox.showerror("Error", "Column not found.")
 
+    def remove_column(self, col_name, record=True):
+        position = self.columns.index(col_name)
+        column = self.table.drop_column(col_name)  # Pastrata in istoric fara copiere
+        self.regressions.discard({col_name})
+        self.dirty.mark_column(col_name)  # Formulele dependente folosesc acum 0
+        self.update_table_view()
+        self.update_graph_options()  # Actualizeaza optiunile pentru grafic
+        self.recalculate_dirty()
+        self.record_change({"op": "delete_column", "column": col_name, "position": position, "data": column}
+                           if record else None,
+                           {"op": "delete_column", "column": col_name})
+
     def edit_cell(self):
         # Get selected cell via row selection and then ask for column
-        selected = self.tree.selection()
-        if not selected:
+        if self.selected_row is None:
             messagebox.showwarning("Edit Cell", "No row selected.")
             return
-        row_index = int(selected[0])
+        row_index = self.selected_row
         # Ask user which column to edit (by name)
         col_name = simpledialog.askstring("Edit Cell", f"Enter column name to edit:\nOptions: {', '.join(self.columns)}")
         if col_name not in self.columns:
             messagebox.showerror("Error", "Column not found.")
             return
-        current_value = self.data[row_index].get(col_name, "")
+        current_value = self.table.column(col_name).display(row_index)
         new_value = simpledialog.askstring("Edit Cell", f"Editing cell at row {row_index+1}, column '{col_name}':", initialvalue=current_value)
         if new_value is not None:
-            self.data[row_index][col_name] = new_value.strip()
-            self.update_table_view()
-            self.recalculate_results()  # Recalculeaza rezultatele
+            self.set_cell(row_index, col_name, new_value.strip())
 
     def on_cell_double_click(self, event):
         """Gestioneaza dublu clic pe celule sau zona libera."""
@@ -256,32 +1184,31 @@ class DataTableApp(tk.Tk):
             if col_index >= 0 and col_index < len(self.columns):
                 col_name = self.columns[col_index]
                 row_index = int(item)
-                current_value = self.data[row_index].get(col_name, "")
+                current_value = self.table.column(col_name).display(row_index)
                 new_value = simpledialog.askstring("Edit Cell", f"Editing cell at row {row_index+1}, column '{col_name}':", initialvalue=current_value)
                 if new_value is not None:
-                    self.data[row_index][col_name] = new_value.strip()
-                    self.update_table_view()
-                    self.recalculate_results()  # Recalculeaza rezultatele
+                    self.set_cell(row_index, col_name, new_value.strip())
         else:  # Dublu clic pe zona libera
             self.add_row()
 
+    def set_cell(self, row_index, col_name, value, record=True):
+        """Modifica o celula si recalculeaza doar celulele care depind de ea."""
+        old_value = self.table.column(col_name).display(row_index)
+        self.regressions.update(self.table, {col_name}, [row_index], -1)
+        self.table.set(row_index, col_name, value)
+        self.regressions.update(self.table, {col_name}, [row_index], 1)
+        self.refresh_rows([row_index])
+        self.dirty.mark(col_name, row_index)
+        self.recalculate_dirty()
+        self.record_change({"op": "set_cell", "row": row_index, "column": col_name, "old": old_value, "new": value}
+                           if record else None,
+                           {"op": "set_cell", "row": row_index, "column": col_name, "value": value})
+
     def set_formula(self):
         if len(self.columns) < 2:
             messagebox.showwarning("Setare formula", "Sunt necesare cel putin doua coloane pentru a aplica formula.")
             return
 
-        # Alege prima coloana sursa
-        source_column1 = simpledialog.askstring("Setare formula", f"Introduceti prima coloana sursa pentru formula:\nOptiuni: {', '.join(self.columns)}")
-        if source_column1 not in self.columns:
-            messagebox.showerror("Eroare", "Prima coloana sursa nu a fost gasita.")
-            return
-
-        # Alege a doua coloana sursa
-        source_column2 = simpledialog.askstring("Setare formula", f"Introduceti a doua coloana sursa pentru formula:\nOptiuni: {', '.join(self.columns)}")
-        if source_column2 not in self.columns:
-            messagebox.showerror("Eroare", "A doua coloana sursa nu a fost gasita.")
-            return
-
         # Alege coloana tinta
         target_column = simpledialog.askstring("Setare formula", f"Introduceti coloana tinta pentru formula:\nOptiuni: {', '.join(self.columns)}")
         if target_column not in self.columns:
@@ -292,173 +1219,559 @@ class DataTableApp(tk.Tk):
         formula_choice = messagebox.askquestion("Alegere formula", "Doriti sa utilizati o formula predefinita?")
         if formula_choice == "yes":
             # Selecteaza o formula din baza de date
-            formula_name = simpledialog.askstring("Selectare formula", f"Formule disponibile:\n{', '.join(FORMULAS_DB.keys())}")
-            if formula_name not in FORMULAS_DB:
+            formula_name = simpledialog.askstring("Selectare formula", f"Formule disponibile:\n{', '.join(core.FORMULAS_DB.keys())}")
+            if formula_name not in core.FORMULAS_DB:
                 messagebox.showerror("Eroare", "Formula nu a fost gasita.")
                 return
-            formula = FORMULAS_DB[formula_name]
+            formula = core.FORMULAS_DB[formula_name]
         else:
             # Introdu manual formula
-            formula = simpledialog.askstring("Setare formula", "Introduceti formula (folositi A si B ca variabile):")
+            formula = simpledialog.askstring("Setare formula", "Introduceti formula (variabile precum A, B, C sau nume de coloane):")
             if formula is None or formula.strip() == "":
                 return
             formula = formula.strip()
+        # Formula este verificata o singura data, inainte de a fi salvata
+        compiled = core.compile_formula(formula)
+        if compiled.error is not None:
+            messagebox.showerror("Eroare", f"Formula nu este valida: {compiled.error}")
+            return
 
-        # Salveaza configuratia formulei in dictionarul de formule
-        self.column_formulas[target_column] = {
-            "source_column1": source_column1,
-            "source_column2": source_column2,
+        # Leaga fiecare variabila a formulei de o coloana sursa
+        bindings = {}
+        for variable in compiled.variables:
+            source_column = simpledialog.askstring(
+                "Setare formula", f"Introduceti coloana sursa pentru variabila {variable}:\nOptiuni: {', '.join(self.columns)}",
+                initialvalue=variable if variable in self.columns else "")
+            if source_column is None:
+                return
+            if source_column not in self.columns:
+                messagebox.showerror("Eroare", f"Coloana sursa pentru {variable} nu a fost gasita.")
+                return
+            bindings[variable] = source_column
+
+        self.apply_formula(target_column, {
+            "bindings": bindings,
             "formula": formula
-        }
+        })
 
-        # Recalculeaza rezultatele initiale
-        self.recalculate_results()
+    def apply_formula(self, target_column, config, restore=None, record=True):
+        """Seteaza (sau, cu ``config`` None, sterge) formula coloanei si o recalculeaza.
 
-    def recalculate_results(self):
-        for target_column, config in self.column_formulas.items():
-            source_column1 = config["source_column1"]
-            source_column2 = config["source_column2"]
-            formula = config["formula"]
+        ``restore`` este continutul coloanei de pus inapoi cand formula este
+        anulata; valorile de dinaintea primei formule sunt pastrate in istoric.
+        """
+        # Salveaza configuratia formulei in dictionarul de formule
+        column_formulas = dict(self.column_formulas)
+        if config is None:
+            column_formulas.pop(target_column, None)
+        else:
+            column_formulas[target_column] = config
+        try:
+            self.formula_graph = core.FormulaGraph(column_formulas)
+        except core.FormulaCycleError as e:
+            messagebox.showerror("Eroare", str(e))
+            return
+        old_config = self.column_formulas.get(target_column)
+        # Valorile unei coloane cu formula pot fi recalculate; doar cele manuale sunt copiate
+        values = self.table.copy_column(target_column) if record and old_config is None else None
+        self.column_formulas = column_formulas
+        if restore is not None:
+            self.regressions.discard({target_column})
+            self.table.load_column(target_column, restore)
+            self.refresh_rows(None)
 
-            for i, row in enumerate(self.data):
-                try:
-                    # Creeaza contextul pentru evaluare
-                    context = {
-                        "A": float(row.get(source_column1, 0) or 0),  # Înlocuiește valorile goale cu 0
-                        "B": float(row.get(source_column2, 0) or 0)   # Înlocuiește valorile goale cu 0
-                    }
-                    result = eval(formula, {"__builtins__": {}, "np": np}, context)
-                    # Rotunjeste rezultatul la doua zecimale
-                    self.data[i][target_column] = round(result, 2)
-                except Exception as e:
-                    self.data[i][target_column] = f"Eroare: {e}"
-
-        # Actualizeaza tabelul pentru a include formula
-        self.update_table_view()
+        # Calculeaza rezultatele initiale ale coloanei tinta
+        self.dirty.mark_column(target_column)
+        self.recalculate_dirty()
+        self.record_change({"op": "set_formula", "column": target_column, "old": old_config, "new": config,
+                            "values": values} if record else None,
+                           {"op": "set_formula", "column": target_column, "formula": config}
+                           if restore is None else None)
 
-    def start_auto_update(self):
-        """Actualizeaza rezultatele la fiecare 2 secunde, daca este activata."""
-        if self.auto_update_enabled:
-            self.recalculate_results()  # Recalculeaza rezultatele
-        self.after(2000, self.start_auto_update)  # Reapeleaza functia dupa 2 secunde
+    def recalculate_dirty(self):
+        """Recalculeaza doar celulele marcate ca modificate si pe cele dependente.
 
-    def disable_auto_update(self):
-        """Dezactiveaza actualizarea automata."""
-        self.auto_update_enabled = False
+        Recalcularile mari ruleaza in fundal pe o copie a coloanelor tinta; o
+        modificare noua o inlocuieste pe cea in curs, iar rezultatul este aplicat
+        doar daca tabelul nu s-a schimbat intre timp.
+        """
+        if not self.dirty:
+            self.jobs.cancel("recalc")
+            return
+        table = self.table
+        targets = [target for target in self.formula_graph.order if target in table]
+        small = not self.dirty.columns and self.dirty.pending_rows() < BACKGROUND_ROWS
+        if small or len(table) < BACKGROUND_ROWS:
+            self.jobs.cancel("recalc")
+            # Randurile recalculate sunt dintre cele murdare: doar ele ies si intra in regresii
+            rows = set().union(*self.dirty.rows.values()) if small else None
+            self.update_regressions(targets, rows, -1)
+            with core.INSTRUMENTS.timer("recalc/sync"):
+                changed = core.recalculate_dirty(table, self.formula_graph, self.dirty)
+            self.update_regressions(targets, rows, 1)
+            self.refresh_rows(changed)
+            return
 
-    def enable_auto_update(self):
-        """Reactiveaza actualizarea automata."""
-        self.auto_update_enabled = True
+        snapshot = table.snapshot(writable=targets)
 
-    def graph_data(self):
-        """Genereaza graficul pe baza coloanelor selectate."""
-        self.disable_auto_update()  # Dezactiveaza actualizarea automata
-        
-        # Get selected x and y column names
+        def done(changed):
+            if self.table is not table or len(table) != len(snapshot):
+                return
+            self.update_regressions(targets, changed, -1)
+            for target in targets:
+                if target in table:
+                    table.load_column(target, snapshot.column(target))
+            self.update_regressions(targets, changed, 1)
+            self.dirty.clear()
+            self.refresh_rows(changed)
+
+        graph = self.formula_graph
+
+        def recalculate(job, dirty):
+            with core.INSTRUMENTS.timer("recalc/background"):
+                return core.recalculate_dirty(snapshot, graph, dirty)
+
+        self.jobs.submit("recalc", recalculate, self.dirty.copy(), on_done=done)
+
+    def update_regressions(self, columns, rows, sign):
+        """Actualizeaza regresiile pentru randurile ``rows``; None = coloanele s-au schimbat complet."""
+        if rows is None:
+            self.regressions.discard(set(columns))
+        else:
+            self.regressions.update(self.table, set(columns), rows, sign)
+
+    def graph_spec(self):
+        """Coloanele si optiunile graficului alese in interfata; None (cu mesaj) daca sunt invalide."""
         x_col = self.x_var.get()
-        y_col = self.y_var.get()
-        if x_col not in self.columns or y_col not in self.columns:
+        y_cols = self.selected_y_columns()
+        if x_col not in self.columns or not y_cols:
             messagebox.showerror("Graph Error", "Invalid column selection.")
-            self.enable_auto_update()  # Reactiveaza actualizarea automata
-            return
-        
-        # Collect data and convert to floats
-        x_data = []
-        y_data = []
-        for row in self.data:
-            try:
-                x_val = float(row.get(x_col, 0))
-                y_val = float(row.get(y_col, 0))
-                x_data.append(x_val)
-                y_data.append(y_val)
-            except ValueError:
-                continue  # skip rows with non-numeric data
+            return None
         
-        if not x_data or not y_data:
-            messagebox.showwarning("Graph Warning", "Not enough numeric data to plot.")
-            self.enable_auto_update()  # Reactiveaza actualizarea automata
+        try:
+            degree = int(self.degree_var.get())
+        except (tk.TclError, ValueError):
+            degree = 0
+        if self.trendline_var.get() and not 1 <= degree <= MAX_TRENDLINE_DEGREE:
+            messagebox.showerror("Graph Error", f"Trendline degree must be between 1 and {MAX_TRENDLINE_DEGREE}.")
+            return None
+        return {"x": x_col, "y": tuple(y_cols), "degree": degree if self.trendline_var.get() else None,
+                "polar": self.polar_var.get(), "equation": self.equation_var.get(),
+                "grid": self.layout_var.get() == "grid" and len(y_cols) > 1}
+
+    def graph_data(self, refresh=False):
+        """Genereaza graficul pe baza coloanelor selectate.
+
+        Cu ``refresh`` graficul deja deschis este actualizat pe loc, si doar daca
+        datele coloanelor lui s-au schimbat de la ultima desenare.
+        """
+        if not refresh:
+            spec = self.graph_spec()
+        elif self._graph_window is not None and self._graph_window.winfo_exists():
+            spec = self._graph_spec
+        else:
+            spec = None
+        if spec is None:
+            return
+        x_col, y_cols, degree, polar = spec["x"], spec["y"], spec["degree"], spec["polar"]
+
+        # Doar randurile care trec de filtre sunt desenate; regresiile din cache sunt pentru tot tabelul
+        rows = self.view_rows() if self.view.filters else None
+        main = self.table
+        tables = [("", main, rows)] + [(label, table, None) for label, table in self.compare_tables]
+        signature = (spec, [(table, table.version(x_col), [table.version(y_col) for y_col in y_cols])
+                            for _, table, _ in tables])
+        if refresh and signature == self._graph_signature and rows is self._graph_rows:
+            return
+        self._graph_spec, self._graph_signature, self._graph_rows = spec, signature, rows
+
+        # Datele sunt extrase in fundal (perechile deja extrase sunt luate din
+        # series_cache); regresia este luata din cache daca exista si
+        # construita o singura data altfel. Apasarile repetate pe Graph
+        # inlocuiesc lucrarea in curs
+        fits = {}
+        if degree and rows is None:
+            # Tabelul poate fi modificat cat timp lucrarea ruleaza
+            fits = {y_col: copy.deepcopy(self.regressions.get((x_col, y_col, degree, polar))) for y_col in y_cols}
+        generation = self.regressions.generation
+        series = self.series_cache
+
+        def done(results):
+            for label, y_col, result in results:
+                if result["fit"] is not None and not label and rows is None and main is self.table:
+                    self.regressions.store((x_col, y_col, degree, polar), result["fit"], generation)
+            self.plot_graph(spec, results, refresh)
+
+        def prepare(job):
+            results = []
+            with core.INSTRUMENTS.timer("graph/prepare", sum(len(table) for _, table, _ in tables)):
+                for label, table, table_rows in tables:
+                    for y_col in y_cols:
+                        if x_col in table and y_col in table:
+                            fit = fits.get(y_col) if table is main else None
+                            results.append((label, y_col, core.prepare_graph_data(
+                                table, x_col, y_col, degree, polar, fit, table_rows, series)))
+            return results
+
+        def failed(e):
+            if not refresh:
+                messagebox.showerror("Graph Error", f"Could not prepare graph: {e}")
+
+        self.jobs.submit("graph", prepare, on_done=done, on_error=failed)
+
+    def plot_graph(self, spec, results, refresh=False):
+        """Deseneaza seriile pregatite de prepare_graph_data (cate una pe tabel si coloana Y).
+
+        Figura si liniile sunt refolosite cat timp seriile sunt aceleasi; la o
+        actualizare (``refresh``) sunt schimbate doar datele lor.
+        """
+        if not any(result["x"].size for _, _, result in results):
+            if not refresh:
+                messagebox.showwarning("Graph Warning", "Not enough numeric data to plot.")
             return
+        x_col, y_cols, polar, grid = spec["x"], spec["y"], spec["polar"], spec["grid"]
+        labels = tuple(dict.fromkeys(label for label, _, _ in results))
+        single = len(results) == 1
+        errors = []
 
-        # Create a new figure for the graph
-        if self.polar_var.get():
-            fig = plt.figure()
-            ax = fig.add_subplot(111, projection="polar")
-            # For polar, assume x_data represents angles in degrees (convert to radians)
-            theta = np.deg2rad(x_data)
-            ax.plot(theta, y_data, 'bo', label="Data")
-            title_str = f"Polar Plot of {y_col} vs {x_col}"
-            ax.set_title(title_str)
-            # Trendline typically does not apply to polar coordinates
-            if self.trendline_var.get():
-                messagebox.showinfo("Trendline Info", "Trendline is not available for polar plots.")
+        # Graficul este desenat in fereastra refolosita, nu intr-o figura noua
+        with core.INSTRUMENTS.timer("graph/plot", sum(result["x"].size for _, _, result in results)):
+            window = self.graph_window()
+            axes = window.set_layout((x_col, y_cols, polar, grid, labels), len(y_cols) if grid else 1, polar)
+            on_axis = {}  # Ecuatiile de pe aceleasi axe sunt scrise una sub alta
+            for label, y_col, result in results:
+                ax = axes[y_cols.index(y_col)] if grid else axes[0]
+                name = f"{label}: {y_col}" if label else y_col
+                # For polar, assume x_data represents angles in degrees (convert to radians)
+                x_data = np.deg2rad(result["x"]) if polar else result["x"]
+                line = window.set_series((label, y_col), ax, x_data, result["y"], 'bo' if single else 'o',
+                                         "Data" if single else name)
+                # If trendline is selected, draw the polynomial regression from the running sums
+                # (in coordonate polare, r potrivit ca polinom in theta)
+                if result["error"] is not None:
+                    errors.append(f"{name}: {result['error']}")
+                points = core.trendline_points(result, polar) if result["coeffs"] is not None else None
+                text = core.equation_text(result) if points is not None and spec["equation"] else None
+                window.set_trendline((label, y_col), points, text, 'r' if single else line.get_color(),
+                                     on_axis.get(ax, 0), "Trendline" if single else f"{name} trendline")
+                if text is not None:
+                    on_axis[ax] = on_axis.get(ax, 0) + 1
+            window.remove_series({(label, y_col) for label, y_col, _ in results})
+            core.set_graph_titles(axes, x_col, y_cols, polar, grid)
+            window.rescale(force=not refresh)  # La actualizari, zoom-ul utilizatorului ramane
+            window.update_points(redraw=False)
+            for ax in axes:
+                ax.legend()
+
+        if errors and not refresh:
+            messagebox.showerror("Trendline Error", "Could not compute trendline:\n" + "\n".join(errors))
+        if refresh:
+            window.canvas.draw_idle()
         else:
-            fig, ax = plt.subplots()
-            ax.plot(x_data, y_data, 'bo', label="Data")
-            title_str = f"{y_col} vs {x_col}"
-            ax.set_title(title_str)
-            ax.set_xlabel(x_col)
-            ax.set_ylabel(y_col)
-            
-            # If trendline is selected, compute linear regression
-            if self.trendline_var.get():
-                try:
-                    coeffs = np.polyfit(x_data, y_data, 1)  # linear fit: slope and intercept
-                    poly_eq = np.poly1d(coeffs)
-                    # Create line using the min and max of x_data
-                    x_line = np.linspace(min(x_data), max(x_data), 100)
-                    y_line = poly_eq(x_line)
-                    ax.plot(x_line, y_line, 'r-', label="Trendline")
-                    # If equation display is selected, add text annotation
-                    if self.equation_var.get():
-                        eq_str = f"y = {coeffs[0]:.3f}x + {coeffs[1]:.3f}"
-                        ax.text(0.05, 0.95, eq_str, transform=ax.transAxes, fontsize=10,
-                                verticalalignment='top', bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5))
-                except Exception as e:
-                    messagebox.showerror("Trendline Error", f"Could not compute trendline: {e}")
-                    
-        ax.legend()
-        plt.show()
-        
-        self.enable_auto_update()  # Reactiveaza actualizarea automata
+            window.show()
+
+    def schedule_graph_refresh(self):
+        """Actualizeaza graficul deschis dupa o modificare a datelor, cel mult o data la GRAPH_REFRESH_MS."""
+        if self._graph_spec is None or self._graph_refresh_after is not None or not self.live_var.get():
+            return
+        self._graph_refresh_after = self.after(GRAPH_REFRESH_MS, self.refresh_graph)
+
+    def refresh_graph(self):
+        self._graph_refresh_after = None
+        self.graph_data(refresh=True)
+
+    def add_compare_tables(self):
+        """Adauga in grafic aceleasi coloane din alte proiecte (incarcate in fundal)."""
+        file_paths = filedialog.askopenfilenames(filetypes=[("Project files", "*.cproj *.json"),
+                                                            ("All files", "*.*")])
+        if not file_paths:
+            return
+
+        def load(job):
+            return [(os.path.basename(path), core.load_project_file(path)[0]) for path in file_paths]
+
+        def done(tables):
+            self.compare_tables.extend(tables)
+            self.graph_data(refresh=True)
+
+        self.jobs.submit("compare", load, on_done=done,
+                         on_error=lambda e: messagebox.showerror("Compare Projects", f"Could not open project: {e}"))
+
+    def clear_compare_tables(self):
+        for _, table in self.compare_tables:
+            self.series_cache.discard_table(table)  # Altfel cache-ul tine tabelele in memorie
+        self.compare_tables = []
+        self.graph_data(refresh=True)
+
+    def graph_window(self):
+        """Fereastra graficului; este creata la prima folosire sau dupa ce a fost inchisa."""
+        if self._graph_window is None or not self._graph_window.winfo_exists():
+            self._graph_window = GraphWindow(self)
+        return self._graph_window
+
+    def graph_settings(self):
+        """Setarile curente ale graficului, salvate in proiect."""
+        try:
+            degree = int(self.degree_var.get())
+        except (tk.TclError, ValueError):
+            degree = 1  # Text invalid in Degree: salvarea nu trebuie sa esueze din cauza lui
+        return {
+            "x_column": self.x_var.get(),
+            "y_column": next(iter(self.selected_y_columns()), ""),  # Pentru proiectele deschise de versiuni vechi
+            "y_columns": self.selected_y_columns(),
+            "layout": self.layout_var.get(),
+            "trendline": self.trendline_var.get(),
+            "equation": self.equation_var.get(),
+            "polar": self.polar_var.get(),
+            "degree": degree,
+        }
+
+    def apply_graph_settings(self, settings):
+        self.x_var.set(settings.get("x_column", ""))
+        self.select_y_columns(core.graph_columns(settings))
+        self.layout_var.set(settings.get("layout", GRAPH_LAYOUTS[0]))
+        self.trendline_var.set(settings.get("trendline", False))
+        self.equation_var.set(settings.get("equation", False))
+        self.polar_var.set(settings.get("polar", False))
+        self.degree_var.set(settings.get("degree", 1))
+
+    def replace_table(self, table):
+        """Inlocuieste tabelul curent si reseteaza starea vizualizarii."""
+        self.jobs.cancel("recalc")
+        self.jobs.cancel("view")
+        self.jobs.cancel("view-refresh")
+        self._view_refresh = None
+        self.table = table
+        self.view = core.TableView()
+        self.view_offset = 0
+        self.selected_row = None
+        self.dirty.clear()
+        self.regressions.clear()
+        self.series_cache.clear()
 
     def save_project(self):
-        # Save the current project (table data and columns) as a JSON file.
-        file_path = filedialog.asksaveasfilename(defaultextension=".json",
-                                                 filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        # Save the current project (table, formulas and graph settings).
+        file_path = filedialog.asksaveasfilename(defaultextension=".cproj",
+                                                 filetypes=[("Project files", "*.cproj"), ("JSON files", "*.json"),
+                                                            ("All files", "*.*")])
         if file_path:
             try:
-                project = {
-                    "columns": self.columns,
-                    "data": self.data,
-                }
-                with open(file_path, "w") as f:
-                    json.dump(project, f, indent=4)
+                with core.INSTRUMENTS.timer("io/Save Project", len(self.table)):
+                    if file_path.lower().endswith(".json"):
+                        core.save_json_project(file_path, self.table, self.column_formulas, self.graph_settings())
+                    else:
+                        core.save_project_file(file_path, self.table, self.column_formulas, self.graph_settings())
+                self.autosave.reset(file_path)  # Modificarile salvate automat sunt de acum in proiect
                 messagebox.showinfo("Save Project", "Project saved successfully.")
             except Exception as e:
                 messagebox.showerror("Save Error", f"An error occurred while saving: {e}")
 
     def open_project(self):
-        # Open and load a saved project from a JSON file.
-        file_path = filedialog.askopenfilename(defaultextension=".json",
-                                               filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        # Open and load a saved project (binary .cproj or the older JSON format).
+        file_path = filedialog.askopenfilename(filetypes=[("Project files", "*.cproj *.json"), ("All files", "*.*")])
         if file_path:
-            try:
-                with open(file_path, "r") as f:
-                    project = json.load(f)
-                self.columns = project.get("columns", [])
-                self.data = project.get("data", [])
-                self.update_table_view()
+            self.load_project(file_path)
+
+    def load_project(self, file_path):
+        """Incarca proiectul in fundal; primul ecran de randuri este afisat inainte de rest."""
+        state = {}
+
+        def steps():
+            for project, fraction in core.load_project_chunks(file_path):
+                state.setdefault("project", project)
+                yield fraction
+
+        def step():
+            if "shown" not in state:
+                state["shown"] = self.apply_project(state["project"])
+            elif state["shown"]:
+                self.show_loaded_rows()
+
+        def done(completed):
+            if not state.get("shown"):
+                return
+            self.show_loaded_rows()
+            # Un proiect incarcat partial nu poate servi drept baza salvarii automate
+            self.reset_history(file_path if completed else None)
+            if completed:
                 messagebox.showinfo("Open Project", "Project loaded successfully.")
-            except Exception as e:
-                messagebox.showerror("Open Error", f"An error occurred while opening the project: {e}")
+            else:
+                messagebox.showinfo("Open Project", f"Loading stopped after {len(self.table)} rows.")
+
+        self.run_chunked("Open Project", steps(), on_step=step, on_done=done)
+
+    def apply_project(self, project):
+        """Afiseaza un proiect incarcat de load_project_chunks; returneaza False daca este invalid."""
+        table, column_formulas, graph_settings = project
+        try:
+            formula_graph = core.FormulaGraph(column_formulas)
+        except core.FormulaCycleError as e:
+            messagebox.showerror("Open Error", f"An error occurred while opening the project: {e}")
+            return False
+        self.replace_table(table)
+        self.column_formulas = column_formulas
+        self.formula_graph = formula_graph
+        # Operatiile din istoric se refera la proiectul inlocuit
+        self.journal.clear()
+        # Rezultatele formulelor sunt salvate in proiect, nu se recalculeaza
+        self.update_table_view()
+        self.apply_graph_settings(graph_settings)
+        self.update_graph_options()
+        return True
+
+    def convert_json_project(self):
+        # Convert an older JSON project to the binary project format.
+        source_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not source_path:
+            return
+        target_path = filedialog.asksaveasfilename(defaultextension=".cproj",
+                                                   initialfile=os.path.splitext(os.path.basename(source_path))[0],
+                                                   filetypes=[("Project files", "*.cproj"), ("All files", "*.*")])
+        if target_path:
+            self.jobs.submit("convert", lambda job: core.convert_project(source_path, target_path),
+                             on_done=lambda result: messagebox.showinfo("Convert Project",
+                                                                        "Project converted successfully."),
+                             on_error=lambda e: messagebox.showerror(
+                                 "Convert Error", f"An error occurred while converting the project: {e}"))
+
+    def run_chunked(self, title, steps, on_step=None, on_done=None):
+        """Ruleaza un generator in fundal, cu fereastra de progres si anulare.
+
+        ``steps`` produce fractia terminata dupa fiecare bucata; ``on_step`` este
+        apelat pe firul Tk dupa fiecare pas, iar ``on_done(completed)`` la final.
+        """
+        dialog = ProgressDialog(self, title)
+        self._chunked += 1
+
+        def work(job):
+            with core.INSTRUMENTS.timer(f"io/{title}") as timer:
+                for fraction in steps:
+                    if dialog.cancelled or job.cancelled:
+                        steps.close()
+                        return False
+                    job.report(fraction)
+                timer.rows = len(self.table)
+            return True
+
+        def progress(fraction):
+            dialog.set_progress(fraction)
+            if on_step:
+                on_step()
+
+        def done(completed):
+            dialog.destroy()
+            self._chunked -= 1
+            if on_done:
+                on_done(completed)
+
+        def failed(e):
+            dialog.destroy()
+            self._chunked -= 1
+            messagebox.showerror(title, f"An error occurred: {e}")
+            if on_done:
+                on_done(False)
+
+        self.jobs.submit(title, work, on_done=done, on_error=failed, on_progress=progress)
+
+    def load_table_chunks(self, title, reader, file_path):
+        """Inlocuieste tabelul cu unul nou, umplut treptat de ``reader``.
+
+        Copia de baza a salvarii automate este scrisa tot in fundal, la finalul
+        importului, cat timp tabelul nu poate fi modificat.
+        """
+        if not messagebox.askyesno(title, "Importing replaces the current table and its formulas "
+                                          "and cannot be undone. Continue?"):
+            return
+        self.replace_table(core.Table())
+        # Formulele vechi nu se aplica noilor coloane (chiar daca au aceleasi nume)
+        self.column_formulas = {}
+        self.formula_graph = core.FormulaGraph(self.column_formulas)
+        self.reset_history()
+        base_path = self.autosave.begin_base()
+        graph_settings = self.graph_settings()
+        state = {}
+
+        def steps():
+            yield from reader(file_path, self.table)
+            try:
+                core.save_project_file(base_path, self.table, {}, graph_settings)
+                state["base"] = True
+            except OSError as e:
+                print(f"Autosave failed: {e}", file=sys.stderr)  # Importul ramane valid
+
+        def done(completed):
+            try:
+                if state.get("base"):
+                    self.autosave.finish_base(base_path)
+                else:
+                    self.autosave.cancel_base(base_path)
+            except OSError as e:
+                print(f"Autosave failed: {e}", file=sys.stderr)
+            self.show_loaded_rows()
+            if not completed:
+                messagebox.showinfo(title, f"Import stopped after {len(self.table)} rows.")
+
+        self.run_chunked(title, steps(), on_step=self.show_loaded_rows, on_done=done)
+
+    def show_loaded_rows(self):
+        """Afiseaza randurile adaugate de o incarcare pe bucati.
+
+        Randurile sunt adaugate direct in tabel, fara ``regressions.update``, deci
+        regresiile din cache (inclusiv cele calculate pe bucatile de pana acum)
+        sunt abandonate si refacute la urmatorul grafic.
+        """
+        self.regressions.clear()
+        self.update_table_view()
+
+    def import_csv(self):
+        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if file_path:
+            self.load_table_chunks("Import CSV", core.read_csv_chunks, file_path)
+
+    def import_binary_table(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Binary tables", "*.ctab"), ("All files", "*.*")])
+        if file_path:
+            self.load_table_chunks("Import Binary Table", core.read_table_chunks, file_path)
+
+    def save_table_chunks(self, title, writer, file_path):
+        """Exporta tabelul pe bucati; un export anulat nu lasa fisiere partiale."""
+        def done(completed):
+            if not completed and os.path.exists(file_path):
+                os.remove(file_path)
+
+        self.run_chunked(title, writer(self.table, file_path), on_done=done)
+
+    def export_csv(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                 filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if file_path:
+            self.save_table_chunks("Export CSV", core.write_csv_chunks, file_path)
+
+    def export_binary_table(self):
+        file_path = filedialog.asksaveasfilename(defaultextension=".ctab",
+                                                 filetypes=[("Binary tables", "*.ctab"), ("All files", "*.*")])
+        if file_path:
+            self.save_table_chunks("Export Binary Table", core.write_table_chunks, file_path)
 
     def new_project(self):
         # Reset the table data and columns.
-        if messagebox.askyesno("New Project", "Are you sure you want to create a new project? Unsaved changes will be lost."):
-            self.columns = ["Column1", "Column2"]
-            self.data = []
-            self.update_table_view()
+        if messagebox.askyesno("New Project", "Are you sure you want to create a new project? It can be undone with Edit > Undo."):
+            self.replace_project(core.Table(["Column1", "Column2"]), {}, self.graph_settings())
+
+    def replace_project(self, table, column_formulas, graph_settings, record=True):
+        """Inlocuieste tabelul, formulele si setarile graficului; proiectul vechi ramane in istoric."""
+        old = (self.table, self.column_formulas, self.graph_settings())
+        self.replace_table(table)
+        self.column_formulas = column_formulas
+        self.formula_graph = core.FormulaGraph(column_formulas)
+        self.update_table_view()
+        self.apply_graph_settings(graph_settings)
+        self.update_graph_options()
+        self.record_change({"op": "replace", "old": old, "new": (table, column_formulas, graph_settings)}
+                           if record else None, None)
 
 if __name__ == "__main__":
     app = DataTableApp()
+    if len(sys.argv) > 1:
+        app.load_project(sys.argv[1])  # python Coordonate.py proiect.cproj
     app.mainloop()
\ No newline at end of file
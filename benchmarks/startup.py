@@ -0,0 +1,75 @@
+"""Benchmark pentru pornirea aplicatiei: timpul fiecarei etape, comparat cu bugetul ei.
+
+Fiecare masuratoare ruleaza intr-un proces Python nou (pornire la rece). Fara
+afisaj este masurat doar importul modulului Coordonate.
+
+    python benchmarks/startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Bugetul (secunde, mediana) pentru fiecare etapa a pornirii
+STARTUP_BUDGET = {"import": 0.2, "window": 0.6, "core": 0.8, "ready": 1.0}
+# Module care nu trebuie sa fie importate odata cu Coordonate
+DEFERRED_MODULES = ("numpy", "matplotlib", "coordonate_core")
+
+_CHILD = f"""
+import json, shutil, sys, tempfile, time
+start = time.perf_counter()
+import Coordonate
+times = {{"import": time.perf_counter() - start}}
+heavy = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+autosave_dir = tempfile.mkdtemp()  # Salvarea automata a utilizatorului ramane neatinsa
+try:
+    app = Coordonate.DataTableApp(autosave_dir)
+except Coordonate.tk.TclError:
+    pass  # Fara afisaj
+else:
+    times.update(app.startup_times)
+    app.destroy()
+shutil.rmtree(autosave_dir, ignore_errors=True)
+print(json.dumps({{"times": times, "heavy_imports": heavy}}))
+"""
+
+
+def measure(runs):
+    """Ruleaza pornirea de ``runs`` ori; returneaza (mediana pe etapa, module importate prea devreme)."""
+    samples = {}
+    heavy = set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _CHILD], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        for stage, seconds in result["times"].items():
+            samples.setdefault(stage, []).append(seconds)
+        heavy.update(result["heavy_imports"])
+    return {stage: statistics.median(values) for stage, values in samples.items()}, sorted(heavy)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Masoara pornirea aplicatiei si o compara cu bugetul.")
+    parser.add_argument("--runs", type=int, default=5, help="numarul de porniri masurate")
+    parser.add_argument("--output", help="fisierul JSON cu rezultatele")
+    args = parser.parse_args(argv)
+
+    times, heavy = measure(args.runs)
+    over = {stage: seconds for stage, seconds in times.items() if seconds > STARTUP_BUDGET.get(stage, float("inf"))}
+    for stage, seconds in times.items():
+        print(f"{stage:>8}: {seconds * 1000:8.1f} ms (budget {STARTUP_BUDGET.get(stage, float('nan')) * 1000:.0f} ms)")
+    if heavy:
+        print(f"imported with Coordonate: {', '.join(heavy)}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"times": times, "budget": STARTUP_BUDGET, "heavy_imports": heavy,
+                       "over_budget": sorted(over)}, f, indent=2)
+    return 1 if over or heavy else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
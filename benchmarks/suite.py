@@ -0,0 +1,287 @@
+"""Benchmark-uri pentru caile critice: formule, recalculare, afisare, sortare, proiecte si grafic.
+
+Datele sunt generate sintetic (acelasi seed, aceleasi date) si masurate direct
+pe coordonate_core, fara interfata grafica. Cu --gui (si un afisaj, de exemplu
+``xvfb-run``) este masurata si reconstruirea Treeview-ului, iar cu --startup
+pornirea aplicatiei (benchmarks/startup.py). Rezultatele sunt scrise in JSON si
+pot fi comparate cu cele ale altui commit:
+
+    python benchmarks/suite.py --sizes 1k,100k,1M --output before.json
+    python benchmarks/suite.py --sizes 1k,100k,1M --output after.json --baseline before.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import coordonate_core as core
+
+DEFAULT_SIZES = "1k,10k,100k,1M"
+# O masuratoare este regresie daca este mai lenta decat baza cu peste aceasta fractie
+DEFAULT_THRESHOLD = 0.25
+# Masuratorile mai scurte sunt dominate de zgomot si nu sunt comparate
+MIN_COMPARED_SECONDS = 0.001
+# Coloanele sursa generate: toate variabilele folosite de FORMULAS_DB
+SOURCE_COLUMNS = ("A", "B", "C", "D", "E", "F")
+# Proiectele JSON si CSV sunt masurate doar pana la aceste dimensiuni (sunt lente)
+JSON_MAX_ROWS = 100000
+CSV_MAX_ROWS = 1000000
+# Randurile unui ecran din Treeview si numarul de ecrane afisate
+SCREEN_ROWS = 30
+SCREENS = 100
+
+
+def parse_size(text):
+    """``1k`` -> 1000, ``10M`` -> 10000000."""
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1].lower(), 1)
+    return int(float(text.rstrip("kKmM")) * multiplier)
+
+
+def make_table(rows, seed=0, zero_fraction=0.01, text_fraction=0.001):
+    """Tabel sintetic cu coloanele SOURCE_COLUMNS.
+
+    Valorile sunt in [0.5, 10); o fractie din celule este 0 (impartiri la zero,
+    logaritmi) si una text (evaluarea rand cu rand a erorilor).
+    """
+    rng = np.random.default_rng(seed)
+    columns = []
+    for name in SOURCE_COLUMNS:
+        values = rng.uniform(0.5, 10.0, rows)
+        values[rng.random(rows) < zero_fraction] = 0.0
+        valid = np.ones(rows, dtype=bool)
+        text = None
+        text_rows = np.flatnonzero(rng.random(rows) < text_fraction)
+        if text_rows.size:
+            valid[text_rows] = False
+            text = np.empty(rows, dtype=object)
+            text[text_rows] = "n/a"
+        columns.append((name, core.Column.from_arrays(values, valid, text)))
+    return core.Table.from_columns(columns, rows)
+
+
+def add_formula_columns(table, count):
+    """Adauga ``count`` coloane cu formule din FORMULAS_DB, inlantuite (R1 depinde de R0, ...)."""
+    formulas = list(core.FORMULAS_DB.values())
+    column_formulas = {}
+    for i in range(count):
+        target = f"R{i}"
+        table.add_column(target)
+        bindings = {"A": f"R{i - 1}"} if i else {}
+        column_formulas[target] = {"bindings": bindings, "formula": formulas[i % len(formulas)]}
+    return column_formulas
+
+
+def timed(func, repeat):
+    """Cel mai bun timp (secunde) din ``repeat`` rulari."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_formulas(table, repeat):
+    """Fiecare formula din FORMULAS_DB, evaluata pe toate randurile."""
+    for name, formula in core.FORMULAS_DB.items():
+        sources = core.formula_sources({"bindings": {}, "formula": formula}, table)
+        yield f"formula/{name}", timed(lambda: core.evaluate_formula_column(table, formula, sources), repeat)
+
+
+def bench_recalc(rows, repeat, formula_columns):
+    """Recalcularea completa a M coloane cu formule si recalcularea dupa editarea unei celule."""
+    table = make_table(rows)  # Tabel separat: coloanele cu formule si editarea nu ating celelalte masuratori
+    column_formulas = add_formula_columns(table, formula_columns)
+    yield f"recalc/full/{formula_columns}", timed(lambda: core.recalculate_all(table, column_formulas), repeat)
+
+    graph = core.FormulaGraph(column_formulas)
+    row = len(table) // 2
+
+    def edit():
+        table.set(row, "A", "3.5")
+        dirty = core.DirtyTracker()
+        dirty.mark("A", row)
+        core.recalculate_dirty(table, graph, dirty)
+
+    yield f"recalc/cell/{formula_columns}", timed(edit, repeat), 1
+
+
+def bench_view(table, repeat):
+    """Textul randurilor pentru SCREENS ecrane la pozitii aleatoare (partea din model a render_rows)."""
+    offsets = np.random.default_rng(1).integers(0, max(1, len(table) - SCREEN_ROWS), SCREENS)
+
+    def render():
+        for offset in offsets:
+            for i in range(offset, min(len(table), offset + SCREEN_ROWS)):
+                table.display_row(i)
+
+    yield "view/screens", timed(render, repeat), SCREENS * SCREEN_ROWS
+
+
+def bench_index(table, repeat):
+    """Sortarea, filtrarea si agregarea pe coloane (indexurile sortate sunt recalculate la fiecare rulare)."""
+    def sort():
+        table.touch("B")  # Fara indexul pastrat de rularea anterioara
+        table.sort_index("B")
+
+    def filtered():
+        table.touch("A")
+        core.TableView("B", filters=[{"column": "A", "min": 2.0, "max": 8.0}]).rows(table)
+
+    def group_by():
+        table.touch("C")
+        core.group_by(table, "C", "B")
+
+    yield "index/sort", timed(sort, repeat)
+    yield "index/filter", timed(filtered, repeat)
+    yield "index/aggregate", timed(lambda: core.aggregate(table, "B"), repeat)
+    yield "index/group_by", timed(group_by, repeat)
+
+
+def bench_project(table, repeat, directory):
+    """Salvarea si deschiderea proiectelor (.cproj si, pentru tabele mici, JSON)."""
+    path = os.path.join(directory, "bench.cproj")
+
+    def load():
+        loaded = core.load_project_file(path)[0]
+        for name in loaded.columns:
+            loaded.numeric(name)[0].sum()  # Citeste efectiv datele mapate
+
+    yield "project/cproj_save", timed(lambda: core.save_project_file(path, table), repeat)
+    yield "project/cproj_open", timed(load, repeat)
+    if len(table) <= JSON_MAX_ROWS:
+        path = os.path.join(directory, "bench.json")
+        yield "project/json_save", timed(lambda: core.save_json_project(path, table), repeat)
+        yield "project/json_open", timed(lambda: core.load_project_file(path), repeat)
+    if len(table) <= CSV_MAX_ROWS:
+        path = os.path.join(directory, "bench.csv")
+        yield "io/csv_export", timed(lambda: list(core.write_csv_chunks(table, path)), repeat)
+        yield "io/csv_import", timed(lambda: list(core.read_csv_chunks(path, core.Table())), repeat)
+
+
+def bench_graph(table, repeat):
+    """Extragerea datelor graficului, regresia si decimarea punctelor."""
+    yield "graph/data", timed(lambda: core.prepare_graph_data(table, "A", "B"), repeat)
+    series = core.SeriesCache()
+    series.get(table, "A", "B")
+    yield "graph/data_cached", timed(lambda: core.prepare_graph_data(table, "A", "B", series=series), repeat)
+    yield "graph/regression", timed(lambda: core.prepare_graph_data(table, "A", "B", degree=1), repeat)
+    data = core.prepare_graph_data(table, "A", "B")
+    x, y = data["x"], data["y"]
+    yield "graph/polyfit", timed(lambda: np.polyfit(x, y, 1), repeat)
+    yield "graph/decimate", timed(lambda: core.decimate_points(x, y, (x.min(), x.max()), (y.min(), y.max()),
+                                                               640, 480), repeat)
+
+
+def bench_gui(table, repeat):
+    """Reconstruirea Treeview-ului in aplicatie (necesita un afisaj)."""
+    import Coordonate
+
+    autosave_dir = tempfile.mkdtemp()  # Salvarea automata a utilizatorului ramane neatinsa
+    app = Coordonate.DataTableApp(autosave_dir)
+    try:
+        app.replace_table(table)
+
+        def rebuild():
+            app.update_table_view()
+            app.update_idletasks()
+
+        yield "gui/update_table_view", timed(rebuild, repeat)
+    finally:
+        app.destroy()
+        shutil.rmtree(autosave_dir, ignore_errors=True)
+
+
+def run(sizes, repeat, formula_columns, gui=False):
+    """Ruleaza toate benchmark-urile; returneaza {"grup/nume/randuri": {...}}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            table = make_table(rows)
+            groups = [bench_formulas(table, repeat), bench_view(table, repeat), bench_index(table, repeat),
+                      bench_graph(table, repeat), bench_project(table, repeat, directory)]
+            groups += [bench_recalc(rows, repeat, count) for count in formula_columns]
+            if gui:
+                groups.append(bench_gui(table, repeat))
+            for group in groups:
+                # Fiecare masuratoare poate preciza cate randuri a procesat (implicit, tot tabelul)
+                for name, seconds, *processed in group:
+                    key = f"{name}/{rows}"
+                    count = processed[0] if processed else rows
+                    results[key] = {"seconds": seconds, "rows": count, "rows_per_second": count / seconds}
+                    print(f"{key:<48} {seconds * 1000:10.2f} ms {count / seconds:14,.0f} rows/s", flush=True)
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"commit": commit, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine()}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Masuratorile mai lente decat baza cu peste ``threshold``: lista (cheie, vechi, nou, raport)."""
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None or max(old["seconds"], result["seconds"]) < MIN_COMPARED_SECONDS:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append((key, old["seconds"], result["seconds"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru tabel, formule, recalculare si grafic.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="numarul de randuri, de ex. 1k,100k,10M")
+    parser.add_argument("--repeat", type=int, default=3, help="rulari pe masuratoare (se pastreaza cea mai buna)")
+    parser.add_argument("--formula-columns", default="1,8", help="numarul de coloane cu formule recalculate")
+    parser.add_argument("--gui", action="store_true", help="masoara si Treeview-ul (necesita un afisaj)")
+    parser.add_argument("--startup", action="store_true", help="masoara si pornirea aplicatiei")
+    parser.add_argument("--output", help="fisierul JSON cu rezultatele")
+    parser.add_argument("--baseline", help="rezultatele JSON ale altui commit, pentru comparatie")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="incetinirea relativa raportata ca regresie (implicit 0.25)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    formula_columns = [int(count) for count in args.formula_columns.split(",")]
+    results = run(sizes, args.repeat, formula_columns, args.gui)
+    if args.startup:
+        import startup
+
+        for stage, seconds in startup.measure(args.repeat)[0].items():
+            results[f"startup/{stage}"] = {"seconds": seconds}
+            print(f"{'startup/' + stage:<48} {seconds * 1000:10.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for key, old, new, ratio in regressions:
+            print(f"REGRESSION {key}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms ({ratio:.2f}x)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Mod fara interfata grafica: recalculeaza formulele proiectelor si exporta rezultatele.
+
+Exemple:
+    python coordonate_cli.py proiect.cproj --export csv
+    python coordonate_cli.py proiecte/ --export ctab --plot --jobs 4
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from coordonate_core import (
+    load_project_file, recalculate_all, render_graph, save_project_file, write_csv_chunks, write_table_chunks,
+)
+
+# Extensiile fisierelor cautate intr-un director de proiecte
+PROJECT_EXTENSIONS = (".cproj", ".json")
+# Extensia fisierului rezultat pentru fiecare format de export
+EXPORT_EXTENSIONS = {"csv": ".csv", "ctab": ".ctab", "cproj": ".cproj"}
+
+
+def find_projects(paths):
+    """Lista fisierelor de proiect: fisierele date ca atare, directoarele parcurse (fara subdirectoare)."""
+    projects = []
+    for path in paths:
+        if os.path.isdir(path):
+            projects.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                            if name.lower().endswith(PROJECT_EXTENSIONS))
+        else:
+            projects.append(path)
+    return projects
+
+
+def _path_key(path):
+    """Cheia unui fisier pentru comparatii: calea absoluta, normalizata pe Windows."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def output_paths(path, output_dir=None, export="csv", plot=False):
+    """Fisierele pe care ``process_project`` le scrie pentru proiectul ``path``."""
+    base = os.path.splitext(os.path.basename(path))[0]
+    output_base = os.path.join(output_dir or os.path.dirname(path), base)
+    targets = []
+    if export:
+        targets.append(output_base + EXPORT_EXTENSIONS[export])
+    if plot:
+        targets.append(output_base + ".png")
+    return targets
+
+
+def find_collisions(projects, output_dir=None, export="csv", plot=False):
+    """Fisierele rezultat care ar inlocui un proiect de intrare sau rezultatul altui proiect.
+
+    Returneaza perechi (proiect, mesaj), in ordinea proiectelor; lista goala
+    inseamna ca fiecare proiect scrie doar fisiere proprii.
+    """
+    inputs = {_path_key(path): path for path in projects}
+    owners = {}
+    collisions = []
+    for path in projects:
+        for target in output_paths(path, output_dir, export, plot):
+            key = _path_key(target)
+            if key in inputs:
+                collisions.append((path, f"{target} would overwrite the project {inputs[key]}"))
+            elif key in owners:
+                collisions.append((path, f"{target} is also written for {owners[key]}"))
+            else:
+                owners[key] = path
+    return collisions
+
+
+def process_project(path, output_dir=None, export="csv", plot=False, dpi=100):
+    """Incarca un proiect, recalculeaza formulele si scrie rezultatele; returneaza fisierele scrise.
+
+    Ridica ValueError daca exportul ar inlocui chiar fisierul proiectului
+    (--export cproj fara --output-dir); ``main`` verifica in plus, cu
+    ``find_collisions``, si rezultatele care se suprapun intre proiecte.
+    """
+    targets = output_paths(path, output_dir, export, plot)
+    if _path_key(path) in map(_path_key, targets):
+        raise ValueError("export would overwrite the project itself; use --output-dir")
+
+    table, column_formulas, graph_settings = load_project_file(path)
+    recalculate_all(table, column_formulas)
+
+    written = []
+    if export:
+        target = targets[0]
+        if export == "csv":
+            for _ in write_csv_chunks(table, target):
+                pass
+        elif export == "ctab":
+            for _ in write_table_chunks(table, target):
+                pass
+        else:
+            save_project_file(target, table, column_formulas, graph_settings)
+        written.append(target)
+    if plot:
+        target = targets[-1]
+        render_graph(target, table, graph_settings, dpi)
+        written.append(target)
+    return written
+
+
+def _process(args):
+    # Rulat in procesele lucratoare: erorile sunt returnate, nu aruncate
+    path, options = args
+    try:
+        return path, process_project(path, **options), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
+
+def _report(results):
+    """Afiseaza rezultatul fiecarui proiect; returneaza numarul proiectelor esuate."""
+    failed = 0
+    for path, written, error in results:
+        if error is None:
+            print(f"{path}: {', '.join(written) or 'ok'}")
+        else:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalculeaza formulele proiectelor si exporta rezultatele.")
+    parser.add_argument("paths", nargs="+", help="fisiere de proiect (.cproj/.json) sau directoare cu proiecte")
+    parser.add_argument("--export", choices=sorted(EXPORT_EXTENSIONS), default="csv",
+                        help="formatul rezultatelor (implicit csv)")
+    parser.add_argument("--no-export", dest="export", action="store_const", const=None,
+                        help="nu exporta tabelul (de exemplu, doar --plot)")
+    parser.add_argument("--output-dir", help="directorul rezultatelor (implicit, langa fiecare proiect)")
+    parser.add_argument("--plot", action="store_true", help="salveaza si graficul proiectului ca imagine PNG")
+    parser.add_argument("--dpi", type=int, default=100, help="rezolutia imaginii graficului")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="numarul de procese folosite in paralel (implicit, cate unul pe nucleu)")
+    args = parser.parse_args(argv)
+
+    projects = list({_path_key(path): path for path in find_projects(args.paths)}.values())
+    if not projects:
+        parser.error("no project files found")
+    # Toate rezultatele sunt verificate inainte de a porni vreun proiect
+    collisions = find_collisions(projects, args.output_dir, args.export, args.plot)
+    if collisions:
+        _report((path, [], message) for path, message in collisions)
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    options = {"output_dir": args.output_dir, "export": args.export, "plot": args.plot, "dpi": args.dpi}
+    tasks = [(path, options) for path in projects]
+
+    jobs = max(1, min(args.jobs or 1, len(projects)))
+    if jobs == 1:
+        failed = _report(map(_process, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            failed = _report(executor.map(_process, tasks))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
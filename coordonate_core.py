@@ -0,0 +1,2366 @@
+"""Nucleul aplicatiei, fara interfata grafica: tabelul, formulele si fisierele de proiect.
+
+Modulul nu importa tkinter si nici matplotlib.pyplot, asa ca poate fi folosit
+din coordonate_cli.py sau din alte scripturi pe servere fara afisaj.
+"""
+import ast
+import collections
+import copy
+import csv
+import functools
+import io
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import numpy as np
+
+# Adaugă baza de date cu formule la începutul fișierului
+FORMULAS_DB = {
+    # Formule matematice
+    "Suma": "A + B",
+    "Diferenta": "A - B",
+    "Produsul": "A * B",
+    "Catul": "A / B if B != 0 else 'Eroare: Div/0'",  # Evita divizarea la 0
+    "Patratul": "A ** 2",
+    "Radacina patrata": "A ** 0.5 if A >= 0 else 'Eroare: Negativ'",  # Evita radacina patrata a numerelor negative
+    "Exponential": "A ** B",
+    "Logaritm natural": "np.log(A) if A > 0 else 'Eroare: A <= 0'",  # Necesita A > 0
+    "Logaritm baza 10": "np.log10(A) if A > 0 else 'Eroare: A <= 0'",  # Necesita A > 0
+    "Sinus": "np.sin(A)",  # A in radiani
+    "Cosinus": "np.cos(A)",  # A in radiani
+    "Tangenta": "np.tan(A)",  # A in radiani
+    "Cotangenta": "1 / np.tan(A) if np.tan(A) != 0 else 'Eroare: Div/0'",  # Evita divizarea la 0
+    "Aria cercului": "np.pi * (A ** 2)",  # A = raza
+    "Perimetrul cercului": "2 * np.pi * A",  # A = raza
+    "Aria triunghiului": "0.5 * A * B",  # A = baza, B = inaltimea
+    "Aria dreptunghiului": "A * B",  # A = lungime, B = latime
+    "Aria trapezului": "0.5 * (A + B) * C",  # A si B = baze, C = inaltimea
+
+    # Formule fizice
+    "Viteza": "A / B if B != 0 else 'Eroare: Div/0'",  # A = distanta, B = timp
+    "Forta": "A * B",  # A = masa, B = acceleratia
+    "Energie cinetica": "0.5 * A * (B ** 2)",  # A = masa, B = viteza
+    "Energie potentiala": "A * 9.81 * B",  # A = masa, B = inaltime
+    "Presiune": "A / B if B != 0 else 'Eroare: Div/0'",  # A = forta, B = arie
+    "Densitate": "A / B if B != 0 else 'Eroare: Div/0'",  # A = masa, B = volum
+    "Putere": "A / B if B != 0 else 'Eroare: Div/0'",  # A = lucru mecanic, B = timp
+    "Rezistenta electrica": "A / B if B != 0 else 'Eroare: Div/0'",  # A = tensiune, B = curent
+    "Tensiune electrica": "A * B",  # A = rezistenta, B = curent
+    "Frecventa": "1 / A if A != 0 else 'Eroare: Div/0'",  # A = perioada
+    "Lungimea de unda": "A / B if B != 0 else 'Eroare: Div/0'",  # A = viteza undei, B = frecventa
+
+    # Alte formule utile
+    "Media aritmetica": "(A + B) / 2",
+    "Media geometrica": "(A * B) ** 0.5 if A >= 0 and B >= 0 else 'Eroare: Negativ'",
+    "Distanta in plan 2D": "((A - C) ** 2 + (B - D) ** 2) ** 0.5",  # A, B = coordonate punct 1; C, D = coordonate punct 2
+    "Distanta in plan 3D": "((A - C) ** 2 + (B - D) ** 2 + (E - F) ** 2) ** 0.5",  # A, B, E = punct 1; C, D, F = punct 2
+}
+
+
+# Numarul maxim de durate pastrate pe operatie pentru percentile
+INSTRUMENT_SAMPLES = 10000
+
+
+class _Timer:
+    """Masoara durata blocului ``with``; ``rows`` poate fi completat in bloc."""
+
+    __slots__ = ("instruments", "name", "rows", "start")
+
+    def __init__(self, instruments, name, rows):
+        self.instruments = instruments
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instruments.record(self.name, time.perf_counter() - self.start, self.rows)
+
+
+class _NullTimer:
+    """Timer-ul folosit cand masuratorile sunt dezactivate: nu face nimic."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    @property
+    def rows(self):
+        return 0
+
+    @rows.setter
+    def rows(self, value):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Instrumentation:
+    """Durate si contoare pe operatii: recalculare, formule, afisare, fisiere, grafic.
+
+    Dezactivata (implicit), ``timer`` intoarce un timer gol, asa ca un bloc
+    masurat costa doar verificarea lui ``enabled``. Poate fi folosita si din
+    firele lucrarilor din fundal.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}  # operatie -> ultimele durate (secunde)
+            self._totals = {}  # operatie -> [apeluri, secunde, randuri]
+            self._counters = {}
+
+    def timer(self, name, rows=0):
+        """Context care inregistreaza durata operatiei ``name`` si randurile procesate."""
+        return _Timer(self, name, rows) if self.enabled else _NULL_TIMER
+
+    def record(self, name, seconds, rows=0):
+        if not self.enabled:
+            return
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = collections.deque(maxlen=INSTRUMENT_SAMPLES)
+                self._totals[name] = [0, 0.0, 0]
+            self._samples[name].append(seconds)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += rows
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def stats(self):
+        """Statisticile pe operatie: apeluri, p50/p99 (secunde), total si randuri pe secunda."""
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+            totals = {name: list(values) for name, values in self._totals.items()}
+        stats = {}
+        for name in sorted(samples):
+            count, seconds, rows = totals[name]
+            p50, p99 = np.percentile(samples[name], [50, 99])
+            stats[name] = {"count": count, "p50": float(p50), "p99": float(p99), "total": seconds,
+                           "rows": rows, "rows_per_second": rows / seconds if seconds > 0 else 0.0}
+        return stats
+
+    def counters(self):
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def export(self, path):
+        """Scrie statisticile si contoarele in ``path`` (JSON)."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"operations": self.stats(), "counters": self.counters()}, f, indent=2)
+
+
+# Masuratorile aplicatiei; activate din meniul Tools sau de scripturi
+INSTRUMENTS = Instrumentation()
+
+
+def format_number(value):
+    """Textul afisat pentru o valoare numerica (fara '.0' la numere intregi)."""
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Column:
+    """Coloana tabelului stocata pe vectori.
+
+    ``values`` (float64) si ``valid`` (celula contine un numar) au lungimea
+    egala cu capacitatea tabelului; ``text`` este un vector de obiecte alocat
+    doar cand coloana contine celule text (None pentru celulele numerice sau
+    goale). Celulele goale au ``valid`` False si nu au text.
+    """
+
+    __slots__ = ("values", "valid", "text")
+
+    def __init__(self, capacity):
+        self.values = np.zeros(capacity)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.text = None
+
+    @classmethod
+    def from_arrays(cls, values, valid, text=None):
+        """Coloana care foloseste direct vectorii dati (fara copiere)."""
+        column = cls.__new__(cls)
+        column.values, column.valid, column.text = values, valid, text
+        return column
+
+    def resize(self, capacity, size):
+        values = np.zeros(capacity)
+        values[:size] = self.values[:size]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:size] = self.valid[:size]
+        self.values, self.valid = values, valid
+        if self.text is not None:
+            text = np.empty(capacity, dtype=object)
+            text[:size] = self.text[:size]
+            self.text = text
+
+    def get(self, index):
+        """Valoarea celulei: float, text sau '' pentru celule goale."""
+        if self.valid[index]:
+            return float(self.values[index])
+        if self.text is not None and self.text[index] is not None:
+            return self.text[index]
+        return ""
+
+    def display(self, index):
+        """Textul afisat in tabel pentru celula."""
+        if self.valid[index]:
+            return format_number(float(self.values[index]))
+        if self.text is not None and self.text[index] is not None:
+            return self.text[index]
+        return ""
+
+    def set(self, index, value):
+        """Seteaza celula; textul numeric este convertit o singura data aici."""
+        text = None
+        if isinstance(value, str):
+            if value:
+                try:
+                    number = float(value)
+                except ValueError:
+                    text = value
+        elif value is not None:
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                text = str(value)
+        if text is not None:
+            if self.text is None:
+                self.text = np.empty(len(self.values), dtype=object)
+            self.values[index] = 0.0
+            self.valid[index] = False
+            self.text[index] = text
+            return
+        if self.text is not None:
+            self.text[index] = None
+        if value is None or value == "":
+            self.values[index] = 0.0
+            self.valid[index] = False
+        else:
+            self.values[index] = number
+            self.valid[index] = True
+
+    def clear(self, index):
+        self.values[index] = 0.0
+        self.valid[index] = False
+        if self.text is not None:
+            self.text[index] = None
+
+    def delete(self, index, size):
+        """Sterge celula ``index`` mutand celulele urmatoare cu o pozitie."""
+        for array in (self.values, self.valid, self.text):
+            if array is not None:
+                array[index:size - 1] = array[index + 1:size]
+        self.clear(size - 1)
+
+    def insert(self, index, size):
+        """Insereaza o celula goala la ``index`` mutand celulele urmatoare (capacitatea trebuie sa ajunga)."""
+        for array in (self.values, self.valid, self.text):
+            if array is not None:
+                array[index + 1:size + 1] = array[index:size]
+        self.clear(index)
+
+    def fill_strings(self, start, strings):
+        """Completeaza celulele de la ``start`` din texte (de exemplu un CSV).
+
+        Conversia se face vectorial; daca o celula nu este numerica, bucata este
+        completata celula cu celula. Returneaza True daca toate celulele au fost
+        numerice sau goale.
+        """
+        stop = start + len(strings)
+        raw = np.array(strings, dtype=object)
+        empty = raw == ""
+        try:
+            values = np.where(empty, "0", raw).astype(float)
+        except ValueError:
+            for i, value in enumerate(strings, start):
+                self.set(i, value)
+            return False
+        self.values[start:stop] = values
+        self.valid[start:stop] = ~empty
+        if self.text is not None:
+            self.text[start:stop] = None
+        return True
+
+    def fill_arrays(self, start, values, valid, text_rows=(), text_values=()):
+        """Completeaza celulele de la ``start`` direct din vectori.
+
+        ``text_rows`` (pozitii relative la ``start``) si ``text_values`` dau
+        celulele text.
+        """
+        stop = start + len(values)
+        self.values[start:stop] = values
+        self.valid[start:stop] = valid
+        if self.text is not None:
+            self.text[start:stop] = None
+        if len(text_rows):
+            if self.text is None:
+                self.text = np.empty(len(self.values), dtype=object)
+            self.text[start + np.asarray(text_rows, dtype=np.intp)] = list(text_values)
+
+    def display_range(self, start, stop):
+        """Textele afisate pentru randurile [start, stop), fara acces celula cu celula."""
+        out = [format_number(value) if ok else ""
+               for value, ok in zip(self.values[start:stop].tolist(), self.valid[start:stop].tolist())]
+        if self.text is not None:
+            for i in np.flatnonzero(np.not_equal(self.text[start:stop], None)).tolist():
+                out[i] = self.text[start + i]
+        return out
+
+    def empty_mask(self, index):
+        """Masca celulelor goale (fara numar si fara text) pentru randurile ``index``."""
+        empty = ~self.valid[index]
+        if self.text is not None:
+            empty &= np.equal(self.text[index], None)
+        return empty
+
+
+class Table:
+    """Tabel de date stocat pe coloane (cate un ``Column`` pentru fiecare nume).
+
+    Vectorii coloanelor sunt alocati cu capacitate dubla la nevoie, asa ca
+    adaugarea de randuri este amortizat O(1). Fiecare modificare schimba
+    versiunea coloanei (sau a tuturor, daca se schimba randurile) si sterge
+    indexurile sortate ale coloanei.
+    """
+
+    __slots__ = ("columns", "size", "_capacity", "_data", "_versions", "_indexes")
+
+    def __init__(self, columns=()):
+        self.columns = []
+        self.size = 0
+        self._capacity = 16
+        self._data = {}
+        self._versions = {}
+        self._indexes = {}
+        for name in columns:
+            self.add_column(name)
+
+    @classmethod
+    def from_columns(cls, columns, size):
+        """Construieste tabelul din coloane existente (de ex. vectori memmap) de ``size`` randuri."""
+        table = cls()
+        table.size = table._capacity = size
+        for name, column in columns:
+            table.columns.append(name)
+            table._data[name] = column
+        return table
+
+    @classmethod
+    def from_records(cls, columns, records):
+        """Construieste tabelul din formatul vechi (lista de dictionare)."""
+        table = cls(columns)
+        table.reserve(len(records))
+        for record in records:
+            table.append_row(record)
+        return table
+
+    def to_records(self):
+        """Randurile ca lista de dictionare (pentru salvarea in JSON)."""
+        getters = [(name, self._data[name].get) for name in self.columns]
+        return [{name: get(i) for name, get in getters} for i in range(self.size)]
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def column(self, name):
+        return self._data[name]
+
+    def reserve(self, capacity):
+        if capacity <= self._capacity:
+            return
+        self._capacity = max(capacity, 2 * self._capacity)
+        for column in self._data.values():
+            column.resize(self._capacity, self.size)
+
+    def append_block(self, count):
+        """Adauga ``count`` randuri goale la final; returneaza indexul primului."""
+        start = self.size
+        self.reserve(self.size + count)
+        self.size += count
+        self.touch()
+        return start
+
+    def touch(self, name=None):
+        """Marcheaza coloana ``name`` (None = toate randurile) ca modificata.
+
+        Apelat de metodele tabelului; codul care scrie direct in vectorii unei
+        coloane (de ex. importurile) il apeleaza dupa scriere.
+        """
+        self._versions[name] = self._versions.get(name, 0) + 1
+        if name is None:
+            self._indexes.clear()
+        else:
+            for key in [key for key in self._indexes if key[0] == name]:
+                del self._indexes[key]
+
+    def version(self, name):
+        """Versiunea datelor coloanei ``name``; se schimba la orice modificare a ei sau a randurilor."""
+        return self._versions.get(None, 0), self._versions.get(name, 0)
+
+    def sort_index(self, name, descending=False):
+        """Indicii randurilor sortate dupa coloana ``name``.
+
+        Numerele sunt primele, apoi textele (ordine alfabetica), apoi celulele
+        goale; sortarea este stabila. Indexul este pastrat pana la urmatoarea
+        modificare a coloanei sau a randurilor si nu trebuie modificat.
+        """
+        key = (name, descending)
+        order = self._indexes.get(key)
+        if order is not None:
+            return order
+        column = self._data[name]
+        size = self.size
+        version = self.version(name)
+        with INSTRUMENTS.timer("view/sort", size):
+            valid = column.valid[:size]
+            numbers = np.flatnonzero(valid)
+            values = column.values[numbers]
+            numbers = numbers[np.argsort(-values if descending else values, kind="stable")]
+            if column.text is None:
+                texts = np.empty(0, dtype=np.intp)
+                empty = np.flatnonzero(~valid)
+            else:
+                has_text = np.not_equal(column.text[:size], None) & ~valid
+                texts = np.flatnonzero(has_text)
+                labels = column.text[texts].astype(str)
+                texts = texts[np.argsort(labels, kind="stable")]
+                if descending:
+                    texts = texts[::-1]
+                empty = np.flatnonzero(~valid & ~has_text)
+            order = np.concatenate([numbers, texts, empty])
+        if self.version(name) == version:  # Coloana nu a fost modificata in timpul sortarii (din fundal)
+            self._indexes[key] = order
+        return order
+
+    def snapshot(self, writable=()):
+        """Copie a tabelului pentru un calcul in fundal.
+
+        Coloanele din ``writable`` sunt copiate (calculul scrie in ele); celelalte
+        impart vectorii cu tabelul, fara copiere.
+        """
+        size = self.size
+        columns = []
+        for name in self.columns:
+            column = self._data[name]
+            text = None if column.text is None else column.text[:size]
+            if name in writable:
+                text = None if text is None else text.copy()
+                columns.append((name, Column.from_arrays(column.values[:size].copy(),
+                                                         column.valid[:size].copy(), text)))
+            else:
+                columns.append((name, Column.from_arrays(column.values[:size], column.valid[:size], text)))
+        return Table.from_columns(columns, size)
+
+    def load_column(self, name, source):
+        """Copiaza in coloana ``name`` continutul coloanei ``source`` (acelasi numar de randuri)."""
+        self.touch(name)
+        column = self._data[name]
+        size = self.size
+        column.values[:size] = source.values[:size]
+        column.valid[:size] = source.valid[:size]
+        if source.text is None:
+            column.text = None
+            return
+        if column.text is None:
+            column.text = np.empty(self._capacity, dtype=object)
+        column.text[:size] = source.text[:size]
+
+    def detach_file(self, path):
+        """Copiaza in memorie coloanele mapate din fisierul ``path``."""
+        path = os.path.abspath(path)
+        for column in self._data.values():
+            if isinstance(column.values, np.memmap) and os.path.abspath(column.values.filename) == path:
+                column.resize(self._capacity, self.size)
+
+    def add_column(self, name):
+        self.insert_column(name)
+
+    def insert_column(self, name, column=None, position=None):
+        """Adauga coloana ``name`` pe pozitia ``position`` (implicit, la final).
+
+        ``column`` este o coloana existenta (de ex. una stearsa anterior),
+        folosita fara copiere; implicit coloana este goala.
+        """
+        if column is None:
+            column = Column(self._capacity)
+        elif len(column.values) != self._capacity:
+            column.resize(self._capacity, self.size)
+        self.columns.insert(len(self.columns) if position is None else position, name)
+        self._data[name] = column
+        self.touch(name)
+
+    def drop_column(self, name):
+        """Sterge coloana ``name``; returneaza obiectul ``Column`` eliminat."""
+        self.columns.remove(name)
+        self.touch(name)
+        return self._data.pop(name)
+
+    def copy_column(self, name):
+        """Copie a randurilor existente din coloana ``name`` (de ex. pentru anularea unei formule)."""
+        column = self._data[name]
+        size = self.size
+        text = None if column.text is None else column.text[:size].copy()
+        return Column.from_arrays(column.values[:size].copy(), column.valid[:size].copy(), text)
+
+    def append_row(self, values=None):
+        """Adauga un rand; ``values`` este un dictionar optional coloana -> valoare."""
+        self.reserve(self.size + 1)
+        index = self.size
+        self.size += 1
+        self.touch()
+        if values:
+            for name, column in self._data.items():
+                column.set(index, values.get(name, ""))
+        return index
+
+    def insert_row(self, index, values=None):
+        """Insereaza un rand la ``index``; ``values`` este un dictionar optional coloana -> valoare."""
+        if not 0 <= index <= self.size:
+            raise IndexError("row index out of range")
+        self.reserve(self.size + 1)
+        for column in self._data.values():
+            column.insert(index, self.size)
+        self.size += 1
+        self.touch()
+        if values:
+            for name, column in self._data.items():
+                column.set(index, values.get(name, ""))
+        return index
+
+    def delete_row(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("row index out of range")
+        for column in self._data.values():
+            column.delete(index, self.size)
+        self.size -= 1
+        self.touch()
+
+    def get(self, index, name):
+        return self._data[name].get(index)
+
+    def set(self, index, name, value):
+        self._data[name].set(index, value)
+        self.touch(name)
+
+    def display_row(self, index):
+        """Valorile afisate pentru un rand, in ordinea coloanelor."""
+        return [self._data[name].display(index) for name in self.columns]
+
+    def numeric(self, name):
+        """Returneaza (valori, masca numere) fara celulele goale sau text."""
+        column = self._data[name]
+        return column.values[:self.size], column.valid[:self.size]
+
+    def formula_inputs(self, name, rows=None):
+        """Returneaza (valori, masca valide) pentru formule: celulele goale valoreaza 0.
+
+        ``rows`` restrange rezultatul la un vector de indici de rand. O coloana
+        inexistenta este tratata ca fiind goala.
+        """
+        index = slice(0, self.size) if rows is None else rows
+        if name not in self._data:
+            size = self.size if rows is None else len(rows)
+            return np.zeros(size), np.ones(size, dtype=bool)
+        column = self._data[name]
+        return column.values[index], column.valid[index] | column.empty_mask(index)
+
+    def assign_column(self, name, values, messages, rows=None):
+        """Scrie rezultatele unei formule pe toate randurile sau doar pe ``rows``.
+
+        ``messages`` leaga pozitia din ``values`` de textul celulelor cu eroare.
+        """
+        self.touch(name)
+        column = self._data[name]
+        index = slice(0, self.size) if rows is None else rows
+        column.values[index] = values
+        column.valid[index] = True
+        if not messages:
+            if rows is None:
+                column.text = None
+            elif column.text is not None:
+                column.text[index] = None
+            return
+        if column.text is None:
+            column.text = np.empty(self._capacity, dtype=object)
+        else:
+            column.text[index] = None
+        positions = np.fromiter(messages.keys(), dtype=np.intp, count=len(messages))
+        if rows is not None:
+            positions = rows[positions]
+        column.text[positions] = list(messages.values())
+        column.values[positions] = 0.0
+        column.valid[positions] = False
+
+
+def filter_mask(table, spec):
+    """Masca randurilor care trec de filtrul ``spec``.
+
+    ``{"column": nume, "min": a, "max": b}`` pastreaza numerele din interval
+    (un capat lipsa sau None nu limiteaza); ``{"column": nume, "text": t}``
+    pastreaza celulele text care contin ``t`` (fara a deosebi literele mari de
+    cele mici) si, daca ``t`` este un numar, numerele egale cu el.
+    """
+    column = table.column(spec["column"])
+    size = len(table)
+    values, valid = column.values[:size], column.valid[:size]
+    if "text" not in spec:
+        mask = valid.copy()
+        if spec.get("min") is not None:
+            mask &= values >= spec["min"]
+        if spec.get("max") is not None:
+            mask &= values <= spec["max"]
+        return mask
+    pattern = str(spec["text"]).lower()
+    try:
+        mask = valid & (values == float(pattern))
+    except ValueError:
+        mask = np.zeros(size, dtype=bool)
+    if column.text is not None:
+        rows = np.flatnonzero(np.not_equal(column.text[:size], None))
+        labels = np.char.lower(column.text[rows].astype(str))
+        mask[rows[np.char.find(labels, pattern) >= 0]] = True
+    return mask
+
+
+class TableView:
+    """Randurile afisate: tabelul sortat dupa o coloana si filtrat, fara copierea datelor.
+
+    ``rows`` returneaza doar indicii randurilor, construiti din
+    ``Table.sort_index`` si mastile filtrelor (vezi ``filter_mask``, toate
+    filtrele trebuie indeplinite) si refolositi pana cand se schimba o coloana
+    implicata sau randurile. Coloanele sterse din tabel sunt ignorate.
+    ``rows`` poate rula pe alt fir; ``cached_rows`` da fara calcul ultimii
+    indici, ca interfata sa nu sorteze pe firul ei dupa fiecare editare.
+    """
+
+    __slots__ = ("sort", "descending", "filters", "_cache")
+
+    def __init__(self, sort=None, descending=False, filters=()):
+        self.sort = sort
+        self.descending = descending
+        self.filters = tuple(filters)
+        self._cache = None  # (tabel, versiunile coloanelor, indici), inlocuit dintr-o singura atribuire
+
+    def __bool__(self):
+        return self.sort is not None or bool(self.filters)
+
+    def columns(self):
+        """Coloanele de care depinde vederea."""
+        names = {spec["column"] for spec in self.filters}
+        if self.sort is not None:
+            names.add(self.sort)
+        return names
+
+    def _versions(self, table):
+        return [(name, name in table, table.version(name)) for name in sorted(self.columns())]
+
+    def cached_rows(self, table):
+        """Ultimii indici calculati pentru ``table`` si daca mai sunt actuali: ``(indici, actual)``.
+
+        Indicii sunt None daca nu au fost calculati inca (sau daca vederea este
+        tot tabelul, nesortat; atunci sunt mereu actuali). Indicii vechi pot
+        contine randuri sterse intre timp.
+        """
+        if not self:
+            return None, True
+        cache = self._cache
+        if cache is None or cache[0] is not table:
+            return None, False
+        return cache[2], cache[1] == self._versions(table)
+
+    def rows(self, table):
+        """Indicii randurilor afisate, in ordine; None daca vederea este tot tabelul, nesortat."""
+        if not self:
+            return None
+        versions = self._versions(table)
+        cache = self._cache
+        if cache is not None and cache[0] is table and cache[1] == versions:
+            return cache[2]
+        with INSTRUMENTS.timer("view/rows", len(table)):
+            rows = table.sort_index(self.sort, self.descending) if self.sort in table else None
+            mask = None
+            for spec in self.filters:
+                if spec["column"] in table:
+                    spec_mask = filter_mask(table, spec)
+                    mask = spec_mask if mask is None else mask & spec_mask
+            if mask is not None:
+                rows = np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+            elif rows is None:
+                rows = np.arange(len(table))
+        self._cache = (table, versions, rows)
+        return rows
+
+
+def _summary(counts, sums, squares, minimums, maximums):
+    """Statisticile grupurilor din sumele lor, ca vectori cu cate un element pe grup."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts, 0.0))
+    empty = counts == 0
+    return {"count": counts, "sum": sums, "mean": means, "min": np.where(empty, np.nan, minimums),
+            "max": np.where(empty, np.nan, maximums), "std": stds}
+
+
+def _group_sums(values, valid, starts):
+    """Sumele grupurilor consecutive care incep la ``starts`` (``_summary`` le transforma in statistici)."""
+    data = np.where(valid, values, 0.0)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    sums = np.add.reduceat(data, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    # Abaterea standard din a doua trecere (fata de media grupului), nu din suma patratelor
+    deviations = np.where(valid, data - np.repeat(means, np.diff(np.append(starts, len(values)))), 0.0)
+    squares = np.add.reduceat(deviations * deviations, starts)
+    minimums = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+    maximums = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+    return counts, sums, squares, minimums, maximums
+
+
+def aggregate(table, name, rows=None):
+    """Statisticile numerelor din coloana ``name`` (doar din ``rows``, daca este dat).
+
+    Returneaza un dictionar cu ``count``, ``sum``, ``mean``, ``min``, ``max`` si
+    ``std`` (abaterea standard a populatiei); celulele goale si text sunt ignorate.
+    """
+    values, valid = table.numeric(name)
+    if rows is not None:
+        values, valid = values[rows], valid[rows]
+    with INSTRUMENTS.timer("aggregate/column", values.size):
+        if values.size:
+            stats = _summary(*_group_sums(values, valid, np.zeros(1, dtype=np.intp)))
+        else:
+            stats = _summary(np.zeros(1, dtype=np.int64), *np.zeros((4, 1)))
+    return {key: value[0].item() for key, value in stats.items()}
+
+
+def group_by(table, key, name, rows=None):
+    """Statisticile coloanei ``name`` pe grupuri de valori egale ale coloanei ``key``.
+
+    Grupurile sunt luate din indexul sortat al cheii (``Table.sort_index``):
+    numerele, apoi textele, apoi grupul celulelor goale. ``rows`` restrange
+    calculul la o parte din randuri. Returneaza vectori cu cate un element pe
+    grup: ``rows`` (primul rand al grupului; cheia afisata este
+    ``table.column(key).display(rand)``) si statisticile de la ``aggregate``.
+    """
+    order = table.sort_index(key)
+    if rows is not None:
+        selected = np.zeros(len(table), dtype=bool)
+        selected[rows] = True
+        order = order[selected[order]]
+    with INSTRUMENTS.timer("aggregate/group_by", order.size):
+        column = table.column(key)
+        numbers = int(np.count_nonzero(column.valid[order]))
+        keys = column.values[order[:numbers]]
+        changed = [np.ones(min(numbers, 1), dtype=bool), keys[1:] != keys[:-1]]
+        if numbers < order.size:
+            rest = order[numbers:]
+            labels = column.text[rest] if column.text is not None else np.full(rest.size, None, dtype=object)
+            changed += [np.ones(1, dtype=bool), np.not_equal(labels[1:], labels[:-1])]
+        starts = np.flatnonzero(np.concatenate(changed))
+        if starts.size:
+            values, valid = table.numeric(name)
+            stats = _summary(*_group_sums(values[order], valid[order], starts))
+        else:
+            stats = _summary(np.zeros(0, dtype=np.int64), *np.zeros((4, 0)))
+    stats["rows"] = order[starts]
+    return stats
+
+
+# Numarul de randuri citite/scrise la un pas de import sau export
+CHUNK_ROWS = 65536
+# Semnatura fisierelor cu tabel binar pe coloane (.ctab)
+TABLE_MAGIC = b"CTAB\x01"
+
+
+def _unique_columns(header):
+    """Nume de coloane nevide si unice pentru antetul unui fisier importat."""
+    columns = []
+    for i, name in enumerate(header):
+        name = name.strip() or f"Column{i + 1}"
+        candidate, suffix = name, 2
+        while candidate in columns:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        columns.append(candidate)
+    return columns
+
+
+def read_csv_chunks(path, table, chunk_rows=CHUNK_ROWS):
+    """Importa un CSV in ``table`` (gol) pe bucati de ``chunk_rows`` randuri.
+
+    Generatorul produce fractia din fisier citita dupa fiecare bucata, asa ca
+    apelantul poate afisa progresul sau opri importul. Doar bucata curenta este
+    tinuta ca text; coloanele raman numerice cat timp toate celulele lor sunt
+    numere sau goale.
+    """
+    total = os.path.getsize(path) or 1
+    with open(path, "rb") as raw:
+        reader = csv.reader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+        header = next(reader, None)
+        if header is None:
+            return
+        for name in _unique_columns(header):
+            table.add_column(name)
+        width = len(table.columns)
+        numeric = [True] * width
+        while True:
+            chunk = [row for _, row in zip(range(chunk_rows), reader)]
+            if not chunk:
+                break
+            start = table.append_block(len(chunk))
+            # Randurile mai scurte sunt completate cu celule goale
+            cells = zip(*(row[:width] + [""] * (width - len(row)) for row in chunk))
+            for i, (name, strings) in enumerate(zip(table.columns, cells)):
+                column = table.column(name)
+                if numeric[i]:
+                    numeric[i] = column.fill_strings(start, strings)
+                else:
+                    for index, value in enumerate(strings, start):
+                        column.set(index, value)
+            table.touch()
+            yield min(1.0, raw.tell() / total)
+
+
+def write_csv_chunks(table, path, chunk_rows=CHUNK_ROWS):
+    """Exporta tabelul in CSV direct din vectorii coloanelor, pe bucati."""
+    columns = [table.column(name) for name in table.columns]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(table.columns)
+        for start in range(0, len(table), chunk_rows):
+            stop = min(start + chunk_rows, len(table))
+            writer.writerows(zip(*(column.display_range(start, stop) for column in columns)))
+            yield stop / len(table)
+
+
+def _write_block(f, payload):
+    f.write(struct.pack("<I", len(payload)))
+    f.write(payload)
+
+
+def _read_block(f):
+    (size,) = struct.unpack("<I", f.read(4))
+    return f.read(size)
+
+
+def write_table_chunks(table, path, chunk_rows=CHUNK_ROWS):
+    """Exporta tabelul in formatul binar pe coloane (.ctab), pe bucati.
+
+    Dupa semnatura si un antet JSON cu numele coloanelor urmeaza bucatile:
+    numarul de randuri, apoi pentru fiecare coloana valorile float64
+    little-endian, masca de valide impachetata pe biti si celulele text (JSON).
+    """
+    with open(path, "wb") as f:
+        f.write(TABLE_MAGIC)
+        _write_block(f, json.dumps({"columns": table.columns}).encode("utf-8"))
+        for start in range(0, len(table), chunk_rows):
+            stop = min(start + chunk_rows, len(table))
+            f.write(struct.pack("<I", stop - start))
+            for name in table.columns:
+                column = table.column(name)
+                f.write(column.values[start:stop].astype("<f8").tobytes())
+                _write_block(f, np.packbits(column.valid[start:stop]).tobytes())
+                text = {}
+                if column.text is not None:
+                    rows = np.flatnonzero(np.not_equal(column.text[start:stop], None))
+                    text = {"rows": rows.tolist(), "text": column.text[start + rows].tolist()}
+                _write_block(f, json.dumps(text).encode("utf-8"))
+            yield stop / len(table)
+
+
+def read_table_chunks(path, table):
+    """Importa un fisier .ctab in ``table`` (gol), cate o bucata la fiecare pas."""
+    total = os.path.getsize(path) or 1
+    with open(path, "rb") as f:
+        if f.read(len(TABLE_MAGIC)) != TABLE_MAGIC:
+            raise ValueError("Fisierul nu este un tabel binar (.ctab).")
+        header = json.loads(_read_block(f))
+        for name in header["columns"]:
+            table.add_column(name)
+        while True:
+            count = f.read(4)
+            if not count:
+                break
+            (count,) = struct.unpack("<I", count)
+            start = table.append_block(count)
+            for name in table.columns:
+                values = np.frombuffer(f.read(8 * count), dtype="<f8")
+                valid = np.unpackbits(np.frombuffer(_read_block(f), dtype=np.uint8), count=count).astype(bool)
+                text = json.loads(_read_block(f))
+                table.column(name).fill_arrays(start, values, valid, text.get("rows", ()), text.get("text", ()))
+            table.touch()
+            yield min(1.0, f.tell() / total)
+
+
+# Semnatura fisierelor de proiect binare (.cproj)
+PROJECT_MAGIC = b"CPRJ\x01"
+
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def save_json_project(path, table, column_formulas=None, graph_settings=None):
+    """Salveaza proiectul in formatul JSON vechi (lista de dictionare)."""
+    project = {
+        "columns": table.columns,
+        "data": table.to_records(),
+        "formulas": column_formulas or {},
+        "graph": graph_settings or {},
+    }
+    with open(path, "w") as f:
+        json.dump(project, f, indent=4)
+
+
+def save_project_file(path, table, column_formulas=None, graph_settings=None):
+    """Salveaza proiectul in formatul binar (.cproj).
+
+    Dupa semnatura urmeaza lungimea (uint32) si antetul JSON cu coloanele,
+    formulele, setarile graficului si pozitia blocurilor fiecarei coloane.
+    Blocurile incep la urmatoarea adresa multiplu de 8: valorile float64
+    little-endian, masca de valide (un octet pe rand) si celulele text (JSON),
+    astfel incat coloanele pot fi deschise direct cu np.memmap.
+    """
+    size = len(table)
+    blocks = {}
+    texts = []
+    offset = 0
+    for name in table.columns:
+        column = table.column(name)
+        text = b""
+        if column.text is not None:
+            rows = np.flatnonzero(np.not_equal(column.text[:size], None))
+            if rows.size:
+                text = json.dumps({"rows": rows.tolist(), "text": column.text[rows].tolist()}).encode("utf-8")
+        blocks[name] = {"values": offset, "valid": offset + 8 * size,
+                        "text": offset + 9 * size, "text_size": len(text)}
+        texts.append(text)
+        offset = _align(offset + 9 * size + len(text))
+    header = json.dumps({
+        "version": 1,
+        "rows": size,
+        "columns": table.columns,
+        "formulas": column_formulas or {},
+        "graph": graph_settings or {},
+        "blocks": blocks,
+    }).encode("utf-8")
+    base = _align(len(PROJECT_MAGIC) + 4 + len(header))
+
+    # Scrie intr-un fisier temporar: fisierul tinta poate fi mapat chiar de acest tabel
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(PROJECT_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name, text in zip(table.columns, texts):
+            column = table.column(name)
+            f.seek(base + blocks[name]["values"])
+            column.values[:size].astype("<f8", copy=False).tofile(f)
+            column.valid[:size].tofile(f)
+            f.write(text)
+    table.detach_file(path)
+    os.replace(temp_path, path)
+
+
+# Randurile unui proiect JSON vechi incarcate inainte de restul tabelului
+FIRST_SCREEN_ROWS = 100
+
+
+def load_project_chunks(path, first_rows=FIRST_SCREEN_ROWS, chunk_rows=CHUNK_ROWS):
+    """Deschide un proiect treptat; produce ``((tabel, formule, setari grafic), fractie)``.
+
+    Proiectul este acelasi obiect la fiecare pas, cu tabelul completat pe
+    bucati: primul pas are deja ``first_rows`` randuri, ca primul ecran sa
+    poata fi afisat inainte de restul. Proiectele binare sunt gata la primul
+    pas, pentru ca datele lor sunt citite de pe disc abia la folosire.
+    """
+    with open(path, "rb") as f:
+        binary = f.read(len(PROJECT_MAGIC)) == PROJECT_MAGIC
+        if not binary:
+            f.seek(0)
+            project = json.load(f)
+    if binary:
+        yield load_project_file(path), 1.0
+        return
+    records = project.get("data", [])
+    table = Table(project.get("columns", []))
+    table.reserve(len(records))  # Fara realocari cat timp tabelul este afisat
+    loaded = (table, project.get("formulas", {}), project.get("graph", {}))
+    start, stop = 0, min(first_rows, len(records))
+    while True:
+        for record in records[start:stop]:
+            table.append_row(record)
+        yield loaded, stop / len(records) if records else 1.0
+        if stop >= len(records):
+            return
+        start, stop = stop, min(stop + chunk_rows, len(records))
+
+
+def load_project_file(path):
+    """Deschide un proiect; returneaza (tabel, formule, setari grafic).
+
+    Coloanele proiectelor binare sunt mapate cu np.memmap (copy-on-write):
+    datele sunt citite de pe disc doar cand sunt afisate sau folosite, iar
+    modificarile raman in memorie pana la salvare. Proiectele JSON vechi sunt
+    incarcate integral.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(PROJECT_MAGIC)) != PROJECT_MAGIC:
+            f.seek(0)
+            project = json.load(f)
+            table = Table.from_records(project.get("columns", []), project.get("data", []))
+            return table, project.get("formulas", {}), project.get("graph", {})
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+        base = _align(len(PROJECT_MAGIC) + 4 + length)
+        texts = {}
+        for name in header["columns"]:
+            block = header["blocks"][name]
+            if block["text_size"]:
+                f.seek(base + block["text"])
+                texts[name] = json.loads(f.read(block["text_size"]))
+
+    size = header["rows"]
+    if not size:
+        table = Table(header["columns"])
+    else:
+        columns = []
+        for name in header["columns"]:
+            block = header["blocks"][name]
+            values = np.memmap(path, dtype="<f8", mode="c", offset=base + block["values"], shape=(size,))
+            valid = np.memmap(path, dtype=np.bool_, mode="c", offset=base + block["valid"], shape=(size,))
+            text = None
+            if name in texts:
+                text = np.empty(size, dtype=object)
+                text[texts[name]["rows"]] = texts[name]["text"]
+            columns.append((name, Column.from_arrays(values, valid, text)))
+        table = Table.from_columns(columns, size)
+    return table, header.get("formulas", {}), header.get("graph", {})
+
+
+def convert_project(source_path, target_path):
+    """Converteste un proiect (de ex. JSON vechi) in formatul binar .cproj."""
+    table, column_formulas, graph_settings = load_project_file(source_path)
+    save_project_file(target_path, table, column_formulas, graph_settings)
+
+
+def _cell_to_float(value):
+    """Converteste valoarea unei celule in float (celulele goale devin 0)."""
+    return float(value or 0)
+
+
+def round2(values):
+    """Rotunjeste un vector la doua zecimale, identic cu round(x, 2) pe element.
+
+    np.round poate alege alta cifra doar cand x * 100 este foarte aproape de o
+    jumatate sau cand valorile sunt mari; acele elemente sunt rotunjite cu round().
+    """
+    # Depasirea (x * 100 peste ~1.8e306) si inf - inf: acele valori sunt suspecte oricum
+    with np.errstate(over="ignore", invalid="ignore"):
+        rounded = np.round(values, 2)
+        scaled = values * 100
+        suspect = ~(np.abs(scaled) < 2.0 ** 30)
+        suspect |= np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    index = np.flatnonzero(suspect)
+    if index.size:
+        rounded[index] = [round(value, 2) for value in values[index].tolist()]
+    return rounded
+
+
+# Functiile si constantele NumPy permise in formule (np.<nume>)
+FORMULA_FUNCTIONS = {
+    name: getattr(np, name) for name in (
+        "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh", "tanh",
+        "arcsinh", "arccosh", "arctanh", "exp", "expm1", "log", "log10", "log2", "log1p",
+        "sqrt", "cbrt", "square", "abs", "absolute", "fabs", "sign", "floor", "ceil", "trunc",
+        "rint", "hypot", "deg2rad", "rad2deg", "radians", "degrees", "power", "minimum",
+        "maximum", "fmod", "reciprocal",
+    )
+}
+FORMULA_CONSTANTS = {"pi": np.pi, "e": np.e, "inf": np.inf, "nan": np.nan}
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub, ast.Not)
+_COMPARE_OPERATORS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+class FormulaError(ValueError):
+    """Formula contine o constructie care nu este permisa."""
+
+
+def _where(cond, if_true, if_false):
+    # Ramurile de tip text (mesaje de eroare) devin NaN in varianta vectoriala
+    if isinstance(if_true, str):
+        if_true = np.nan
+    if isinstance(if_false, str):
+        if_false = np.nan
+    return np.where(cond, if_true, if_false)
+
+
+def _all(*values):
+    return np.logical_and.reduce(values)
+
+
+def _any(*values):
+    return np.logical_or.reduce(values)
+
+
+# Spatiul de nume al codului generat: doar functiile permise, fara builtins
+_FORMULA_NAMESPACE = {"__builtins__": {}, "_where": _where, "_all": _all, "_any": _any,
+                      "_not": np.logical_not}
+_FORMULA_NAMESPACE.update({f"np_{name}": func for name, func in FORMULA_FUNCTIONS.items()})
+
+
+def _name(name):
+    return ast.Name(id=name, ctx=ast.Load())
+
+
+def _call(name, *args):
+    return ast.Call(func=_name(name), args=list(args), keywords=[])
+
+
+class _FormulaValidator(ast.NodeTransformer):
+    """Verifica formula pe lista alba si inlocuieste np.<nume> cu functii legate direct.
+
+    ``variables`` primeste numele variabilelor folosite (A, B, ...).
+    """
+
+    def __init__(self):
+        self.variables = []
+
+    def generic_visit(self, node):
+        allowed = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+                   ast.Load, ast.And, ast.Or) + _BINARY_OPERATORS + _UNARY_OPERATORS + _COMPARE_OPERATORS
+        if not isinstance(node, allowed):
+            raise FormulaError(f"Constructie nepermisa in formula: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if not isinstance(node.value, (int, float, str)):
+            raise FormulaError(f"Constanta nepermisa in formula: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id.startswith("_"):
+            raise FormulaError(f"Nume nepermis in formula: {node.id}")
+        if node.id not in self.variables:
+            self.variables.append(node.id)
+        return node
+
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == "np" and node.attr in FORMULA_CONSTANTS:
+            return ast.Constant(value=FORMULA_CONSTANTS[node.attr])
+        raise FormulaError(f"Atribut nepermis in formula: {ast.unparse(node)}")
+
+    def visit_Call(self, node):
+        func = node.func
+        if (node.keywords or not isinstance(func, ast.Attribute) or not isinstance(func.value, ast.Name)
+                or func.value.id != "np" or func.attr not in FORMULA_FUNCTIONS):
+            raise FormulaError(f"Apel nepermis in formula: {ast.unparse(func)}")
+        args = [self.visit(arg) for arg in node.args]
+        return ast.Call(func=_name(f"np_{func.attr}"), args=args, keywords=[])
+
+
+# Limitele rezultatelor calculate la compilare (peste ele, calculul ramane pe celule)
+FOLD_MAX_INT_BITS = 1024
+FOLD_MAX_STR_LENGTH = 1000
+
+
+def _fold_size(value):
+    """Dimensiunea unei constante: biti pentru intregi, caractere pentru text."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, int):
+        return abs(value).bit_length()
+    return 0
+
+
+def _foldable_binop(node):
+    """Verifica, inainte de calcul, ca rezultatul unei operatii binare ramane mic."""
+    left, right = node.left.value, node.right.value
+    if isinstance(node.op, ast.Mod) and isinstance(left, str):
+        return False  # Formatarea '%0100000000d' % 1 poate produce un text urias
+    if isinstance(node.op, ast.Pow) and type(left) is int and type(right) is int:
+        if abs(left) <= 1 or right <= 0:
+            return True
+        return _fold_size(left) * right <= FOLD_MAX_INT_BITS
+    if isinstance(node.op, ast.Mult):
+        if isinstance(left, str) or isinstance(right, str):
+            text, count = (left, right) if isinstance(left, str) else (right, left)
+            return type(count) is not int or len(text) * max(count, 0) <= FOLD_MAX_STR_LENGTH
+        if type(left) is int and type(right) is int:
+            return _fold_size(left) + _fold_size(right) <= FOLD_MAX_INT_BITS
+    return True
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Calculeaza la compilare subexpresiile formate doar din constante.
+
+    Sunt pastrate doar rezultatele mici (vezi FOLD_MAX_INT_BITS si
+    FOLD_MAX_STR_LENGTH); operatiile care ar produce numere sau texte uriase
+    nu sunt calculate deloc, ca la evaluarea pe celule.
+    """
+
+    def generic_visit(self, node):
+        node = super().generic_visit(node)
+        if isinstance(node, ast.IfExp) and isinstance(node.test, ast.Constant):
+            return node.body if node.test.value else node.orelse
+        if not isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp, ast.Call)):
+            return node
+        children = [child for child in ast.iter_child_nodes(node) if isinstance(child, ast.expr)]
+        if isinstance(node, ast.Call):
+            children = node.args
+        if not all(isinstance(child, ast.Constant) for child in children):
+            return node
+        if isinstance(node, ast.BinOp) and not _foldable_binop(node):
+            return node
+        try:
+            code = compile(ast.fix_missing_locations(ast.Expression(body=node)), "<string>", "eval")
+            value = eval(code, _FORMULA_NAMESPACE)
+        except Exception:
+            return node  # Eroarea (ex. 1 / 0) apare la evaluare, pentru fiecare celula
+        # Doar tipurile Python pastreaza aceeasi semantica (scalarii NumPy nu ridica erori)
+        if type(value) not in (int, float, bool, str):
+            return node
+        if _fold_size(value) > (FOLD_MAX_STR_LENGTH if isinstance(value, str) else FOLD_MAX_INT_BITS):
+            return node
+        return ast.copy_location(ast.Constant(value=value), node)
+
+
+def _collect_subexpressions(node, counts, unconditional, conditional=False):
+    """Numara subexpresiile (apeluri si operatii) si le marcheaza pe cele evaluate mereu."""
+    if isinstance(node, (ast.Call, ast.BinOp, ast.UnaryOp)):
+        key = ast.dump(node)
+        counts[key] = counts.get(key, 0) + 1
+        if not conditional:
+            unconditional.add(key)
+    if isinstance(node, ast.IfExp):
+        _collect_subexpressions(node.test, counts, unconditional, conditional)
+        _collect_subexpressions(node.body, counts, unconditional, True)
+        _collect_subexpressions(node.orelse, counts, unconditional, True)
+    elif isinstance(node, ast.BoolOp):
+        _collect_subexpressions(node.values[0], counts, unconditional, conditional)
+        for value in node.values[1:]:
+            _collect_subexpressions(value, counts, unconditional, True)
+    elif isinstance(node, ast.Compare):
+        # a < b < c se opreste dupa prima comparatie falsa, ca "and"
+        _collect_subexpressions(node.left, counts, unconditional, conditional)
+        _collect_subexpressions(node.comparators[0], counts, unconditional, conditional)
+        for comparator in node.comparators[1:]:
+            _collect_subexpressions(comparator, counts, unconditional, True)
+    else:
+        for child in ast.iter_child_nodes(node):
+            _collect_subexpressions(child, counts, unconditional, conditional)
+
+
+class _SubexpressionReplacer(ast.NodeTransformer):
+    def __init__(self, names, skip=None):
+        self.names = names
+        self.skip = skip
+
+    def visit(self, node):
+        key = ast.dump(node)
+        if key in self.names and key != self.skip:
+            return _name(self.names[key])
+        return super().visit(node)
+
+
+def _build_function(body, variables):
+    """Compileaza ``body`` intr-o functie cu parametrii ``variables``.
+
+    Subexpresiile repetate (de ex. np.tan(A) in "Cotangenta") sunt calculate o
+    singura data, intr-o variabila locala. Sunt extrase doar cele evaluate
+    oricum, nu si cele aflate doar pe o ramura conditionala.
+    """
+    body = copy.deepcopy(body)  # Inlocuirile modifica arborele
+    counts = {}
+    unconditional = set()
+    _collect_subexpressions(body, counts, unconditional)
+    repeated = sorted((key for key, count in counts.items() if count > 1 and key in unconditional), key=len)
+    names = {key: f"_t{i}" for i, key in enumerate(repeated)}
+    nodes = {}
+    for node in ast.walk(body):
+        key = ast.dump(node)
+        if key in names and key not in nodes:
+            nodes[key] = node
+
+    statements = []
+    for key in repeated:  # De la cele mai mici: expresiile mari le pot folosi pe cele mici
+        value = _SubexpressionReplacer(names, skip=key).visit(copy.deepcopy(nodes[key]))
+        statements.append(ast.Assign(targets=[ast.Name(id=names[key], ctx=ast.Store())], value=value))
+    statements.append(ast.Return(value=_SubexpressionReplacer(names).visit(body)))
+    function = ast.FunctionDef(
+        name="_formula",
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in variables], kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=statements, decorator_list=[], returns=None, type_params=[])
+    module = ast.fix_missing_locations(ast.Module(body=[function], type_ignores=[]))
+    namespace = dict(_FORMULA_NAMESPACE)
+    exec(compile(module, "<formula>", "exec"), namespace)
+    return namespace["_formula"]
+
+
+class _VectorizeTransformer(ast.NodeTransformer):
+    """Rescrie constructiile scalare (if/else, and/or, not) in operatii pe vectori."""
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return _call("_where", node.test, node.body, node.orelse)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        return _call("_all" if isinstance(node.op, ast.And) else "_any", *node.values)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return _call("_not", node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c devine (a < b) & (b < c)
+        operands = [node.left] + node.comparators
+        pairs = [ast.Compare(left=operands[i], ops=[op], comparators=[operands[i + 1]])
+                 for i, op in enumerate(node.ops)]
+        return _call("_all", *pairs)
+
+
+class CompiledFormula:
+    """Formula analizata o singura data si compilata in functii Python.
+
+    Formula este verificata pe o lista alba (operatori aritmetici si de
+    comparatie, if/else, and/or/not, functiile din FORMULA_FUNCTIONS), deci nu
+    poate accesa nimic altceva. Constantele sunt calculate la compilare, iar
+    subexpresiile repetate o singura data. Rezulta o functie scalara (pentru un
+    rand) si una vectoriala (pentru coloane intregi).
+
+    Garzile de forma ``X if cond else 'Eroare: ...'`` sunt separate: conditia
+    devine o masca, iar randurile care nu o respecta primesc direct mesajul.
+    Randurile cu date invalide sau rezultat ne-finit sunt evaluate pe rand,
+    ca sa pastreze exact mesajele de eroare ale evaluarii scalare.
+    """
+
+    def __init__(self, formula):
+        self.formula = formula
+        self.variables = []
+        self.guard_message = None
+        self.scalar_function = None
+        self.vector_function = None
+        self.error = None
+        try:
+            self._compile(formula)
+        except Exception as e:
+            # Eroarea este raportata per celula, ca la evaluarea pe rand; orice
+            # exceptie a compilarii (nu doar SyntaxError) ramane in formula
+            self.error = e
+            self.scalar_function = self.vector_function = None
+
+    def _compile(self, formula):
+        tree = ast.parse(formula, filename="<string>", mode="eval")
+        validator = _FormulaValidator()
+        tree = _ConstantFolder().visit(validator.visit(tree))
+        self.variables = validator.variables
+        body = tree.body
+        self.scalar_function = _build_function(body, self.variables)
+
+        guard = None
+        vector_body = copy.deepcopy(body)
+        if (isinstance(body, ast.IfExp) and isinstance(body.orelse, ast.Constant)
+                and isinstance(body.orelse.value, str)):
+            guard = vector_body.test
+            vector_body = vector_body.body
+            self.guard_message = body.orelse.value
+        vector_body = _VectorizeTransformer().visit(vector_body)
+        if guard is not None:
+            # Conditia si valoarea intr-o singura functie, ca sa imparta subexpresiile
+            guard = _VectorizeTransformer().visit(guard)
+            vector_body = ast.Tuple(elts=[guard, vector_body], ctx=ast.Load())
+        self.vector_function = _build_function(vector_body, self.variables)
+
+    def _arguments(self, context):
+        missing = [name for name in self.variables if name not in context]
+        if missing:
+            raise NameError(f"name '{missing[0]}' is not defined")
+        return [context[name] for name in self.variables]
+
+    def evaluate_scalar(self, context):
+        """Evalueaza formula pentru un singur rand (contextul leaga variabilele de valori)."""
+        if self.error is not None:
+            raise self.error
+        result = self.scalar_function(*self._arguments(context))
+        if isinstance(result, str):
+            return result  # Mesajul garzii (ex. 'Eroare: Div/0')
+        return round(result, 2)
+
+    def evaluate_vector(self, variables, size):
+        """Evalueaza formula pe vectori.
+
+        Returneaza (valori, masca garzii) sau None daca formula nu poate fi
+        evaluata vectorial si trebuie evaluata rand cu rand.
+        """
+        if self.vector_function is None:
+            return None
+        try:
+            with np.errstate(all="ignore"):
+                result = self.vector_function(*self._arguments(variables))
+                if self.guard_message is None:
+                    values, guard = result, np.ones(size, dtype=bool)
+                else:
+                    guard, values = result
+                    guard = np.broadcast_to(guard, (size,))
+                values = np.asarray(values)
+        except Exception:
+            return None
+        if values.shape != (size,) or values.dtype.kind != "f" or guard.dtype.kind != "b":
+            return None
+        return values, guard
+
+
+@functools.lru_cache(maxsize=256)
+def compile_formula(formula):
+    """Returneaza formula compilata; compilarile recente sunt pastrate intr-un cache LRU."""
+    return CompiledFormula(formula)
+
+
+def evaluate_row(compiled, table, index, source_columns):
+    """Evalueaza formula pe un singur rand, intorcand valoarea sau mesajul de eroare."""
+    try:
+        context = {name: _cell_to_float(table.get(index, col) if col in table else 0)
+                   for name, col in source_columns.items()}
+        return compiled.evaluate_scalar(context)
+    except Exception as e:
+        return f"Eroare: {e}"
+
+
+def evaluate_formula_column(table, formula, source_columns, rows=None):
+    """Calculeaza coloana rezultat a unei formule pentru toate randurile.
+
+    ``source_columns`` leaga variabilele formulei (A, B, ...) de numele coloanelor;
+    ``rows`` (vector de indici) limiteaza calculul la randurile modificate.
+    Returneaza (valori, mesaje): valorile rotunjite la doua zecimale si un
+    dictionar pozitie -> text pentru celulele cu eroare, identic cu evaluarea
+    rand cu rand.
+    """
+    compiled = compile_formula(formula)
+    size = len(table) if rows is None else len(rows)
+    variables = {}
+    valid = np.ones(size, dtype=bool)
+    for name, col in source_columns.items():
+        variables[name], col_valid = table.formula_inputs(col, rows)
+        valid &= col_valid
+
+    vector = compiled.evaluate_vector(variables, size) if size else None
+    if vector is None:
+        values = np.zeros(size)
+        pending = range(size)
+        messages = {}
+    else:
+        values, guard = vector
+        values = round2(values)
+        # Garzile false primesc mesajul formulei, fara exceptii pe rand
+        messages = dict.fromkeys(np.flatnonzero(valid & ~guard).tolist(), compiled.guard_message)
+        # Date invalide sau rezultate ne-finite: evaluare scalara pentru mesajul exact
+        pending = np.flatnonzero(~valid | (guard & ~np.isfinite(values))).tolist()
+
+    INSTRUMENTS.count("formula/scalar_rows", len(pending))
+    for i in pending:
+        result = evaluate_row(compiled, table, i if rows is None else int(rows[i]), source_columns)
+        if isinstance(result, str):
+            messages[i] = result
+            continue
+        try:
+            values[i] = result
+        except (TypeError, ValueError):
+            messages[i] = str(result)
+    return values, messages
+
+
+class FormulaCycleError(ValueError):
+    """Formulele formeaza un ciclu: o coloana depinde, direct sau indirect, de ea insasi."""
+
+
+def formula_bindings(config):
+    """Legaturile explicite variabila -> coloana ale unei intrari din column_formulas.
+
+    Intrarile vechi, cu ``source_column1``/``source_column2``, leaga A si B.
+    """
+    if "bindings" in config:
+        return dict(config["bindings"])
+    return {"A": config["source_column1"], "B": config["source_column2"]}
+
+
+def formula_sources(config, table=None):
+    """Legatura variabila -> coloana pentru toate variabilele formulei.
+
+    Variabilele fara legatura explicita se refera la coloana cu acelasi nume
+    (de ex. ``Masa * Acceleratia``). Daca ``table`` este dat, variabilele
+    nelegate fara coloana corespunzatoare sunt omise, iar formula raporteaza
+    "name ... is not defined" pentru fiecare celula.
+    """
+    bindings = formula_bindings(config)
+    sources = {}
+    for name in compile_formula(config["formula"]).variables:
+        if name in bindings:
+            sources[name] = bindings[name]
+        elif table is None or name in table:
+            sources[name] = name
+    return sources
+
+
+class FormulaGraph:
+    """Graful dependentelor dintre coloane construit din column_formulas.
+
+    ``dependents`` leaga fiecare coloana sursa de coloanele tinta calculate din
+    ea, iar ``order`` contine coloanele tinta in ordine topologica, astfel incat
+    o formula care foloseste rezultatul alteia este calculata dupa ea.
+    Ridica FormulaCycleError daca formulele formeaza un ciclu.
+    """
+
+    def __init__(self, column_formulas):
+        self.formulas = column_formulas
+        self.sources = {target: set(formula_sources(config).values())
+                        for target, config in column_formulas.items()}
+        self.dependents = {}
+        for target, sources in self.sources.items():
+            for source in sources:
+                self.dependents.setdefault(source, []).append(target)
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        waiting = {target: {s for s in sources if s in self.formulas}
+                   for target, sources in self.sources.items()}
+        ready = [target for target, deps in waiting.items() if not deps]
+        order = []
+        while ready:
+            target = ready.pop(0)
+            order.append(target)
+            for dependent in self.dependents.get(target, ()):
+                deps = waiting[dependent]
+                if target in deps:
+                    deps.discard(target)
+                    if not deps:
+                        ready.append(dependent)
+        if len(order) < len(self.formulas):
+            cycle = [target for target in self.formulas if target not in order]
+            raise FormulaCycleError(f"Formulele formeaza un ciclu intre coloanele: {', '.join(cycle)}")
+        return order
+
+
+class DirtyTracker:
+    """Celulele modificate de la ultima recalculare, grupate pe coloane.
+
+    ``rows`` tine randurile modificate ale fiecarei coloane, iar ``columns``
+    coloanele modificate in intregime (formula noua, coloana adaugata/stearsa).
+    """
+
+    __slots__ = ("rows", "columns")
+
+    def __init__(self):
+        self.rows = {}
+        self.columns = set()
+
+    def __bool__(self):
+        return bool(self.rows or self.columns)
+
+    def mark(self, column, row):
+        self.rows.setdefault(column, set()).add(row)
+
+    def mark_column(self, column):
+        self.columns.add(column)
+
+    def copy(self):
+        dirty = DirtyTracker()
+        dirty.rows = {column: set(rows) for column, rows in self.rows.items()}
+        dirty.columns = set(self.columns)
+        return dirty
+
+    def delete_row(self, index):
+        """Ajusteaza indicii randurilor murdare dupa stergerea randului ``index``."""
+        for column, rows in self.rows.items():
+            self.rows[column] = {row - (row > index) for row in rows if row != index}
+
+    def insert_row(self, index):
+        """Ajusteaza indicii randurilor murdare dupa inserarea unui rand la ``index``."""
+        for column, rows in self.rows.items():
+            self.rows[column] = {row + (row >= index) for row in rows}
+
+    def pending_rows(self):
+        """Numarul de celule murdare (fara coloanele marcate in intregime)."""
+        return sum(len(rows) for rows in self.rows.values())
+
+    def clear(self):
+        self.rows.clear()
+        self.columns.clear()
+
+
+def recalculate_dirty(table, graph, dirty):
+    """Recalculeaza doar celulele afectate de modificarile din ``dirty``.
+
+    Coloanele tinta sunt parcurse in ordine topologica; randurile recalculate
+    devin la randul lor murdare pentru formulele care depind de ele. Returneaza
+    randurile modificate (set de indici) sau None daca s-a recalculat tot.
+    """
+    changed = set()
+    full = False
+    for target in graph.order:
+        if target not in table:
+            continue  # Coloana tinta a fost stearsa
+        sources = formula_sources(graph.formulas[target], table)
+        watched = graph.sources[target] | {target}
+        if watched & dirty.columns:
+            rows = None
+        else:
+            pending = set()
+            for column in watched:
+                pending |= dirty.rows.get(column, set())
+            if not pending:
+                continue
+            rows = np.fromiter(sorted(pending), dtype=np.intp, count=len(pending))
+        with INSTRUMENTS.timer(f"recalc/{target}", len(table) if rows is None else len(rows)):
+            values, messages = evaluate_formula_column(table, graph.formulas[target]["formula"], sources, rows)
+            table.assign_column(target, values, messages, rows)
+        INSTRUMENTS.count("recalc/error_cells", len(messages))
+        if rows is None:
+            dirty.mark_column(target)
+            full = True
+        else:
+            dirty.rows.setdefault(target, set()).update(pending)
+            changed |= pending
+    dirty.clear()
+    return None if full else changed
+
+
+class RunningRegression:
+    """Regresie polinomiala de grad ``degree`` actualizata incremental.
+
+    Pastreaza sumele puterilor lui x (pana la 2k), sumele x^j*y si suma y^2,
+    asa ca adaugarea sau scoaterea unor puncte costa O(k) pe punct, iar
+    coeficientii si R^2 se obtin din ecuatiile normale fara o noua potrivire.
+    x este centrat si scalat cu ``shift`` si ``scale`` (fixate la creare)
+    pentru ca ecuatiile normale sa ramana bine conditionate.
+    """
+
+    __slots__ = ("degree", "shift", "scale", "n", "xx", "xy", "yy")
+
+    def __init__(self, degree=1, shift=0.0, scale=1.0):
+        self.degree = degree
+        self.shift = shift
+        self.scale = scale
+        self.n = 0
+        self.xx = np.zeros(2 * degree + 1)  # sum u^j, j = 0..2k
+        self.xy = np.zeros(degree + 1)  # sum u^j * y, j = 0..k
+        self.yy = 0.0
+
+    @classmethod
+    def from_arrays(cls, x, y, degree=1):
+        """Construieste regresia pentru toate punctele (x, y) intr-o singura trecere."""
+        shift = float(x.mean()) if x.size else 0.0
+        spread = float(np.abs(x - shift).max()) if x.size else 0.0
+        fit = cls(degree, shift, spread if spread > 0 and np.isfinite(spread) else 1.0)
+        fit.add_arrays(x, y)
+        return fit
+
+    def add_arrays(self, x, y, sign=1):
+        """Adauga (``sign`` = 1) sau scoate (``sign`` = -1) punctele (x, y)."""
+        u = (x - self.shift) / self.scale
+        power = np.ones_like(u)
+        for j in range(2 * self.degree + 1):
+            self.xx[j] += sign * power.sum()
+            if j <= self.degree:
+                self.xy[j] += sign * np.dot(power, y)
+            power = power * u
+        self.yy += sign * float(np.dot(y, y))
+        self.n += sign * u.size
+
+    def add(self, x, y):
+        self.add_arrays(np.array([x], dtype=float), np.array([y], dtype=float))
+
+    def remove(self, x, y):
+        self.add_arrays(np.array([x], dtype=float), np.array([y], dtype=float), -1)
+
+    def _solve(self):
+        k = self.degree
+        moments = self.xx[np.add.outer(np.arange(k + 1), np.arange(k + 1))]
+        return moments, np.linalg.lstsq(moments, self.xy, rcond=None)[0]
+
+    def coefficients(self):
+        """Coeficientii polinomului in x, de la puterea cea mai mare (ca np.polyfit)."""
+        if self.n <= 0:
+            raise ValueError("no data points to fit")
+        scaled = np.poly1d(self._solve()[1][::-1])
+        coeffs = scaled(np.poly1d([1.0 / self.scale, -self.shift / self.scale])).coeffs
+        return np.concatenate([np.zeros(self.degree + 1 - coeffs.size), coeffs])
+
+    def r_squared(self):
+        """Coeficientul de determinare; NaN daca y este constant sau nu exista date."""
+        if self.n <= 0:
+            return float("nan")
+        moments, coeffs = self._solve()
+        residual = self.yy - 2.0 * np.dot(coeffs, self.xy) + coeffs @ moments @ coeffs
+        total = self.yy - self.xy[0] ** 2 / self.n
+        if total <= 0:
+            return float("nan")
+        return min(1.0, max(0.0, 1.0 - residual / total))
+
+    def equation(self, x="x", y="y"):
+        """Ecuatia polinomului, ca text: ``y = 1.000x + 2.000``."""
+        coeffs = self.coefficients()
+        terms = []
+        for power, coeff in zip(range(self.degree, -1, -1), coeffs):
+            name = x if power == 1 else f"{x}^{power}" if power else ""
+            terms.append(f"{abs(coeff):.3f}{name}" if terms else f"{coeff:.3f}{name}")
+            if len(terms) > 1:
+                terms[-1] = ("- " if coeff < 0 else "+ ") + terms[-1]
+        return f"{y} = " + " ".join(terms)
+
+
+class RegressionCache:
+    """Regresiile incrementale ale perechilor de coloane folosite in grafice.
+
+    Cheia este (coloana x, coloana y, grad, polar). Inainte de a modifica niste
+    randuri, aplicatia le scoate din regresii cu ``update(..., -1)`` si le
+    adauga inapoi dupa modificare cu ``update(..., 1)``.
+    """
+
+    def __init__(self):
+        self.fits = {}
+        self.generation = 0  # Creste la fiecare modificare a regresiilor
+
+    def get(self, key):
+        return self.fits.get(key)
+
+    def store(self, key, fit, generation):
+        """Pastreaza o regresie calculata in fundal, daca datele nu s-au schimbat intre timp."""
+        if generation == self.generation:
+            self.fits[key] = fit
+
+    def update(self, table, columns, rows, sign):
+        """Adauga sau scoate randurile ``rows`` din regresiile care folosesc ``columns``."""
+        self.generation += 1
+        rows = np.fromiter(rows, dtype=np.intp) if not isinstance(rows, np.ndarray) else rows
+        for key, fit in list(self.fits.items()):
+            x_col, y_col, degree, polar = key
+            if x_col not in columns and y_col not in columns:
+                continue
+            if x_col not in table or y_col not in table:
+                del self.fits[key]
+                continue
+            x_values, x_valid = table.numeric(x_col)
+            y_values, y_valid = table.numeric(y_col)
+            mask = x_valid[rows] & y_valid[rows]
+            x = x_values[rows][mask]
+            fit.add_arrays(np.deg2rad(x) if polar else x, y_values[rows][mask], sign)
+
+    def discard(self, columns):
+        """Renunta la regresiile care folosesc ``columns``; sunt refacute la urmatorul grafic."""
+        self.generation += 1
+        for key in list(self.fits):
+            if key[0] in columns or key[1] in columns:
+                del self.fits[key]
+
+    def clear(self):
+        self.generation += 1
+        self.fits.clear()
+
+
+# Numarul maxim de serii (x, y) pastrate de SeriesCache; cele folosite cel mai demult sunt scoase
+SERIES_CACHE_SIZE = 64
+
+
+class SeriesCache:
+    """Perechile numerice (x, y) extrase pentru grafice, pastrate pe tabel si pereche de coloane.
+
+    O intrare este refolosita cat timp versiunile celor doua coloane
+    (``Table.version``) si randurile filtrate (acelasi vector de la
+    ``TableView``) nu s-au schimbat; orice editare o invalideaza. Vectorii
+    returnati sunt comuni tuturor graficelor si nu trebuie modificati.
+    Sunt pastrate cel mult ``size`` intrari (LRU); ``discard_table`` scoate
+    intrarile unui tabel inchis sau inlocuit, ca acesta sa poata fi eliberat.
+    Poate fi folosit si din firele lucrarilor din fundal.
+    """
+
+    def __init__(self, size=SERIES_CACHE_SIZE):
+        self.size = size
+        self.series = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, table, x_col, y_col, rows=None):
+        """Returneaza (x, y): valorile randurilor unde ambele coloane contin numere."""
+        key = (id(table), x_col, y_col)
+        versions = (table.version(x_col), table.version(y_col))
+        with self._lock:
+            entry = self.series.get(key)
+            if entry is not None and entry[0] is table and entry[1] == versions and entry[2] is rows:
+                self.series.move_to_end(key)
+                return entry[3], entry[4]
+        x_values, x_valid = table.numeric(x_col)
+        y_values, y_valid = table.numeric(y_col)
+        if rows is not None:
+            x_values, x_valid, y_values, y_valid = x_values[rows], x_valid[rows], y_values[rows], y_valid[rows]
+        mask = x_valid & y_valid
+        x, y = x_values[mask], y_values[mask]
+        with self._lock:
+            self.series[key] = (table, versions, rows, x, y)
+            self.series.move_to_end(key)
+            while len(self.series) > self.size:
+                self.series.popitem(last=False)
+        return x, y
+
+    def discard_table(self, table):
+        """Scoate seriile extrase din ``table``."""
+        with self._lock:
+            for key in [key for key, entry in self.series.items() if entry[0] is table]:
+                del self.series[key]
+
+    def clear(self):
+        with self._lock:
+            self.series.clear()
+
+
+def prepare_graph_data(table, x_col, y_col, degree=None, polar=False, fit=None, rows=None, series=None):
+    """Extrage perechile numerice (x, y) si, optional, regresia de grad ``degree``.
+
+    Ruleaza in fundal. ``rows`` (de ex. indicii unei ``TableView`` filtrate)
+    restrange punctele la aceste randuri. ``fit`` este regresia deja actualizata
+    pentru aceasta pereche, daca exista; altfel este construita aici (in
+    coordonate polare r este potrivit ca polinom in unghiul theta, in
+    radiani). ``series`` este un ``SeriesCache`` din care sunt luate perechile
+    deja extrase. Returneaza un dictionar cu ``x``, ``y``, ``fit``, ``coeffs``,
+    ``equation``, ``r2`` si ``error`` (mesajul, daca regresia nu a putut fi
+    calculata).
+    """
+    x, y = (series or SeriesCache()).get(table, x_col, y_col, rows)
+    result = {"x": x, "y": y, "fit": None, "coeffs": None, "equation": None, "r2": None, "error": None}
+    if degree and result["x"].size:
+        try:
+            if fit is None:
+                x = np.deg2rad(result["x"]) if polar else result["x"]
+                with INSTRUMENTS.timer("graph/regression", x.size):
+                    fit = RunningRegression.from_arrays(x, result["y"], degree)
+            result["fit"] = fit
+            result["coeffs"] = fit.coefficients()
+            result["equation"] = fit.equation("θ", "r") if polar else fit.equation()
+            result["r2"] = fit.r_squared()
+        except Exception as e:
+            result["error"] = str(e)
+    return result
+
+
+# Latura (in pixeli) a celulei de decimare: cel mult un punct desenat pe celula
+DECIMATION_CELL_PX = 3
+# Sub acest numar de puncte vizibile, seria este desenata integral
+DECIMATION_MIN_POINTS = 20000
+
+
+def decimate_points(x, y, x_range, y_range, width, height, cell_px=DECIMATION_CELL_PX):
+    """Indicii punctelor de desenat din zona vizibila ``x_range`` x ``y_range``.
+
+    Zona este impartita in celule de ``cell_px`` pixeli si se pastreaza cel mult
+    un punct pe celula ocupata, deci minimul si maximul fiecarei coloane de
+    pixeli raman desenate; rezultatul arata la fel ca seria completa.
+    """
+    x0, x1 = x_range
+    y0, y1 = y_range
+    index = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+    if index.size <= DECIMATION_MIN_POINTS:
+        return index
+    cols = max(1, int(width // cell_px))
+    rows = max(1, int(height // cell_px))
+    cx = (x[index] - x0) * (cols / (x1 - x0) if x1 > x0 else 0.0)
+    cy = (y[index] - y0) * (rows / (y1 - y0) if y1 > y0 else 0.0)
+    cell = np.minimum(cx.astype(np.int64), cols - 1) * rows + np.minimum(cy.astype(np.int64), rows - 1)
+    # Pentru celulele cu mai multe puncte ramane ultimul scris; -1 = celula goala
+    keep = np.full(cols * rows, -1, dtype=np.int64)
+    keep[cell] = np.arange(index.size)
+    return index[keep[keep >= 0]]
+
+
+def recalculate_all(table, column_formulas):
+    """Recalculeaza toate coloanele cu formule, in ordinea dependentelor; returneaza graful."""
+    graph = FormulaGraph(column_formulas)
+    dirty = DirtyTracker()
+    for target in column_formulas:
+        dirty.mark_column(target)
+    recalculate_dirty(table, graph, dirty)
+    return graph
+
+
+class Journal:
+    """Istoricul undo/redo al modificarilor, ca operatii (delte), nu copii ale tabelului.
+
+    O operatie este un dictionar cu cheia ``op`` si datele necesare pentru a o
+    reface in ambele sensuri (de ex. valoarea veche si cea noua a celulei).
+    Datele mari sunt pastrate prin referinta: o coloana stearsa ramane in
+    jurnal ca acelasi obiect ``Column``, fara copiere. ``limit`` (implicit
+    nelimitat) este numarul maxim de operatii pastrate pentru undo.
+    """
+
+    __slots__ = ("done", "undone", "limit")
+
+    def __init__(self, limit=None):
+        self.done = collections.deque(maxlen=limit)
+        self.undone = []
+        self.limit = limit
+
+    def record(self, operation):
+        """Adauga o operatie noua; operatiile anulate nu mai pot fi refacute."""
+        self.done.append(operation)
+        self.undone.clear()
+
+    def undo(self):
+        """Operatia care trebuie anulata (sau None); trece in lista pentru redo."""
+        if not self.done:
+            return None
+        operation = self.done.pop()
+        self.undone.append(operation)
+        return operation
+
+    def redo(self):
+        """Operatia care trebuie refacuta (sau None)."""
+        if not self.undone:
+            return None
+        operation = self.undone.pop()
+        self.done.append(operation)
+        return operation
+
+    def clear(self):
+        self.done.clear()
+        self.undone.clear()
+
+
+def apply_autosave_record(table, column_formulas, record):
+    """Reaplica pe tabel o inregistrare din jurnalul salvarii automate."""
+    op = record["op"]
+    if op == "set_cell":
+        table.set(record["row"], record["column"], record["value"])
+    elif op == "insert_row":
+        table.insert_row(record["row"], record.get("values"))
+    elif op == "delete_row":
+        table.delete_row(record["row"])
+    elif op == "add_column":
+        table.insert_column(record["column"], position=record.get("position"))
+    elif op == "delete_column":
+        table.drop_column(record["column"])
+    elif op == "set_formula":
+        if record["formula"] is None:
+            column_formulas.pop(record["column"], None)
+        else:
+            column_formulas[record["column"]] = record["formula"]
+    else:
+        raise ValueError(f"unknown autosave record: {op!r}")
+
+
+# Dupa atatea inregistrari in jurnal, salvarea automata rescrie proiectul de baza
+AUTOSAVE_COMPACT_RECORDS = 10000
+
+
+def _lock_file(path, wait=False):
+    """Deschide ``path`` si il blocheaza exclusiv; None daca il tine blocat alt proces.
+
+    Blocarea dispare odata cu procesul, deci un fisier care poate fi blocat
+    apartine unei sesiuni inchise (sau cazute). Cu ``wait``, asteapta eliberarea.
+    """
+    try:
+        f = open(path, "a+b")
+    except OSError:
+        return None  # Directorul a fost sters intre timp
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if wait else msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+class Autosave:
+    """Salvare automata incrementala: un proiect de baza si jurnalul modificarilor de dupa el.
+
+    Fiecare sesiune (instanta a aplicatiei) scrie intr-un subdirector propriu
+    al lui ``directory``, blocat cat timp sesiunea este deschisa; ``start``
+    il creeaza si cauta sesiunile cazute (neblocate, cu jurnal). Cea mai
+    recenta este oferita: ``recover`` o reface, ``discard_recovery`` o sterge;
+    celelalte raman neatinse pana la pornirile urmatoare. Doar sesiunile fara
+    jurnal sunt sterse la pornire. ``close`` sterge doar fisierele sesiunii
+    proprii.
+
+    ``log`` retine inregistrarile operatiilor (dictionare JSON); ``flush_log`` le
+    adauga la finalul fisierului jurnal (cu fsync), fara a rescrie tabelul.
+    Baza este proiectul deschis sau salvat de utilizator; daca nu exista (import,
+    proiect nou), o operatie nu poate fi descrisa compact (``log(None)``, de
+    ex. restaurarea unei coloane sterse) sau jurnalul a crescut prea mult,
+    ``needs_base`` cere o copie .cproj a tabelului in directorul sesiunii.
+    Copia poate fi scrisa pe alt fir: ``begin_base`` fixeaza momentul copiei,
+    modificarile de dupa el sunt pastrate, iar ``finish_base`` trece la noua
+    baza cu jurnalul lor. Fisierele sunt inlocuite atomic (os.replace), iar
+    ``recover`` ignora o ultima linie scrisa incomplet la o cadere.
+    """
+
+    LOG_NAME = "autosave.log"
+    BASE_PREFIX = "autosave-"
+    LOCK_NAME = "session.lock"
+    ROOT_LOCK_NAME = "sessions.lock"
+
+    def __init__(self, directory):
+        self.root = directory
+        self.directory = None  # Directorul sesiunii, creat de start()
+        self.log_path = None
+        self.base_path = None
+        self.pending = []
+        self.dirty = False
+        self.logged = 0
+        self._header_written = False
+        self._lock = None
+        self._orphan = None  # (director, blocare) al unei sesiuni cazute, de recuperat
+        self._writing = None  # Copia de baza in curs de scriere (begin_base)
+        self._since_base = None  # Inregistrarile de dupa begin_base
+        self._copies = 0
+
+    def start(self):
+        """Creeaza si blocheaza directorul sesiunii; cauta o sesiune cazuta de recuperat."""
+        os.makedirs(self.root, exist_ok=True)
+        # Instantele pornite simultan nu trebuie sa vada sesiunea celeilalte inainte de blocare
+        root_lock = _lock_file(os.path.join(self.root, self.ROOT_LOCK_NAME), wait=True)
+        try:
+            self._find_orphan()
+            self.directory = tempfile.mkdtemp(prefix="session-", dir=self.root)
+            self._lock = _lock_file(os.path.join(self.directory, self.LOCK_NAME))
+        finally:
+            if root_lock is not None:
+                root_lock.close()
+        self.log_path = os.path.join(self.directory, self.LOG_NAME)
+
+    def _find_orphan(self):
+        sessions = [os.path.join(self.root, name) for name in os.listdir(self.root) if name.startswith("session-")]
+        sessions.sort(key=_modified_time, reverse=True)
+        for directory in sessions:
+            lock = _lock_file(os.path.join(directory, self.LOCK_NAME))
+            if lock is None:
+                continue  # Sesiune deschisa in alta instanta
+            if not os.path.exists(os.path.join(directory, self.LOG_NAME)):
+                _remove_session(directory, lock)  # Inchisa fara modificari sau recuperata deja
+            elif self._orphan is None:
+                self._orphan = (directory, lock)  # Ramane blocata pana la recuperare
+            else:
+                lock.close()  # Alta sesiune cazuta: ramane neatinsa, oferita la o pornire urmatoare
+
+    def exists(self):
+        """Exista modificari salvate automat de o sesiune care nu s-a inchis normal."""
+        return self._orphan is not None
+
+    def reset(self, base_path=None):
+        """Starea curenta este cea din ``base_path`` (sau una noua, fara baza); jurnalul este golit."""
+        self.discard()
+        self.base_path = os.path.abspath(base_path) if base_path else None
+
+    def log(self, record):
+        """Adauga o inregistrare; None cere o noua copie a proiectului (vezi ``needs_base``)."""
+        if record is None:
+            self.base_path = None
+            self.pending.clear()
+            self._writing = self._since_base = None  # Copia in curs nu mai descrie starea
+        else:
+            if self.base_path is not None:
+                self.pending.append(record)
+            if self._writing is not None:
+                self._since_base.append(record)
+        self.dirty = True
+
+    def needs_base(self):
+        """Urmatoarea scriere trebuie sa fie o copie completa a proiectului."""
+        return (self.dirty and self._writing is None
+                and (self.base_path is None or self.logged + len(self.pending) > AUTOSAVE_COMPACT_RECORDS))
+
+    def begin_base(self):
+        """Incepe o copie de baza a starii curente; returneaza fisierul in care trebuie scrisa."""
+        while True:
+            self._copies += 1
+            path = os.path.join(self.directory, f"{self.BASE_PREFIX}{self._copies}.cproj")
+            if not os.path.exists(path) and path != self.base_path:
+                break
+        self._writing = path
+        self._since_base = []
+        return path
+
+    def finish_base(self, path):
+        """Copia ``path`` a fost scrisa: devine baza, cu modificarile facute intre timp."""
+        if path != self._writing:
+            _remove_file(path)  # Copie abandonata (log(None) sau reset in timpul scrierii)
+            return
+        self.base_path = path
+        self._write_log(self._since_base)
+        self.logged = len(self._since_base)
+        self.pending.clear()
+        self.dirty = False
+        self._writing = self._since_base = None
+        self._remove_copies(keep=path)
+
+    def cancel_base(self, path):
+        """Scrierea copiei ``path`` a esuat; copia va fi ceruta din nou."""
+        _remove_file(path)
+        if path == self._writing:
+            self._writing = self._since_base = None
+            self.dirty = True
+
+    def flush_log(self):
+        """Adauga in jurnal inregistrarile de la ultimul apel (fara copia de baza)."""
+        if not self.dirty or self.base_path is None:
+            if self._writing is not None:
+                self.dirty = False  # Modificarile ajung in jurnal odata cu noua baza
+            return
+        if not self._header_written:
+            self._write_log(self.pending)
+            self.logged = len(self.pending)
+        else:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in self.pending)
+                f.flush()
+                os.fsync(f.fileno())
+            self.logged += len(self.pending)
+        self.pending.clear()
+        self.dirty = False
+
+    def flush(self, table, column_formulas=None, graph_settings=None):
+        """Scrie pe disc modificarile inregistrate de la ultimul apel; copia de baza, pe firul curent."""
+        if not self.needs_base():
+            self.flush_log()
+            return
+        path = self.begin_base()
+        try:
+            save_project_file(path, table, column_formulas, graph_settings)
+        except BaseException:
+            self.cancel_base(path)
+            raise
+        self.finish_base(path)
+
+    def _write_log(self, records):
+        temp_path = self.log_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": 1, "base": self.base_path}) + "\n")
+            f.writelines(json.dumps(record) + "\n" for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.log_path)
+        self._header_written = True
+
+    def _remove_copies(self, keep=None):
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(self.BASE_PREFIX) and path != keep and path != self._writing:
+                _remove_file(path)
+
+    def recover(self):
+        """Reface proiectul sesiunii cazute; returneaza (tabel, formule, setari grafic).
+
+        Jurnalul continua in sesiunea curenta de unde a ramas, ca o noua cadere
+        sa nu piarda nici modificarile recuperate.
+        """
+        directory, lock = self._orphan
+        with open(os.path.join(directory, self.LOG_NAME), encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        header = json.loads(lines[0])
+        records = []
+        for line in lines[1:]:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # Linie incompleta (sau finalul fisierului)
+        base = header["base"]
+        table, column_formulas, graph_settings = load_project_file(base)
+        for record in records:
+            apply_autosave_record(table, column_formulas, record)
+        recalculate_all(table, column_formulas)
+        if os.path.dirname(os.path.abspath(base)) == os.path.abspath(directory):
+            # Copia de baza trece in sesiunea curenta, inainte ca sesiunea veche sa fie stearsa
+            table.detach_file(base)
+            moved = os.path.join(self.directory, os.path.basename(base))
+            os.replace(base, moved)
+            base = moved
+        self.base_path = base
+        self.pending.clear()
+        self.dirty = False
+        self._write_log(records)  # Fara eventuala linie incompleta
+        self.logged = len(records)
+        self.discard_recovery()
+        return table, column_formulas, graph_settings
+
+    def discard_recovery(self):
+        """Sterge sesiunea cazuta (recuperata sau refuzata de utilizator)."""
+        if self._orphan is not None:
+            _remove_session(*self._orphan)
+            self._orphan = None
+
+    def discard(self):
+        """Sterge fisierele salvarii automate ale sesiunii curente."""
+        self._writing = self._since_base = None
+        if self.directory is not None:
+            _remove_file(self.log_path)
+            self._remove_copies()
+        self.base_path = None
+        self.pending.clear()
+        self.dirty = False
+        self.logged = 0
+        self._header_written = False
+
+    def close(self):
+        """Inchidere normala: sterge directorul sesiunii, fara a atinge celelalte sesiuni."""
+        self.discard_recovery()
+        if self.directory is not None:
+            self.discard()  # Inainte de deblocare, ca sesiunea sa nu para cazuta
+            _remove_session(self.directory, self._lock)
+            self.directory = self._lock = None
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _modified_time(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0  # Sters intre timp de alta instanta
+
+
+def _remove_session(directory, lock):
+    if lock is not None:
+        lock.close()  # Pe Windows fisierul blocat nu poate fi sters
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+
+def trendline_points(result, polar=False):
+    """Punctele liniei de regresie pregatite de prepare_graph_data: (x, y) pe intervalul datelor."""
+    x_data = np.deg2rad(result["x"]) if polar else result["x"]
+    coeffs = result["coeffs"]
+    # Create line using the min and max of x_data
+    x_line = np.linspace(x_data.min(), x_data.max(), 100 if len(coeffs) == 2 else 400)
+    return x_line, np.polyval(coeffs, x_line)
+
+
+def equation_text(result):
+    """Ecuatia regresiei si R², asa cum sunt afisate pe grafic."""
+    return f"{result['equation']}\nR² = {result['r2']:.4f}"
+
+
+def draw_equation(ax, text, index=0):
+    """Scrie ecuatia ``text`` in coltul axelor; ``index`` le aseaza una sub alta."""
+    return ax.text(0.05, 0.95 - 0.12 * index, text, transform=ax.transAxes, fontsize=10,
+                   verticalalignment='top', bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5))
+
+
+def draw_trendline(ax, result, polar=False, show_equation=False, color='r', index=0, label="Trendline"):
+    """Deseneaza pe ``ax`` regresia pregatita de prepare_graph_data si, optional, ecuatia ei."""
+    x_line, y_line = trendline_points(result, polar)
+    ax.plot(x_line, y_line, '-', color=color, label=label)
+    if show_equation:
+        draw_equation(ax, equation_text(result), index)
+
+
+def graph_grid(count):
+    """(randuri, coloane) ale grilei de grafice pentru ``count`` grafice, cat mai aproape de patrat."""
+    columns = max(1, int(np.ceil(np.sqrt(count))))
+    return max(1, -(-count // columns)), columns
+
+
+def set_graph_titles(axes, x_col, y_cols, polar=False, grid=False):
+    """Titlurile si etichetele axelor; in grila, fiecare grafic are o singura coloana Y."""
+    for i, ax in enumerate(axes):
+        names = ", ".join([y_cols[i]] if grid else y_cols)
+        if polar:
+            ax.set_title(f"Polar Plot of {names} vs {x_col}")
+        else:
+            ax.set_title(f"{names} vs {x_col}")
+            ax.set_xlabel(x_col)
+            ax.set_ylabel(names)
+
+
+def graph_columns(settings):
+    """Coloanele Y din setarile graficului (``y_columns`` sau, in proiectele vechi, ``y_column``)."""
+    return list(settings.get("y_columns") or ([settings["y_column"]] if settings.get("y_column") else []))
+
+
+def render_graph(path, table, settings, dpi=100):
+    """Salveaza graficul descris de ``settings`` (setarile din proiect) ca imagine, cu backend-ul Agg."""
+    # Importate doar aici, ca nucleul sa nu incarce matplotlib la import
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    x_col = settings.get("x_column")
+    y_cols = graph_columns(settings)
+    if x_col not in table or not y_cols or any(y_col not in table for y_col in y_cols):
+        raise ValueError(f"invalid graph columns: {x_col!r}, {y_cols!r}")
+    polar = settings.get("polar", False)
+    degree = int(settings.get("degree", 1)) if settings.get("trendline") else None
+    results = [prepare_graph_data(table, x_col, y_col, degree, polar) for y_col in y_cols]
+    if not any(result["x"].size for result in results):
+        raise ValueError("not enough numeric data to plot")
+    for result in results:
+        if result["error"] is not None:
+            raise ValueError(f"could not compute trendline: {result['error']}")
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    grid = settings.get("layout") == "grid" and len(y_cols) > 1
+    rows, columns = graph_grid(len(y_cols)) if grid else (1, 1)
+    axes = [figure.add_subplot(rows, columns, i + 1, projection="polar" if polar else None)
+            for i in range(len(y_cols) if grid else 1)]
+    single = len(y_cols) == 1
+    width, height = figure.get_size_inches() * dpi / (columns, rows)
+    for i, (y_col, result) in enumerate(zip(y_cols, results)):
+        ax = axes[i if grid else 0]
+        x_data = np.deg2rad(result["x"]) if polar else result["x"]
+        y_data = result["y"]
+        # Doar punctele care se disting la rezolutia imaginii
+        finite = np.isfinite(x_data) & np.isfinite(y_data)
+        if finite.any():
+            index = decimate_points(x_data, y_data, (x_data[finite].min(), x_data[finite].max()),
+                                    (y_data[finite].min(), y_data[finite].max()), width, height)
+            line, = ax.plot(x_data[index], y_data[index], 'bo' if single else 'o',
+                            label="Data" if single else y_col)
+            if result["coeffs"] is not None:
+                draw_trendline(ax, result, polar, settings.get("equation", False),
+                               'r' if single else line.get_color(), 0 if grid else i,
+                               "Trendline" if single else f"{y_col} trendline")
+    set_graph_titles(axes, x_col, y_cols, polar, grid)
+    for ax in axes:
+        ax.legend()
+    if grid:
+        figure.tight_layout()
+    figure.savefig(path, dpi=dpi)
@@ -0,0 +1,37 @@
+"""Configurarea testelor: modulele aplicatiei sunt importate din radacina depozitului."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import coordonate_core as core  # noqa: E402
+
+
+def make_table(columns, rows):
+    """Tabel cu ``columns`` completat din liste de valori (cate una pe rand)."""
+    table = core.Table(columns)
+    for row in rows:
+        table.append_row(dict(zip(columns, row)))
+    return table
+
+
+def table_cells(table):
+    """Coloanele si valorile afisate ale tabelului, pentru comparatii."""
+    return table.columns, [table.display_row(i) for i in range(len(table))]
+
+
+@pytest.fixture
+def sample_table():
+    # Numere, celule goale, text si valori care produc erori in formule
+    return make_table(["A", "B", "Nume"], [
+        [1, 2, "unu"],
+        ["", 0, ""],
+        [-4, 0.5, "minus, cu virgula"],
+        [2.675, "x", 'ghilimele "duble"'],
+        [1e300, 1e-300, "mare"],
+        [0, -3, "zero"],
+    ])
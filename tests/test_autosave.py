@@ -0,0 +1,157 @@
+"""Salvarea automata si istoricul undo/redo: recuperarea dupa o cadere si separarea sesiunilor."""
+import json
+import os
+import subprocess
+import sys
+
+import coordonate_core as core
+from conftest import ROOT, make_table, table_cells
+
+# Sesiune care salveaza automat cateva modificari si se opreste fara close()
+_CRASHING_SESSION = """
+import sys
+sys.path.insert(0, {root!r})
+import coordonate_core as core
+autosave = core.Autosave({directory!r})
+autosave.start()
+table = core.Table(["A", "B"])
+for i in range(5):
+    table.append_row({{"A": i, "B": i * 10}})
+autosave.log(None)
+autosave.flush(table)
+for record in {records!r}:
+    core.apply_autosave_record(table, {{}}, record)
+    autosave.log(record)
+autosave.flush(table)
+print(autosave.log_path)
+"""
+
+RECORDS = [
+    {"op": "set_cell", "row": 0, "column": "A", "value": "100"},
+    {"op": "insert_row", "row": 2, "values": {"A": "7", "B": "text"}},
+    {"op": "delete_row", "row": 4},
+    {"op": "add_column", "column": "C", "position": 1},
+    {"op": "set_cell", "row": 1, "column": "C", "value": "3"},
+]
+
+
+def crash_session(directory, records=RECORDS):
+    """Ruleaza o sesiune intr-un proces separat, oprit fara inchidere normala."""
+    code = _CRASHING_SESSION.format(root=ROOT, directory=str(directory), records=records)
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def expected_table(records=RECORDS):
+    table = make_table(["A", "B"], [[i, i * 10] for i in range(5)])
+    for record in records:
+        core.apply_autosave_record(table, {}, record)
+    return table
+
+
+def test_journal_undo_redo():
+    journal = core.Journal(limit=2)
+    for i in range(3):
+        journal.record({"op": "set_cell", "i": i})
+    assert journal.undo() == {"op": "set_cell", "i": 2}
+    assert journal.undo() == {"op": "set_cell", "i": 1}
+    assert journal.undo() is None  # Prima operatie a depasit limita
+    assert journal.redo() == {"op": "set_cell", "i": 1}
+    journal.record({"op": "set_cell", "i": 3})
+    assert journal.redo() is None
+
+
+def test_recover_after_crash(tmp_path):
+    crash_session(tmp_path)
+    autosave = core.Autosave(str(tmp_path))
+    autosave.start()
+    assert autosave.exists()
+    table, _, _ = autosave.recover()
+    assert table_cells(table) == table_cells(expected_table())
+    assert not autosave.exists()
+    autosave.close()
+
+
+def test_recover_ignores_torn_last_line(tmp_path):
+    log_path = crash_session(tmp_path)
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "set_cell", "row": 0, "column": "B", "value": "9"})[:20])  # Scriere intrerupta
+    autosave = core.Autosave(str(tmp_path))
+    autosave.start()
+    table, _, _ = autosave.recover()
+    assert table_cells(table) == table_cells(expected_table())
+
+    # Jurnalul continua in sesiunea noua, fara linia incompleta
+    record = {"op": "set_cell", "row": 0, "column": "B", "value": "9"}
+    core.apply_autosave_record(table, {}, record)
+    autosave.log(record)
+    autosave.flush_log()
+    with open(autosave.log_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines[1:]] == RECORDS + [record]
+    autosave.close()
+
+
+def test_open_session_is_not_recovered_or_removed(tmp_path):
+    first = core.Autosave(str(tmp_path))
+    first.start()
+    first.log(None)
+    first.flush(make_table(["A"], [[1]]))
+
+    second = core.Autosave(str(tmp_path))
+    second.start()
+    assert not second.exists()  # Sesiunea deschisa nu este "cazuta"
+    second.close()
+    assert os.path.exists(first.log_path)
+    first.close()
+    assert [name for name in os.listdir(tmp_path) if name.startswith("session-")] == []
+
+
+def test_base_written_in_background_keeps_later_records(tmp_path):
+    autosave = core.Autosave(str(tmp_path))
+    autosave.start()
+    table = make_table(["A", "B"], [[i, i] for i in range(3)])
+    autosave.log(None)
+    assert autosave.needs_base()
+    path = autosave.begin_base()
+    snapshot = table.snapshot(writable=table.columns)
+    record = {"op": "set_cell", "row": 1, "column": "A", "value": "50"}
+    core.apply_autosave_record(table, {}, record)  # Modificare facuta cat timp copia este scrisa
+    autosave.log(record)
+    assert not autosave.needs_base()
+    core.save_project_file(path, snapshot)
+    autosave.finish_base(path)
+    autosave._lock.close()  # Ca dupa o cadere: blocarea dispare odata cu procesul
+
+    recovered = core.Autosave(str(tmp_path))
+    recovered.start()
+    table_recovered, _, _ = recovered.recover()
+    assert table_cells(table_recovered) == table_cells(table)
+    recovered.close()
+
+
+def test_every_crashed_session_is_offered_in_turn(tmp_path):
+    older = os.path.dirname(crash_session(tmp_path, RECORDS[:1]))
+    newer = os.path.dirname(crash_session(tmp_path))
+    os.utime(older, (1, 1))  # Ordinea nu depinde de rezolutia ceasului
+    empty = core.Autosave(str(tmp_path))
+    empty.start()  # Sesiune cazuta inainte de prima modificare: nu are jurnal
+    empty._orphan[1].close()
+    empty._lock.close()
+
+    first = core.Autosave(str(tmp_path))
+    first.start()
+    assert first.exists()
+    table, _, _ = first.recover()
+    assert table_cells(table) == table_cells(expected_table())
+    assert os.path.isdir(older) and not os.path.isdir(newer)
+    assert not os.path.isdir(empty.directory)
+    first.close()
+
+    second = core.Autosave(str(tmp_path))
+    second.start()
+    assert second.exists()
+    table, _, _ = second.recover()
+    assert table_cells(table) == table_cells(expected_table(RECORDS[:1]))
+    second.close()
+    assert [name for name in os.listdir(tmp_path) if name.startswith("session-")] == []
@@ -0,0 +1,119 @@
+"""Exportul si importul tabelelor si proiectelor pastreaza continutul celulelor."""
+import os
+
+import pytest
+
+import coordonate_cli
+import coordonate_core as core
+from conftest import make_table, table_cells
+
+FORMULAS = {"Suma": {"formula": "A + B", "source_column1": "A", "source_column2": "B"}}
+GRAPH = {"x_column": "A", "y_columns": ["B"], "trendline": True, "degree": 2}
+
+
+def read_chunks(reader, path):
+    table = core.Table()
+    for _ in reader(path, table):
+        pass
+    return table
+
+
+def write_chunks(writer, table, path):
+    for _ in writer(table, path):
+        pass
+
+
+def test_csv_round_trip(tmp_path, sample_table):
+    path = str(tmp_path / "table.csv")
+    write_chunks(core.write_csv_chunks, sample_table, path)
+    assert table_cells(read_chunks(core.read_csv_chunks, path)) == table_cells(sample_table)
+
+
+def test_csv_round_trip_in_several_chunks(tmp_path, sample_table):
+    path = str(tmp_path / "table.csv")
+    for _ in core.write_csv_chunks(sample_table, path, chunk_rows=2):
+        pass
+    table = core.Table()
+    for _ in core.read_csv_chunks(path, table, chunk_rows=2):
+        pass
+    assert table_cells(table) == table_cells(sample_table)
+
+
+def test_ctab_round_trip(tmp_path, sample_table):
+    path = str(tmp_path / "table.ctab")
+    write_chunks(core.write_table_chunks, sample_table, path)
+    assert table_cells(read_chunks(core.read_table_chunks, path)) == table_cells(sample_table)
+
+
+@pytest.mark.parametrize("save", [core.save_project_file, core.save_json_project])
+def test_project_round_trip(tmp_path, sample_table, save):
+    path = str(tmp_path / "project.cproj")
+    save(path, sample_table, FORMULAS, GRAPH)
+    table, column_formulas, graph_settings = core.load_project_file(path)
+    assert table_cells(table) == table_cells(sample_table)
+    assert column_formulas == FORMULAS
+    assert graph_settings == GRAPH
+
+
+def test_project_chunks_match_whole_load(tmp_path, sample_table):
+    path = str(tmp_path / "project.json")
+    core.save_json_project(path, sample_table, FORMULAS, GRAPH)
+    for project, fraction in core.load_project_chunks(path, first_rows=2, chunk_rows=2):
+        pass
+    assert fraction == 1.0
+    assert table_cells(project[0]) == table_cells(sample_table)
+
+
+def test_project_can_be_saved_over_its_mapped_file(tmp_path, sample_table):
+    path = str(tmp_path / "project.cproj")
+    core.save_project_file(path, sample_table)
+    table, _, _ = core.load_project_file(path)  # Coloanele sunt mapate din fisier
+    table.set(0, "A", 42)
+    core.save_project_file(path, table)
+    reloaded, _, _ = core.load_project_file(path)
+    assert table_cells(reloaded) == table_cells(table)
+
+
+def test_cli_refuses_to_export_project_over_itself(tmp_path):
+    path = str(tmp_path / "in.cproj")
+    core.save_project_file(path, make_table(["A", "B"], [[1, 2]]), FORMULAS)
+    before = open(path, "rb").read()
+    with pytest.raises(ValueError):
+        coordonate_cli.process_project(path, export="cproj")
+    assert open(path, "rb").read() == before
+
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    written = coordonate_cli.process_project(path, output_dir=str(output_dir), export="cproj")
+    assert written == [str(output_dir / "in.cproj")]
+    table, column_formulas, _ = core.load_project_file(written[0])
+    assert (table.get(0, "A"), table.get(0, "B")) == (1.0, 2.0)
+    assert column_formulas == FORMULAS
+
+
+def test_cli_exports_recalculated_csv(tmp_path):
+    path = str(tmp_path / "in.cproj")
+    table = make_table(["A", "B", "Suma"], [[1, 2, ""], [3, 4, ""]])
+    core.save_project_file(path, table, FORMULAS)
+    assert coordonate_cli.main([path, "--jobs", "1"]) == 0
+    exported = read_chunks(core.read_csv_chunks, os.path.splitext(path)[0] + ".csv")
+    assert [exported.get(i, "Suma") for i in range(2)] == [3.0, 7.0]
+
+
+def test_cli_rejects_colliding_targets_before_any_work(tmp_path, capsys):
+    table = make_table(["A", "B", "Suma"], [[1, 2, ""]])
+    cproj, legacy = str(tmp_path / "p.cproj"), str(tmp_path / "p.json")
+    core.save_project_file(cproj, table, FORMULAS)
+    core.save_json_project(legacy, table, FORMULAS)
+    before = open(cproj, "rb").read()
+    # p.json ar fi exportat peste p.cproj
+    assert coordonate_cli.main([str(tmp_path), "--export", "cproj", "--jobs", "1"]) == 1
+    assert open(cproj, "rb").read() == before
+    # Ambele proiecte ar scrie p.csv
+    assert coordonate_cli.main([str(tmp_path), "--jobs", "1"]) == 1
+    assert not os.path.exists(str(tmp_path / "p.csv"))
+    assert "p.csv is also written for" in capsys.readouterr().err
+
+    output_dir = tmp_path / "out"
+    assert coordonate_cli.main([cproj, cproj, "--output-dir", str(output_dir), "--export", "cproj", "--jobs", "1"]) == 0
+    assert os.listdir(str(output_dir)) == ["p.cproj"]
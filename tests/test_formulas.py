@@ -0,0 +1,148 @@
+"""Formulele compilate: aceleasi rezultate ca evaluarea veche cu eval si lista alba."""
+import time
+import warnings
+
+import numpy as np
+import pytest
+
+import coordonate_core as core
+from conftest import make_table
+
+# Valorile coloanelor X si Y: zero, negative, goale, text si valori extreme
+X_VALUES = [3, 0, -4, "", 2.675, 1e-3, 1e200, "abc", 0.1, -0.5, 7]
+Y_VALUES = [2, 0, 0.5, 5, "", -2, 1e200, 1, 3, 2.5, "text"]
+
+
+def old_eval(formula, a, b):
+    """Evaluarea din versiunea initiala a aplicatiei, rand cu rand.
+
+    Singura diferenta voita: mesajele garzilor ('Eroare: Div/0') sunt pastrate
+    ca atare, nu inlocuite de eroarea lui round() pe text.
+    """
+    try:
+        context = {"A": float(a or 0), "B": float(b or 0)}
+        result = eval(formula, {"__builtins__": {}, "np": np}, context)
+        if isinstance(result, str):
+            return result
+        return round(result, 2)
+    except Exception as e:
+        return f"Eroare: {e}"
+
+
+def evaluate(formula, x_values=X_VALUES, y_values=Y_VALUES):
+    """Rezultatele pe celule: valoarea sau mesajul de eroare."""
+    table = make_table(["X", "Y"], zip(x_values, y_values))
+    values, messages = core.evaluate_formula_column(table, formula, {"A": "X", "B": "Y"})
+    return [messages.get(i, value) for i, value in enumerate(values.tolist())]
+
+
+def assert_same(results, expected, formula):
+    for i, value in enumerate(expected):
+        if isinstance(value, str):
+            assert results[i] == value, (i, formula)
+        else:
+            assert results[i] == value or (np.isnan(value) and np.isnan(results[i])), (i, formula)
+
+
+@pytest.mark.parametrize("name", sorted(core.FORMULAS_DB))
+def test_formula_matches_old_eval(name):
+    formula = core.FORMULAS_DB[name]
+    with np.errstate(all="ignore"):
+        expected = [old_eval(formula, a, b) for a, b in zip(X_VALUES, Y_VALUES)]
+    assert_same(evaluate(formula), expected, formula)
+
+
+def test_partial_rows_match_full_column():
+    table = make_table(["X", "Y"], zip(X_VALUES, Y_VALUES))
+    formula = core.FORMULAS_DB["Catul"]
+    full_values, full_messages = core.evaluate_formula_column(table, formula, {"A": "X", "B": "Y"})
+    rows = np.array([1, 4, 7, 10], dtype=np.intp)
+    values, messages = core.evaluate_formula_column(table, formula, {"A": "X", "B": "Y"}, rows)
+    for position, row in enumerate(rows):
+        if row in full_messages:
+            assert messages[position] == full_messages[row]
+        else:
+            assert values[position] == full_values[row]
+
+
+def test_syntax_error_is_reported_per_cell():
+    results = evaluate("A +* B")
+    assert all(isinstance(value, str) and value.startswith("Eroare: ") for value in results)
+
+
+@pytest.mark.parametrize("formula", [
+    "__import__('os').system('echo')",
+    "open('f')",
+    "(lambda: 1)()",
+    "np.__class__",
+    "np.load('f.npy')",
+    "np.sin(A, out=A)",
+    "A.real",
+    "A[0]",
+    "[A, B]",
+    "{A: B}",
+    "[x for x in A]",
+    "_where(A, B, A)",
+    "b'bytes'",
+    "f'{A}'",
+    "A := 1",
+])
+def test_whitelist_rejects(formula):
+    compiled = core.compile_formula(formula)
+    assert isinstance(compiled.error, (core.FormulaError, SyntaxError))
+    assert all(isinstance(result, str) and result.startswith("Eroare: ")
+               for result in evaluate(formula, [1], [2]))
+
+
+def test_unbound_variable_reports_name_error():
+    assert evaluate("A + C", [1], [2]) == ["Eroare: name 'C' is not defined"]
+
+
+@pytest.mark.parametrize("formula", ["A + 9 ** 9 ** 9", "A + 9 ** 9 ** 7", "A + len('a' * 10 ** 8)",
+                                     "'a' * 10 ** 8", "'%0100000000d' % 1"])
+def test_constant_folding_is_bounded(formula):
+    start = time.perf_counter()
+    compiled = core.CompiledFormula(formula)
+    assert time.perf_counter() - start < 1.0
+    # Fie compilata, fie cu eroarea retinuta in formula (nu ridicata la compilare)
+    assert compiled.scalar_function is not None or compiled.error is not None
+
+
+def test_constant_folding_keeps_small_results():
+    compiled = core.CompiledFormula("A * (2 ** 10 + 3 * 4)")
+    assert compiled.error is None
+    assert compiled.evaluate_scalar({"A": 2.0}) == 2072
+
+
+def test_round2_does_not_warn_on_infinite_results():
+    values = np.array([np.inf, -np.inf, 2.675, 1.005])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rounded = core.round2(values)
+    assert rounded.tolist() == [np.inf, -np.inf, round(2.675, 2), round(1.005, 2)]
+
+
+def test_round2_does_not_warn_on_huge_finite_results():
+    values = np.array([1e307, -1.7e308, 2.675])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rounded = core.round2(values)
+    assert rounded.tolist() == [round(value, 2) for value in values.tolist()]
+
+
+def test_chained_comparison_does_not_hoist_later_operands():
+    # 1 / B nu este evaluat cand -1 < A este fals, deci nu poate fi calculat inainte
+    formula = "1 / B if -1 < A < 1 / B else 5"
+    assert core.CompiledFormula(formula).evaluate_scalar({"A": -5.0, "B": 0.0}) == 5
+    assert evaluate(formula, [-5, 0], [0, 2]) == [5, 0.5]
+
+
+def test_formula_binds_more_than_two_columns():
+    columns = ["P", "Q", "R", "S", "T", "U"]
+    rows = [[0, 0, 3, 4, 0, 0], [1, 2, 1, 2, 5, 2], ["", 1, 1, "x", 0, 0]]
+    table = make_table(columns, rows)
+    formula = core.FORMULAS_DB["Distanta in plan 3D"]
+    bindings = dict(zip("ACBDEF", ["P", "R", "Q", "S", "T", "U"]))
+    values, messages = core.evaluate_formula_column(table, formula, bindings)
+    assert values[:2].tolist() == [5.0, 3.0]
+    assert messages == {2: "Eroare: could not convert string to float: 'x'"}
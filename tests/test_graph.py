@@ -0,0 +1,82 @@
+"""Datele graficului: seriile extrase, decimarea punctelor si graficele salvate."""
+import numpy as np
+import pytest
+
+import coordonate_core as core
+from conftest import make_table
+
+
+def test_small_series_is_drawn_whole():
+    x = np.arange(100, dtype=float)
+    index = core.decimate_points(x, x, (10, 19), (0, 100), 800, 600)
+    assert index.tolist() == list(range(10, 20))
+
+
+def test_decimation_keeps_one_point_per_occupied_cell():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 1, 200000)
+    y = rng.uniform(0, 1, 200000)
+    index = core.decimate_points(x, y, (0, 1), (0, 1), 300, 300, cell_px=3)
+    assert len(index) == len(np.unique(index)) <= 100 * 100
+    cells = set(zip((x[index] * 100).astype(int).tolist(), (y[index] * 100).astype(int).tolist()))
+    assert len(cells) == len(index)
+
+
+def test_decimation_keeps_the_vertical_extent_of_each_cell_column():
+    x = np.repeat(np.arange(1000, dtype=float), 50)
+    y = np.tile(np.linspace(-1, 1, 50), 1000)
+    index = core.decimate_points(x, y, (0, 1000), (-1, 1), 300, 150, cell_px=3)
+    columns = (x[index] // 10).astype(int)
+    for column in range(100):
+        drawn = y[index][columns == column]
+        assert drawn.min() < -0.9 and drawn.max() > 0.9
+
+
+def test_points_outside_the_view_are_dropped():
+    x = np.linspace(0, 100, 50000)
+    index = core.decimate_points(x, x, (20, 30), (0, 100), 400, 400)
+    assert len(index) and np.all((x[index] >= 20) & (x[index] <= 30))
+
+
+def test_series_cache_reuses_pairs_until_a_column_changes():
+    table = make_table(["X", "Y"], [[1, 2], ["", 3], [4, "t"], [5, 6]])
+    series = core.SeriesCache()
+    x, y = series.get(table, "X", "Y")
+    assert x.tolist() == [1.0, 5.0] and y.tolist() == [2.0, 6.0]
+    assert series.get(table, "X", "Y")[0] is x
+    table.set(1, "X", 3)
+    x, y = series.get(table, "X", "Y")
+    assert x.tolist() == [1.0, 3.0, 5.0] and y.tolist() == [2.0, 3.0, 6.0]
+    x, y = series.get(table, "X", "Y", rows=np.array([3, 0]))
+    assert x.tolist() == [5.0, 1.0]
+
+
+def test_graph_columns_reads_old_settings():
+    assert core.graph_columns({"y_columns": ["B", "C"], "y_column": "B"}) == ["B", "C"]
+    assert core.graph_columns({"y_column": "B"}) == ["B"]
+    assert core.graph_columns({}) == []
+    assert [core.graph_grid(count) for count in (1, 2, 3, 5)] == [(1, 1), (1, 2), (2, 2), (2, 3)]
+
+
+@pytest.mark.parametrize("layout", ["overlay", "grid"])
+def test_render_graph_with_several_series(tmp_path, layout):
+    pytest.importorskip("matplotlib")
+    table = make_table(["X", "Y", "Z"], [[i, i * i, -i] for i in range(20)])
+    path = str(tmp_path / "graph.png")
+    settings = {"x_column": "X", "y_columns": ["Y", "Z"], "layout": layout, "trendline": True, "degree": 2}
+    core.render_graph(path, table, settings)
+    with open(path, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_series_cache_is_bounded_and_drops_removed_tables():
+    tables = [make_table(["X", "Y"], [[i, i]]) for i in range(5)]
+    series = core.SeriesCache(size=3)
+    for table in tables:
+        series.get(table, "X", "Y")
+    series.get(tables[2], "X", "Y")  # Cea mai recent folosita
+    series.get(tables[0], "X", "Y")
+    kept = [entry[0] for entry in series.series.values()]
+    assert kept == [tables[4], tables[2], tables[0]]
+    series.discard_table(tables[2])
+    assert [entry[0] for entry in series.series.values()] == [tables[4], tables[0]]
@@ -0,0 +1,48 @@
+"""Masuratorile operatiilor: timere, contoare si exportul statisticilor."""
+import json
+
+import pytest
+
+import coordonate_core as core
+from conftest import make_table
+
+
+@pytest.fixture
+def instruments():
+    instruments = core.Instrumentation()
+    instruments.enabled = True
+    return instruments
+
+
+def test_disabled_instrumentation_records_nothing():
+    instruments = core.Instrumentation()
+    with instruments.timer("op", 10):
+        pass
+    instruments.count("c")
+    assert instruments.stats() == {} and instruments.counters() == {}
+
+
+def test_timer_records_calls_and_rows(instruments):
+    for rows in (10, 30):
+        with instruments.timer("op", rows):
+            pass
+    instruments.record("op", 0.5, 60)
+    stats = instruments.stats()["op"]
+    assert stats["count"] == 3 and stats["rows"] == 100
+    assert stats["total"] >= 0.5 and stats["p99"] >= stats["p50"]
+    assert stats["rows_per_second"] == pytest.approx(100 / stats["total"])
+    instruments.reset()
+    assert instruments.stats() == {}
+
+
+def test_recalculation_is_timed_per_formula_column(monkeypatch, instruments, tmp_path):
+    monkeypatch.setattr(core, "INSTRUMENTS", instruments)
+    table = make_table(["A", "B", "R"], [[1, 2, ""], [3, 0, ""], [5, 4, ""]])
+    core.recalculate_all(table, {"R": {"formula": "A / B if B != 0 else 'Eroare: Div/0'",
+                                       "bindings": {}}})
+    assert instruments.stats()["recalc/R"]["rows"] == 3
+    assert instruments.counters()["recalc/error_cells"] == 1
+    path = tmp_path / "stats.json"
+    instruments.export(str(path))
+    exported = json.loads(path.read_text(encoding="utf-8"))
+    assert set(exported) == {"operations", "counters"} and "recalc/R" in exported["operations"]
@@ -0,0 +1,51 @@
+"""Planificatorul lucrarilor din fundal, cu o radacina Tk simulata (fara afisaj)."""
+import Coordonate as app
+
+
+class FakeRoot:
+    """Retine apelurile ``after`` si erorile raportate, in locul ferestrei Tk."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+
+    def after(self, ms, func):
+        self.scheduled.append(func)
+
+    def report_callback_exception(self, exc_type, value, traceback):
+        self.errors.append(value)
+
+    def run(self):
+        while self.scheduled:
+            self.scheduled.pop(0)()
+
+
+def test_failing_callback_does_not_stop_polling():
+    root = FakeRoot()
+    jobs = app.JobScheduler(root, max_workers=1)
+    results = []
+    jobs.submit("a", lambda job: 1, on_done=lambda value: 1 / 0)
+    jobs.submit("b", lambda job: 2, on_done=results.append)
+    jobs.executor.shutdown(wait=True)  # Ambele rezultate sunt in coada
+    root.run()
+    assert results == [2]
+    assert [type(error) for error in root.errors] == [ZeroDivisionError]
+    assert not jobs._polling and not jobs._jobs
+
+    # Dupa eroare, o lucrare noua porneste din nou preluarea rezultatelor
+    jobs.executor = app.ThreadPoolExecutor(max_workers=1)
+    jobs.submit("c", lambda job: 3, on_done=results.append)
+    jobs.executor.shutdown(wait=True)
+    root.run()
+    assert results == [2, 3]
+
+
+def test_replaced_job_result_is_ignored():
+    root = FakeRoot()
+    jobs = app.JobScheduler(root, max_workers=1)
+    results = []
+    jobs.submit("a", lambda job: "vechi", on_done=results.append)
+    jobs.submit("a", lambda job: "nou", on_done=results.append)
+    jobs.executor.shutdown(wait=True)
+    root.run()
+    assert results == ["nou"]
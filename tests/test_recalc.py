@@ -0,0 +1,90 @@
+"""Recalcularea incrementala da acelasi tabel ca recalcularea completa."""
+import random
+
+import pytest
+
+import coordonate_core as core
+from conftest import make_table, table_cells
+
+# Formule inlantuite: Dublu depinde de Suma, Raport de Dublu si de B
+FORMULAS = {
+    "Suma": {"formula": "A + B", "source_column1": "A", "source_column2": "B"},
+    "Dublu": {"formula": "S * 2", "bindings": {"S": "Suma"}},
+    "Raport": {"formula": "D / B if B != 0 else 'Eroare: Div/0'", "bindings": {"D": "Dublu", "B": "B"}},
+}
+CELL_VALUES = [0, 1, -2.5, 3.125, "", "text", 1e6]
+
+
+def new_table(rng, rows):
+    columns = ["A", "B", "Suma", "Dublu", "Raport"]
+    return make_table(columns, [[rng.choice(CELL_VALUES), rng.choice(CELL_VALUES), "", "", ""]
+                                for _ in range(rows)])
+
+
+def full_copy(table):
+    copy = make_table(table.columns, [table.display_row(i) for i in range(len(table))])
+    core.recalculate_all(copy, FORMULAS)
+    return copy
+
+
+def test_legacy_entries_bind_a_and_b():
+    config = {"formula": "A + B", "source_column1": "X", "source_column2": "Y"}
+    assert core.formula_bindings(config) == {"A": "X", "B": "Y"}
+    assert core.formula_sources(config) == {"A": "X", "B": "Y"}
+
+
+def test_unbound_variables_refer_to_columns_with_the_same_name():
+    config = {"formula": "Masa * g + A", "bindings": {"A": "X"}}
+    assert core.formula_sources(config) == {"Masa": "Masa", "g": "g", "A": "X"}
+    table = make_table(["X", "Masa"], [[1, 2]])
+    assert core.formula_sources(config, table) == {"Masa": "Masa", "A": "X"}
+
+
+def test_graph_orders_dependencies():
+    graph = core.FormulaGraph(FORMULAS)
+    assert graph.order.index("Suma") < graph.order.index("Dublu") < graph.order.index("Raport")
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(core.FormulaCycleError):
+        core.FormulaGraph({"X": {"formula": "Y + 1", "bindings": {}},
+                           "Y": {"formula": "X + 1", "bindings": {}}})
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dirty_recalculation_matches_full(seed):
+    rng = random.Random(seed)
+    table = new_table(rng, 40)
+    graph = core.recalculate_all(table, FORMULAS)
+    dirty = core.DirtyTracker()
+    for step in range(60):
+        action = rng.random()
+        if action < 0.7:
+            row, column = rng.randrange(len(table)), rng.choice(["A", "B"])
+            table.set(row, column, rng.choice(CELL_VALUES))
+            dirty.mark(column, row)
+        elif action < 0.85:
+            row = rng.randrange(len(table) + 1)
+            table.insert_row(row, {"A": rng.choice(CELL_VALUES), "B": rng.choice(CELL_VALUES)})
+            dirty.insert_row(row)
+            for target in FORMULAS:
+                dirty.mark(target, row)
+        else:
+            row = rng.randrange(len(table))
+            table.delete_row(row)
+            dirty.delete_row(row)
+        if rng.random() < 0.3:  # Mai multe modificari adunate inainte de o recalculare
+            core.recalculate_dirty(table, graph, dirty)
+            assert table_cells(table) == table_cells(full_copy(table)), step
+    core.recalculate_dirty(table, graph, dirty)
+    assert table_cells(table) == table_cells(full_copy(table))
+
+
+def test_dirty_recalculation_returns_changed_rows():
+    table = new_table(random.Random(0), 10)
+    graph = core.recalculate_all(table, FORMULAS)
+    dirty = core.DirtyTracker()
+    table.set(3, "A", 5)
+    dirty.mark("A", 3)
+    assert core.recalculate_dirty(table, graph, dirty) == {3}
+    assert not dirty
@@ -0,0 +1,55 @@
+"""Regresiile incrementale dau aceiasi coeficienti ca o potrivire completa."""
+import numpy as np
+import pytest
+
+import coordonate_core as core
+from conftest import make_table
+
+
+@pytest.mark.parametrize("degree", [1, 2, 3])
+def test_matches_polyfit(degree):
+    rng = np.random.default_rng(degree)
+    x = rng.uniform(1000, 1010, 500)
+    y = 0.5 * (x - 1005) ** degree + rng.normal(0, 0.1, x.size)
+    fit = core.RunningRegression.from_arrays(x, y, degree)
+    np.testing.assert_allclose(fit.coefficients(), np.polyfit(x, y, degree), rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize("degree", [1, 2])
+def test_add_and_remove_match_a_new_fit(degree):
+    rng = np.random.default_rng(10 + degree)
+    x = rng.uniform(-5, 5, 300)
+    y = 2 * x ** degree - x + rng.normal(0, 0.2, x.size)
+    fit = core.RunningRegression.from_arrays(x[:200], y[:200], degree)
+    for i in range(200, 300):
+        fit.add(x[i], y[i])
+    for i in range(0, 50):
+        fit.remove(x[i], y[i])
+    np.testing.assert_allclose(fit.coefficients(), np.polyfit(x[50:], y[50:], degree), rtol=1e-8, atol=1e-8)
+    residual = y[50:] - np.polyval(np.polyfit(x[50:], y[50:], degree), x[50:])
+    expected = 1 - residual @ residual / np.sum((y[50:] - y[50:].mean()) ** 2)
+    assert fit.r_squared() == pytest.approx(expected, rel=1e-9)
+
+
+def test_empty_and_constant_series():
+    fit = core.RunningRegression()
+    with pytest.raises(ValueError):
+        fit.coefficients()
+    assert np.isnan(fit.r_squared())
+    fit = core.RunningRegression.from_arrays(np.arange(5.0), np.full(5, 3.0))
+    np.testing.assert_allclose(fit.coefficients(), [0.0, 3.0], atol=1e-12)
+    assert np.isnan(fit.r_squared())
+
+
+def test_cache_follows_cell_edits():
+    table = make_table(["X", "Y"], [[i, 3 * i + 1] for i in range(20)])
+    cache = core.RegressionCache()
+    key = ("X", "Y", 1, False)
+    x, _ = table.numeric("X")
+    y, _ = table.numeric("Y")
+    cache.store(key, core.RunningRegression.from_arrays(x, y), cache.generation)
+    cache.update(table, {"Y"}, [4], -1)
+    table.set(4, "Y", 100)
+    cache.update(table, {"Y"}, [4], 1)
+    y, _ = table.numeric("Y")
+    np.testing.assert_allclose(cache.get(key).coefficients(), np.polyfit(x, y, 1), rtol=1e-9)
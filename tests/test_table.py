@@ -0,0 +1,48 @@
+"""Tabelul stocat pe coloane: conversia celulelor si operatiile pe randuri."""
+import numpy as np
+
+import coordonate_core as core
+from conftest import make_table, table_cells
+
+
+def test_cells_keep_numbers_text_and_empty():
+    table = make_table(["A"], [[1], ["2.5"], [""], ["abc"], [None], [3e-7]])
+    assert [table.get(i, "A") for i in range(len(table))] == [1.0, 2.5, "", "abc", "", 3e-7]
+    values, valid = table.numeric("A")
+    assert valid.tolist() == [True, True, False, False, False, True]
+    assert values[valid].tolist() == [1.0, 2.5, 3e-7]
+
+
+def test_formula_inputs_treat_empty_cells_as_zero():
+    table = make_table(["A"], [[1], [""], ["abc"]])
+    values, valid = table.formula_inputs("A")
+    assert values.tolist() == [1.0, 0.0, 0.0]
+    assert valid.tolist() == [True, True, False]
+    values, valid = table.formula_inputs("Lipsa")
+    assert values.tolist() == [0.0, 0.0, 0.0] and valid.all()
+
+
+def test_append_grows_capacity_and_delete_shifts_rows():
+    table = core.Table(["A", "B"])
+    for i in range(100):
+        table.append_row({"A": i, "B": f"t{i}" if i % 3 else ""})
+    table.delete_row(0)
+    table.delete_row(50)
+    assert len(table) == 98
+    assert table.get(0, "A") == 1.0
+    assert table.get(50, "A") == 52.0
+    assert table.get(1, "B") == "t2"
+
+
+def test_records_round_trip():
+    records = [{"A": 1.0, "B": "x"}, {"A": "", "B": 2.0}]
+    table = core.Table.from_records(["A", "B"], records)
+    assert table.to_records() == records
+
+
+def test_assign_column_writes_values_and_messages():
+    table = make_table(["R"], [[""], [""], [""]])
+    table.assign_column("R", np.array([1.0, 2.0, 3.0]), {1: "Eroare: Div/0"})
+    assert table_cells(table)[1] == [["1"], ["Eroare: Div/0"], ["3"]]
+    table.assign_column("R", np.array([4.0, 5.0, 6.0]), {})
+    assert [table.get(i, "R") for i in range(3)] == [4.0, 5.0, 6.0]
@@ -0,0 +1,110 @@
+"""Sortarea, filtrele si agregatele tabelului, comparate cu un calcul direct."""
+import random
+
+import numpy as np
+import pytest
+
+import coordonate_core as core
+from conftest import make_table
+
+CELL_VALUES = [3, -1, 2.5, 0, 3, "", "beta", "Alfa", "alfa", "", 10]
+
+
+def random_table(seed, rows=200):
+    rng = random.Random(seed)
+    return make_table(["K", "V"], [[rng.choice(CELL_VALUES), rng.choice(CELL_VALUES[:5] + [""])]
+                                   for _ in range(rows)])
+
+
+def sort_key(table, row, name):
+    value = table.get(row, name)
+    if isinstance(value, float):
+        return (0, value)
+    return (1, value) if value != "" else (2, "")
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sort_index_puts_numbers_then_text_then_empty(seed):
+    table = random_table(seed)
+    expected = sorted(range(len(table)), key=lambda row: sort_key(table, row, "K"))  # Stabila, ca sort_index
+    assert table.sort_index("K").tolist() == expected
+    descending = [table.get(row, "K") for row in table.sort_index("K", descending=True)]
+    numbers = [value for value in descending if isinstance(value, float)]
+    assert numbers == sorted(numbers, reverse=True)
+    rest = descending[len(numbers):]
+    texts = [value for value in rest if value != ""]
+    assert texts == sorted(texts, reverse=True)
+    assert rest == texts + [""] * (len(rest) - len(texts))
+
+
+def test_sort_index_is_rebuilt_after_an_edit():
+    table = make_table(["K"], [[3], [1], [2]])
+    assert table.sort_index("K").tolist() == [1, 2, 0]
+    table.set(0, "K", 0)
+    assert table.sort_index("K").tolist() == [0, 1, 2]
+
+
+def test_filter_mask_range_and_text():
+    table = make_table(["K"], [[1], [5], ["Alfa"], [""], [10], ["5"], ["alfabet"]])
+    assert core.filter_mask(table, {"column": "K", "min": 2, "max": 10}).tolist() == [
+        False, True, False, False, True, True, False]
+    assert core.filter_mask(table, {"column": "K", "min": None, "max": 4}).tolist() == [
+        True, False, False, False, False, False, False]
+    assert core.filter_mask(table, {"column": "K", "text": "ALF"}).tolist() == [
+        False, False, True, False, False, False, True]
+    assert core.filter_mask(table, {"column": "K", "text": "5"}).tolist() == [
+        False, True, False, False, False, True, False]
+
+
+def test_view_combines_sort_and_filters():
+    table = random_table(7)
+    view = core.TableView(sort="V", descending=True, filters=[{"column": "K", "min": 0}])
+    rows = view.rows(table)
+    assert all(isinstance(table.get(row, "K"), float) and table.get(row, "K") >= 0 for row in rows)
+    kept = set(np.flatnonzero(core.filter_mask(table, {"column": "K", "min": 0})).tolist())
+    assert set(rows.tolist()) == kept
+    assert view.rows(table) is rows  # Refolosit cat timp coloanele nu se schimba
+    table.set(int(rows[0]), "V", -100)
+    assert view.rows(table) is not rows
+    assert not core.TableView() and core.TableView().rows(table) is None
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_group_by_matches_direct_statistics(seed):
+    table = random_table(seed)
+    stats = core.group_by(table, "K", "V")
+    groups = {}
+    for row in range(len(table)):
+        groups.setdefault(table.column("K").display(row), []).append(table.get(row, "V"))
+    keys = [table.column("K").display(row) for row in stats["rows"]]
+    assert sorted(keys) == sorted(groups)
+    for i, key in enumerate(keys):
+        numbers = [value for value in groups[key] if isinstance(value, float)]
+        assert stats["count"][i] == len(numbers)
+        if numbers:
+            assert stats["sum"][i] == pytest.approx(sum(numbers))
+            assert stats["min"][i] == min(numbers) and stats["max"][i] == max(numbers)
+            assert stats["std"][i] == pytest.approx(np.std(numbers), abs=1e-12)
+
+
+def test_aggregate_ignores_empty_and_text_cells():
+    table = make_table(["V"], [[1], [""], ["x"], [4], [7]])
+    stats = core.aggregate(table, "V")
+    assert stats == {"count": 3, "sum": 12.0, "mean": 4.0, "min": 1.0, "max": 7.0,
+                     "std": pytest.approx(np.std([1, 4, 7]))}
+    assert core.aggregate(table, "V", rows=np.array([0, 1]))["count"] == 1
+    assert core.aggregate(table, "V", rows=np.array([], dtype=np.intp))["count"] == 0
+
+
+def test_cached_rows_do_not_sort_again():
+    table = make_table(["K"], [[3], [1], [2]])
+    view = core.TableView(sort="K")
+    assert view.cached_rows(table) == (None, False)
+    rows = view.rows(table)
+    assert view.cached_rows(table) == (rows, True)
+    table.set(0, "K", 0)
+    cached, current = view.cached_rows(table)
+    assert cached is rows and not current  # Indicii vechi, pana la o noua recalculare
+    assert view.rows(table).tolist() == [0, 1, 2]
+    assert view.cached_rows(table)[1]
+    assert core.TableView().cached_rows(table) == (None, True)